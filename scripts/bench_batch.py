@@ -0,0 +1,61 @@
+"""
+Benchmark: requests sent and wall time of the per-user handler loop against
+the /api/batch engine.
+
+Usage:
+    python scripts/bench_batch.py [--users 500] [--latency 0.002]
+"""
+
+import argparse
+import contextlib
+import io
+import time
+
+from bench_common import load_handler, make_event, make_users
+from mock_mailerlite import MockServer
+
+MODES = [
+    # label, ingest mode, concurrency
+    ("per-user loop (legacy)", "legacy", 1),
+    ("per-user upsert", "upsert", 1),
+    ("batch engine", "batch", 1),
+]
+
+
+def run(label: str, mode: str, concurrency: int, users: int, latency: float):
+    with MockServer(latency=latency) as server:
+        handler = load_handler(server.url)
+        handler.INGEST_MODE = mode
+        handler.CONCURRENCY = concurrency
+        handler._client = None
+
+        event = make_event(make_users(users))
+        start = time.perf_counter()
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            response = handler.lambda_handler(event, None)
+
+        elapsed = time.perf_counter() - start
+        handler._close_client()
+        handler._client = None
+
+    print(
+        f"{label:<24} status={response['statusCode']} "
+        f"http_requests={server.state.http_requests:<6} wall={elapsed:.2f}s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument(
+        "--latency", type=float, default=0.002, help="seconds per request"
+    )
+    args = parser.parse_args()
+
+    for label, mode, concurrency in MODES:
+        run(label, mode, concurrency, args.users, args.latency)
+
+
+if __name__ == "__main__":
+    main()
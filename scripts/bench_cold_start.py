@@ -0,0 +1,81 @@
+"""
+Benchmark: cold start of the Lambda handler module.
+
+Launches fresh interpreters that import `lambda_function` (which runs its
+module-scope initialization) and reports the median and p95 import time,
+plus the wall time of the whole process. With `--budget-ms` it exits with
+status 1 if the p95 import time is over budget, so it can gate CI.
+
+Usage:
+    python scripts/bench_cold_start.py [--runs 20] [--budget-ms 250]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from bench_common import SRC_DIR, percentile
+
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+import lambda_function
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    "import_ms": elapsed * 1000,
+    "boto3_loaded": "boto3" in sys.modules,
+    "modules": len(sys.modules),
+}))
+"""
+
+
+def run_once(python: str) -> dict:
+    env = dict(os.environ, PYTHONPATH=SRC_DIR, PYTHONDONTWRITEBYTECODE="1")
+    start = time.perf_counter()
+    output = subprocess.run(
+        [python, "-c", CHILD], env=env, capture_output=True, text=True, check=True
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result["process_ms"] = (time.perf_counter() - start) * 1000
+
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--python", default=sys.executable)
+    parser.add_argument(
+        "--budget-ms", type=float, help="fail if the p95 import time exceeds this"
+    )
+    args = parser.parse_args()
+
+    # Warm-up run, so the OS file cache does not skew the first sample
+    run_once(args.python)
+    results = [run_once(args.python) for _ in range(args.runs)]
+
+    imports = [result["import_ms"] for result in results]
+    processes = [result["process_ms"] for result in results]
+    p95 = percentile(imports, 95)
+
+    print(f"runs={args.runs} modules={results[-1]['modules']}")
+    print(f"boto3 imported at init: {results[-1]['boto3_loaded']}")
+    print(
+        f"import+init  median={statistics.median(imports):.1f}ms p95={p95:.1f}ms"
+    )
+    print(
+        f"process      median={statistics.median(processes):.1f}ms "
+        f"p95={percentile(processes, 95):.1f}ms"
+    )
+
+    if args.budget_ms is not None and p95 > args.budget_ms:
+        print(f"FAIL: p95 import time {p95:.1f}ms is over {args.budget_ms:.1f}ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Helpers shared by the benchmark scripts.
+"""
+
+import json
+import os
+import sys
+import time
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """
+    Returns the `pct` percentile (0-100) of `samples` using nearest rank.
+    """
+
+    if not samples:
+        return 0.0
+
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+
+    return ordered[index]
+
+
+def make_users(count: int, prefix: str = "user") -> list[dict]:
+    return [
+        {"email": f"{prefix}{i}@example.com", "name": f"User {i}"}
+        for i in range(count)
+    ]
+
+
+def make_event(users: list[dict], **extra) -> dict:
+    return {"body": json.dumps(dict(extra, users=users))}
+
+
+def load_handler(base_url: str):
+    """
+    Imports `lambda_function` pointed at `base_url` with a stubbed secret and
+    no client-side rate limit, so the real handler can run against the local
+    mock server. Subscriber IDs and group memberships cached for another
+    server are dropped, so every run starts from the same state.
+    """
+
+    import lambda_function
+    from membership import invalidate_membership
+    from rate_limiter import RateLimiter
+    from secret_cache import SecretCache
+
+    lambda_function.MAILER_BASE_URL = base_url
+    # The mock has no rate limit unless asked for one
+    lambda_function._limiter = RateLimiter(requests_per_minute=1_000_000)
+    lambda_function._api_key = SecretCache(
+        "bench", key="MAILER_KEY", client=StubSecretsManager({"MAILER_KEY": "bench"})
+    )
+    lambda_function._subscriber_cache.clear()
+    invalidate_membership()
+
+    return lambda_function
+
+
+class StubSecretsManager:
+    """
+    Stand-in for the boto3 Secrets Manager client.
+    """
+
+    def __init__(self, secret: dict):
+        self.secret = secret
+        self.calls = 0
+
+    def get_secret_value(self, SecretId: str) -> dict:
+        self.calls += 1
+        return {"SecretString": json.dumps(self.secret)}
+
+
+class LambdaContext:
+    """
+    Stand-in for the Lambda context, with a fixed time left.
+    """
+
+    aws_request_id = "bench"
+
+    def __init__(self, remaining_ms: float):
+        self.remaining_ms = remaining_ms
+
+    def get_remaining_time_in_millis(self) -> float:
+        return self.remaining_ms
+
+
+def time_calls(session, samples: list[float]):
+    """
+    Wraps `session.request` so the latency of every HTTP call lands in
+    `samples` (milliseconds).
+    """
+
+    original = session.request
+
+    def timed(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            samples.append((time.perf_counter() - start) * 1000)
+
+    session.request = timed
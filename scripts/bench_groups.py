@@ -0,0 +1,71 @@
+"""
+Benchmark: looking up a group by name in an account with many groups.
+
+Compares reading only the first page (the old `group_exists`), scanning
+every page without a filter, and the paginated, server-filtered lookup with
+early exit.
+
+Usage:
+    python scripts/bench_groups.py [--groups 10000]
+"""
+
+import argparse
+import time
+
+import bench_common  # noqa: F401 (adds src/ to sys.path)
+from mailer_client import MailerLiteClient
+from mock_mailerlite import MockServer
+from rate_limiter import RateLimiter
+
+
+def first_page_only(client: MailerLiteClient, name: str):
+    result = client.session.get(f"{client.base_url}/groups").json()
+    return next((g for g in result["data"] if g["name"] == name), None)
+
+
+def full_scan(client: MailerLiteClient, name: str):
+    return next((g for g in client.iter_groups() if g["name"] == name), None)
+
+
+def filtered(client: MailerLiteClient, name: str):
+    return client.group_exists(name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--groups", type=int, default=10000)
+    parser.add_argument("--latency", type=float, default=0.001)
+    args = parser.parse_args()
+
+    with MockServer(latency=args.latency) as server:
+        for i in range(args.groups):
+            server.state.create_group(f"code group {i:08d}")
+
+        # The worst case for a scan: the newest group is on the last page
+        target = f"code group {args.groups - 1:08d}"
+        client = MailerLiteClient(
+            "bench",
+            base_url=server.url,
+            limiter=RateLimiter(requests_per_minute=1_000_000),
+        )
+
+        for label, lookup in (
+            ("first page only (old)", first_page_only),
+            ("paged scan, no filter", full_scan),
+            ("filter[name] + early exit", filtered),
+        ):
+            server.state.reset_counters()
+            start = time.perf_counter()
+            found = lookup(client, target)
+            elapsed = (time.perf_counter() - start) * 1000
+
+            print(
+                f"{label:<26} found={found is not None!s:<5} "
+                f"requests={server.state.http_requests:<4} time={elapsed:.1f}ms"
+            )
+
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
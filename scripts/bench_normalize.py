@@ -0,0 +1,62 @@
+"""
+Benchmark: cost of canonicalizing and deduplicating the users list.
+
+Builds lists with a share of duplicates (different casing, surrounding
+whitespace and IDN domains) and times `normalize_users` on growing sizes
+to show it scales linearly.
+
+Usage:
+    python scripts/bench_normalize.py [--users 100000] [--duplicates 0.3]
+"""
+
+import argparse
+import random
+import time
+
+import bench_common  # noqa: F401 (adds src/ to sys.path)
+from normalize import normalize_users
+
+DOMAINS = ["example.com", "Example.COM", "bücher.de", "correo.es"]
+
+
+def make_sloppy_users(count: int, duplicates: float, seed: int = 1) -> list[dict]:
+    rng = random.Random(seed)
+    users = []
+
+    for i in range(count):
+        if users and rng.random() < duplicates:
+            email = rng.choice(users)["email"].upper()
+            users.append({"email": f"  {email} ", "name": f"Dup {i}"})
+        else:
+            domain = rng.choice(DOMAINS)
+            users.append({"email": f"user{i}@{domain}", "name": f"User {i}"})
+
+    return users
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--duplicates", type=float, default=0.3)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for size in (args.users // 100, args.users // 10, args.users):
+        users = make_sloppy_users(size, args.duplicates)
+        timings = []
+
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            unique, index = normalize_users(users)
+            timings.append(time.perf_counter() - start)
+
+        best = min(timings)
+
+        print(
+            f"users={size:<7} unique={len(unique):<7} "
+            f"best={best * 1000:.1f}ms per_user={best / size * 1e6:.2f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Benchmark: first-invocation latency for each way a container is initialized.
+
+Every run is a fresh interpreter that imports the handler against the local
+mock server (with a handshake delay standing in for TLS and a delay on the
+stubbed Secrets Manager), then:
+
+    on-demand    invokes right away, the init work happens in the request
+    provisioned  runs `initialize(eager=True)`, then invokes
+    snapstart    runs `initialize(eager=True)`, `before_snapshot()`, waits
+                 while the "snapshot" is stored, runs `after_restore()`,
+                 then invokes
+
+It reports the median time of each phase and of the first and second
+invocations.
+
+Usage:
+    python scripts/bench_snapshot.py [--runs 10] [--users 10] [--handshake 0.05]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from bench_common import SRC_DIR
+from mock_mailerlite import MockServer
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+SCENARIOS = ("on-demand", "provisioned", "snapstart")
+
+CHILD = """
+import json, sys, time
+url, scenario = sys.argv[1:3]
+users, secret_delay = int(sys.argv[3]), float(sys.argv[4])
+
+def elapsed(start):
+    return round((time.perf_counter() - start) * 1000, 1)
+
+start = time.perf_counter()
+import bench_common
+handler = bench_common.load_handler(url)
+result = {"import_ms": elapsed(start)}
+
+stub = handler._api_key.client
+get_secret_value = stub.get_secret_value
+
+def slow_get_secret_value(**kwargs):
+    time.sleep(secret_delay)
+    return get_secret_value(**kwargs)
+
+stub.get_secret_value = slow_get_secret_value
+
+if scenario != "on-demand":
+    start = time.perf_counter()
+    handler.initialize(eager=True)
+    result["init_ms"] = elapsed(start)
+
+if scenario == "snapstart":
+    start = time.perf_counter()
+    handler.before_snapshot()
+    result["before_snapshot_ms"] = elapsed(start)
+    time.sleep(0.2)
+    start = time.perf_counter()
+    handler.after_restore()
+    result["after_restore_ms"] = elapsed(start)
+
+for name, prefix in (("first_invoke_ms", "first"), ("second_invoke_ms", "second")):
+    event = bench_common.make_event(bench_common.make_users(users, prefix=prefix))
+    start = time.perf_counter()
+    response = handler.lambda_handler(event, None)
+    result[name] = elapsed(start)
+    assert response["statusCode"] == 200, response
+
+print(json.dumps(result))
+"""
+
+
+def run_once(url: str, scenario: str, users: int, secret_delay: float) -> dict:
+    env = dict(
+        os.environ,
+        PYTHONPATH=os.pathsep.join([SRC_DIR, SCRIPTS_DIR]),
+        PYTHONDONTWRITEBYTECODE="1",
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD, url, scenario, str(users), str(secret_delay)],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--handshake", type=float, default=0.05)
+    parser.add_argument("--latency", type=float, default=0.01)
+    parser.add_argument("--secret-delay", type=float, default=0.03)
+    args = parser.parse_args()
+
+    with MockServer(latency=args.latency, handshake_delay=args.handshake) as server:
+        for scenario in SCENARIOS:
+            results = [
+                run_once(server.url, scenario, args.users, args.secret_delay)
+                for _ in range(args.runs)
+            ]
+            medians = {
+                key: statistics.median(result[key] for result in results)
+                for key in results[0]
+            }
+
+            print(
+                f"{scenario:<12} "
+                + " ".join(f"{key}={value:.1f}" for key, value in medians.items())
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark: handshakes per invocation and per-call latency of the MailerLite
+transport, with and without the pooled keep-alive session.
+
+Usage:
+    python scripts/bench_transport.py [--users 50] [--invocations 5]
+"""
+
+import argparse
+import contextlib
+import io
+
+from bench_common import load_handler, make_event, make_users, percentile, time_calls
+from mock_mailerlite import MockServer
+
+
+def run(keep_alive: bool, users: int, invocations: int, handshake_delay: float):
+    with MockServer(handshake_delay=handshake_delay) as server:
+        handler = load_handler(server.url)
+        handler.KEEP_ALIVE = keep_alive
+        handler._client = None
+
+        samples: list[float] = []
+        connections: list[int] = []
+
+        for i in range(invocations):
+            server.state.reset_counters()
+            event = make_event(make_users(users, prefix=f"inv{i}-"))
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                handler.lambda_handler(event, None)
+
+            if i == 0:
+                # The client is created lazily by the first invocation
+                time_calls(handler._client.session, samples)
+                continue
+
+            connections.append(server.state.connections)
+
+        handler._client.close()
+        handler._client = None
+
+    calls = len(samples) // max(1, len(connections))
+    label = "pooled keep-alive" if keep_alive else "connection per call"
+    print(
+        f"{label:<20} calls/inv={calls:<5} "
+        f"handshakes/inv={sum(connections) / len(connections):<7.1f} "
+        f"p50={percentile(samples, 50):.2f}ms p99={percentile(samples, 99):.2f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--invocations", type=int, default=5)
+    parser.add_argument(
+        "--handshake-delay",
+        type=float,
+        default=0.005,
+        help="seconds added to every new connection to emulate TLS",
+    )
+    args = parser.parse_args()
+
+    for keep_alive in (False, True):
+        run(keep_alive, args.users, args.invocations + 1, args.handshake_delay)
+
+
+if __name__ == "__main__":
+    main()
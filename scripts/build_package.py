@@ -0,0 +1,278 @@
+"""
+Builds the Lambda deployment zip.
+
+Steps:
+    1. Installs the runtime dependencies pinned in requirements-lambda.txt
+       (not boto3, which the Lambda runtime provides) into a clean build
+       folder.
+    2. Copies src/*.py and minifies the email templates with
+       scripts/minify_templates.py, which checks their merge tags.
+    3. Prunes what Lambda never loads: dist-info metadata, tests, caches,
+       type stubs and console scripts.
+    4. Compiles every module to unchecked-hash .pyc files, so imports never
+       compile sources or compare timestamps. Their file names point to
+       /var/task, where Lambda unpacks the zip, not to the build folder.
+    5. Writes a deterministic zip: sorted entries, fixed timestamps and
+       permissions, so the same inputs always give the same bytes.
+
+It prints a size and file-count report and exits with status 1 if the zip
+or the file count exceed the budget in scripts/package_budget.json.
+
+Run it with the Python version of the Lambda runtime: .pyc files only load
+on the version that wrote them.
+
+Usage:
+    python scripts/build_package.py [--python-version 3.11] [--find-links DIR]
+"""
+
+import argparse
+import compileall
+import json
+import os
+import py_compile
+import shutil
+import subprocess
+import sys
+import zipfile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REQUIREMENTS_FILE = os.path.join(ROOT_DIR, "requirements-lambda.txt")
+# Where Lambda unpacks the zip, recorded in the .pyc files for tracebacks
+TASK_ROOT = "/var/task"
+BUDGET_FILE = os.path.join(ROOT_DIR, "scripts", "package_budget.json")
+# 1980-01-01, the earliest date a zip entry can hold
+ZIP_DATE = (1980, 1, 1, 0, 0, 0)
+
+PRUNED_DIRS = {"__pycache__", "tests", "test"}
+PRUNED_DIR_SUFFIXES = (".dist-info", ".egg-info")
+PRUNED_FILES = ("py.typed", "RECORD", "INSTALLER")
+PRUNED_SUFFIXES = (".pyi", ".pyc", ".pyo")
+
+
+def install_dependencies(build_dir: str, requirements: str, find_links: str | None):
+    command = [
+        sys.executable,
+        "-m",
+        "pip",
+        "install",
+        "--quiet",
+        "--no-compile",
+        "--no-cache-dir",
+        # The requirements file pins every transitive dependency
+        "--no-deps",
+        "--target",
+        build_dir,
+        "--requirement",
+        requirements,
+    ]
+
+    if find_links:
+        command[4:4] = ["--no-index", "--find-links", find_links]
+
+    subprocess.run(command, check=True)
+
+
+def copy_sources(build_dir: str):
+    src_dir = os.path.join(ROOT_DIR, "src")
+
+    for name in sorted(os.listdir(src_dir)):
+        if name.endswith(".py"):
+            shutil.copy2(os.path.join(src_dir, name), build_dir)
+
+    source_templates = os.path.join(src_dir, "templates")
+    templates_dir = os.path.join(build_dir, "templates")
+    os.makedirs(templates_dir)
+
+    subprocess.run(
+        [
+            sys.executable,
+            os.path.join(ROOT_DIR, "scripts", "minify_templates.py"),
+            source_templates,
+            templates_dir,
+        ],
+        check=True,
+    )
+
+    for name in sorted(os.listdir(source_templates)):
+        if not name.endswith(".html"):
+            shutil.copy2(os.path.join(source_templates, name), templates_dir)
+
+
+def prune(build_dir: str) -> int:
+    """
+    Removes files Lambda never loads.
+
+    Returns:
+        int: The number of bytes removed.
+    """
+
+    removed = 0
+
+    for root, dirs, files in os.walk(build_dir, topdown=True):
+        for name in list(dirs):
+            # Console scripts are installed in a top-level bin/
+            top_bin = root == build_dir and name == "bin"
+
+            if top_bin or name in PRUNED_DIRS or name.endswith(PRUNED_DIR_SUFFIXES):
+                path = os.path.join(root, name)
+                removed += tree_size(path)
+                shutil.rmtree(path)
+                dirs.remove(name)
+
+        for name in files:
+            if name in PRUNED_FILES or name.endswith(PRUNED_SUFFIXES):
+                path = os.path.join(root, name)
+                removed += os.path.getsize(path)
+                os.remove(path)
+
+    return removed
+
+
+def compile_bytecode(build_dir: str, sourceless: bool):
+    """
+    Compiles every module with hashes that are not checked at import time,
+    so the output does not depend on file timestamps, and with their paths
+    rewritten from the build folder to `TASK_ROOT`, so it does not depend on
+    where the build ran either. Sourceless packages
+    need the .pyc next to where the .py was, otherwise they go to
+    __pycache__ where the source loader looks for them.
+    """
+
+    compiled = compileall.compile_dir(
+        build_dir,
+        quiet=1,
+        stripdir=build_dir,
+        prependdir=TASK_ROOT,
+        legacy=sourceless,
+        invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+    )
+
+    if not compiled:
+        raise SystemExit("Bytecode compilation failed")
+
+    if sourceless:
+        for root, _, files in os.walk(build_dir):
+            for name in files:
+                if name.endswith(".py"):
+                    os.remove(os.path.join(root, name))
+
+
+def tree_size(path: str) -> int:
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, files in os.walk(path)
+        for name in files
+    )
+
+
+def write_zip(build_dir: str, zip_path: str) -> list[str]:
+    paths = sorted(
+        os.path.relpath(os.path.join(root, name), build_dir)
+        for root, _, files in os.walk(build_dir)
+        for name in files
+    )
+
+    with zipfile.ZipFile(zip_path, "w") as archive:
+        for path in paths:
+            info = zipfile.ZipInfo(path.replace(os.sep, "/"), date_time=ZIP_DATE)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = 0o644 << 16
+
+            with open(os.path.join(build_dir, path), "rb") as file:
+                archive.writestr(info, file.read(), compresslevel=9)
+
+    return paths
+
+
+def report(build_dir: str, zip_path: str, paths: list[str], pruned: int) -> dict:
+    packages: dict = {}
+
+    for path in paths:
+        top = path.split(os.sep)[0]
+        packages[top] = packages.get(top, 0) + os.path.getsize(
+            os.path.join(build_dir, path)
+        )
+
+    return {
+        "zip_bytes": os.path.getsize(zip_path),
+        "unzipped_bytes": sum(packages.values()),
+        "files": len(paths),
+        "pruned_bytes": pruned,
+        "largest": dict(sorted(packages.items(), key=lambda item: -item[1])[:10]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--build-dir", default=os.path.join(ROOT_DIR, "build"))
+    parser.add_argument(
+        "--output", default=os.path.join(ROOT_DIR, "lambda_package.zip")
+    )
+    parser.add_argument(
+        "--python-version",
+        help="fail unless this interpreter matches the Lambda runtime, e.g. 3.11",
+    )
+    parser.add_argument("--requirements", default=REQUIREMENTS_FILE)
+    parser.add_argument("--find-links", help="install from local wheels only")
+    parser.add_argument(
+        "--sourceless", action="store_true", help="ship only the .pyc files"
+    )
+    parser.add_argument("--budget", default=BUDGET_FILE)
+    args = parser.parse_args()
+
+    running = f"{sys.version_info.major}.{sys.version_info.minor}"
+
+    if args.python_version and args.python_version != running:
+        raise SystemExit(
+            f"Building with Python {running}, the runtime is {args.python_version}"
+        )
+
+    # compileall strips the build folder from paths by prefix
+    args.build_dir = os.path.abspath(args.build_dir)
+
+    shutil.rmtree(args.build_dir, ignore_errors=True)
+    os.makedirs(args.build_dir)
+
+    install_dependencies(args.build_dir, args.requirements, args.find_links)
+    copy_sources(args.build_dir)
+    pruned = prune(args.build_dir)
+    compile_bytecode(args.build_dir, args.sourceless)
+    paths = write_zip(args.build_dir, args.output)
+
+    result = report(args.build_dir, args.output, paths, pruned)
+
+    with open(os.path.join(args.build_dir, "size_report.json"), "w") as file:
+        json.dump(result, file, indent=2)
+
+    print(f"{args.output}: python {running}")
+    print(
+        f"zip={result['zip_bytes'] / 1024:.1f}KB "
+        f"unzipped={result['unzipped_bytes'] / 1024:.1f}KB "
+        f"files={result['files']} pruned={result['pruned_bytes'] / 1024:.1f}KB"
+    )
+
+    for name, size in result["largest"].items():
+        print(f"  {name:<30} {size / 1024:>8.1f}KB")
+
+    if not os.path.exists(args.budget):
+        return
+
+    with open(args.budget) as file:
+        budget = json.load(file)
+
+    failures = [
+        f"{key} {result[key]} > {limit}"
+        for key, limit in (
+            ("zip_bytes", budget.get("max_zip_bytes")),
+            ("files", budget.get("max_files")),
+        )
+        if limit is not None and result[key] > limit
+    ]
+
+    if failures:
+        print(f"FAIL: package over budget: {', '.join(failures)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Minifies the email templates at build time and reports the byte savings.
+
+Every `.html` file of the source folder is written, minified, to the
+destination folder. Exits with an error if minifying changed the merge tags
+of a template. `build_package.py` runs it for the deployment zip.
+
+Usage:
+    python scripts/minify_templates.py [SOURCE_DIR] [DEST_DIR]
+"""
+
+import argparse
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, "src"))
+
+from minify import merge_tags, minify_html, savings  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "source", nargs="?", default=os.path.join(ROOT_DIR, "src", "templates")
+    )
+    parser.add_argument(
+        "dest", nargs="?", default=os.path.join(ROOT_DIR, "build", "templates")
+    )
+    args = parser.parse_args()
+
+    os.makedirs(args.dest, exist_ok=True)
+    total_before = total_after = 0
+
+    for name in sorted(os.listdir(args.source)):
+        if not name.endswith(".html"):
+            continue
+
+        source_path = os.path.join(args.source, name)
+
+        with open(source_path, encoding="utf-8", newline="") as file:
+            source = file.read()
+
+        minified = minify_html(source)
+
+        if merge_tags(minified) != merge_tags(source):
+            raise SystemExit(f"{name}: merge tags changed")
+
+        dest_path = os.path.join(args.dest, name)
+
+        with open(dest_path, "w", encoding="utf-8", newline="") as file:
+            file.write(minified)
+
+        report = savings(source, minified)
+        total_before += report["source_bytes"]
+        total_after += report["minified_bytes"]
+
+        print(
+            f"{name:<30} {report['source_bytes']:>8} -> {report['minified_bytes']:>8} "
+            f"bytes (-{report['saved_percent']}%)"
+        )
+
+    print(f"{'total':<30} {total_before:>8} -> {total_after:>8} bytes")
+
+
+if __name__ == "__main__":
+    main()
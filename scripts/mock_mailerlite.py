@@ -0,0 +1,496 @@
+"""
+In-memory mock of the MailerLite API used by the benchmark scripts.
+
+The server speaks HTTP/1.1 with keep-alive and counts every new TCP
+connection, so benchmarks can report how many handshakes a client pays for.
+An optional `handshake_delay` emulates the TLS cost of a real connection to
+connect.mailerlite.com, `latency` emulates the round trip of each request and
+`rate_limit` enforces a requests-per-minute limit with MailerLite's headers.
+"""
+
+import itertools
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+
+class MockState:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.ids = itertools.count(100000)
+        self.subscribers: dict = {}
+        self.subscribers_by_email: dict = {}
+        self.groups: dict = {}
+        self.campaigns: dict = {}
+        self.imports: dict = {}
+        self.connections = 0
+        self.http_requests = 0
+        self.requests: dict = {}
+        self.request_times: list = []
+        # route name -> (status, body) answered instead of the real route
+        self.faults: dict = {}
+        # If set, requests with another bearer token are answered with a 401
+        self.api_key: str | None = None
+
+    def next_id(self) -> str:
+        return str(next(self.ids))
+
+    def count(self, route: str):
+        with self.lock:
+            self.requests[route] = self.requests.get(route, 0) + 1
+
+    def fail(self, route: str, status: int, body: dict | str | None = None):
+        """
+        Makes every request to `route` (e.g. "post_group") answer `status`
+        with `body`; a string body is sent as HTML, like a gateway error.
+        """
+
+        with self.lock:
+            self.faults[route] = (status, body)
+
+    def reset_counters(self):
+        with self.lock:
+            self.connections = 0
+            self.http_requests = 0
+            self.requests = {}
+
+    def upsert_subscriber(self, body: dict) -> tuple[int, dict]:
+        email = body.get("email")
+
+        if not email or "@" not in email:
+            return 422, {"message": "The email must be a valid email address."}
+
+        with self.lock:
+            subscriber = self.subscribers_by_email.get(email)
+            status = 200
+
+            if subscriber is None:
+                subscriber = {"id": self.next_id(), "email": email, "fields": {}}
+                self.subscribers[subscriber["id"]] = subscriber
+                self.subscribers_by_email[email] = subscriber
+                status = 201
+
+            subscriber["fields"].update(body.get("fields") or {})
+
+            for group_id in body.get("groups") or []:
+                if group_id in self.groups:
+                    self.groups[group_id]["subscribers"].append(subscriber["id"])
+
+        return status, {"data": subscriber}
+
+    def create_group(self, name: str) -> dict:
+        with self.lock:
+            group = {"id": self.next_id(), "name": name, "subscribers": []}
+            self.groups[group["id"]] = group
+
+        return group
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: "MockServer"
+
+    routes = [
+        ("POST", r"/api/batch", "batch"),
+        ("GET", r"/api/subscribers/(?P<key>[^/]+)", "get_subscriber"),
+        ("POST", r"/api/subscribers", "post_subscriber"),
+        ("DELETE", r"/api/subscribers/(?P<key>[^/]+)", "delete_subscriber"),
+        (
+            "POST",
+            r"/api/subscribers/(?P<key>[^/]+)/groups/(?P<group_id>[^/]+)",
+            "assign_group",
+        ),
+        (
+            "POST",
+            r"/api/groups/(?P<group_id>[^/]+)/import-subscribers",
+            "import_subscribers",
+        ),
+        ("GET", r"/api/subscribers/import/(?P<import_id>[^/]+)", "import_status"),
+        ("GET", r"/api/groups", "list_groups"),
+        ("POST", r"/api/groups", "post_group"),
+        (
+            "DELETE",
+            r"/api/subscribers/(?P<key>[^/]+)/groups/(?P<group_id>[^/]+)",
+            "unassign_group",
+        ),
+        ("DELETE", r"/api/groups/(?P<group_id>[^/]+)", "delete_group"),
+        ("GET", r"/api/groups/(?P<group_id>[^/]+)/subscribers", "group_subscribers"),
+        ("POST", r"/api/campaigns", "post_campaign"),
+        ("GET", r"/api/campaigns/(?P<campaign_id>[^/]+)", "get_campaign"),
+        ("PUT", r"/api/campaigns/(?P<campaign_id>[^/]+)", "put_campaign"),
+        ("DELETE", r"/api/campaigns/(?P<campaign_id>[^/]+)", "delete_campaign"),
+        (
+            "POST",
+            r"/api/campaigns/(?P<campaign_id>[^/]+)/schedule",
+            "schedule_campaign",
+        ),
+    ]
+
+    def setup(self):
+        super().setup()
+        state = self.server.state
+
+        with state.lock:
+            state.connections += 1
+
+        if self.server.handshake_delay:
+            time.sleep(self.server.handshake_delay)
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def do_PUT(self):
+        self.dispatch("PUT")
+
+    def do_DELETE(self):
+        self.dispatch("DELETE")
+
+    def do_HEAD(self):
+        # Connection warm-up: answered without a body and not counted
+        self.send_response(404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def dispatch(self, method: str):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+
+        with self.server.state.lock:
+            self.server.state.http_requests += 1
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        headers = self.rate_limit_headers()
+
+        if headers.get("X-RateLimit-Remaining") == "0":
+            return self.respond(429, {"message": "Too Many Attempts."}, headers)
+
+        api_key = self.server.state.api_key
+
+        if api_key and self.headers.get("Authorization") != f"Bearer {api_key}":
+            return self.respond(401, {"message": "Unauthenticated."}, headers)
+
+        status, payload = self.route(method, self.path, json.loads(raw) if raw else {})
+        self.respond(status, payload, headers)
+
+    def rate_limit_headers(self) -> dict:
+        limit = self.server.rate_limit
+
+        if not limit:
+            return {}
+
+        state = self.server.state
+        now = time.monotonic()
+
+        with state.lock:
+            state.request_times = [t for t in state.request_times if now - t < 60]
+
+            if len(state.request_times) >= limit:
+                retry_after = 60 - (now - state.request_times[0])
+                return {
+                    "X-RateLimit-Limit": str(limit),
+                    "X-RateLimit-Remaining": "0",
+                    "Retry-After": str(max(1, round(retry_after))),
+                }
+
+            state.request_times.append(now)
+            remaining = limit - len(state.request_times)
+
+        return {"X-RateLimit-Limit": str(limit), "X-RateLimit-Remaining": str(remaining)}
+
+    def route(self, method: str, path: str, body: dict) -> tuple[int, dict | None]:
+        parts = urlsplit(path)
+        self.query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        self.body = body
+
+        for route_method, pattern, name in self.routes:
+            match = re.fullmatch(pattern, parts.path)
+
+            if route_method == method and match:
+                self.server.state.count(name)
+
+                if name in self.server.state.faults:
+                    return self.server.state.faults[name]
+
+                return getattr(self, name)(**match.groupdict())
+
+        return 404, {"message": "Not found"}
+
+    def batch(self):
+        items = self.body.get("requests") or []
+
+        if len(items) > 50:
+            return 422, {"message": "The requests may not have more than 50 items."}
+
+        responses = []
+
+        for item in items:
+            code, payload = self.route(
+                item["method"], "/" + item["path"].lstrip("/"), item.get("body") or {}
+            )
+            responses.append({"code": code, "body": payload})
+
+        failed = sum(1 for r in responses if r["code"] >= 300)
+
+        return 200, {
+            "total": len(responses),
+            "successful": len(responses) - failed,
+            "failed": failed,
+            "responses": responses,
+        }
+
+    def respond(self, status: int, payload: dict | None, headers: dict | None = None):
+        if isinstance(payload, str):
+            raw, content_type = payload.encode(), "text/html"
+        else:
+            raw = json.dumps(payload).encode() if payload is not None else b""
+            content_type = "application/json"
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(raw)))
+
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+
+        if self.close_connection:
+            self.send_header("Connection", "close")
+
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def page(self, items: list) -> tuple[int, dict]:
+        limit = int(self.query.get("limit", 25))
+        page = int(self.query.get("page", 1))
+        chunk = items[(page - 1) * limit : page * limit]
+        next_url = None
+
+        if page * limit < len(items):
+            query = dict(self.query, page=page + 1)
+            next_url = "/api/groups?" + urlencode(query)
+
+        return 200, {
+            "data": chunk,
+            "links": {"next": next_url},
+            "meta": {"current_page": page, "per_page": limit, "total": len(items)},
+        }
+
+    # Subscribers
+
+    def get_subscriber(self, key: str):
+        state = self.server.state
+        subscriber = state.subscribers.get(key) or state.subscribers_by_email.get(key)
+
+        if subscriber is None:
+            return 404, {"message": "Resource not found."}
+
+        return 200, {"data": subscriber}
+
+    def post_subscriber(self):
+        return self.server.state.upsert_subscriber(self.body)
+
+    def delete_subscriber(self, key: str):
+        state = self.server.state
+
+        with state.lock:
+            subscriber = state.subscribers.pop(key, None)
+
+            if subscriber is None:
+                return 404, {"message": "Resource not found."}
+
+            state.subscribers_by_email.pop(subscriber["email"], None)
+
+        return 204, None
+
+    def assign_group(self, key: str, group_id: str):
+        state = self.server.state
+        group = state.groups.get(group_id)
+
+        if group is None or key not in state.subscribers:
+            return 404, {"message": "Resource not found."}
+
+        with state.lock:
+            group["subscribers"].append(key)
+
+        return 200, {"data": {"id": group_id, "name": group["name"]}}
+
+    def unassign_group(self, key: str, group_id: str):
+        group = self.server.state.groups.get(group_id)
+
+        if group is None or key not in group["subscribers"]:
+            return 404, {"message": "Resource not found."}
+
+        with self.server.state.lock:
+            group["subscribers"].remove(key)
+
+        return 204, None
+
+    def import_subscribers(self, group_id: str):
+        state = self.server.state
+
+        if group_id not in state.groups:
+            return 404, {"message": "Resource not found."}
+
+        job = {"id": state.next_id(), "polls": 0}
+        counters = {201: "imported", 200: "updated"}
+
+        for name in ("processed", "imported", "updated", "errored"):
+            job[name] = 0
+
+        for subscriber in self.body.get("subscribers") or []:
+            status, _ = state.upsert_subscriber(dict(subscriber, groups=[group_id]))
+            job["processed"] += 1
+            job[counters.get(status, "errored")] += 1
+
+        state.imports[job["id"]] = job
+
+        return 200, {
+            "import_progress_url": f"{self.server.url}/subscribers/import/{job['id']}"
+        }
+
+    def import_status(self, import_id: str):
+        job = self.server.state.imports.get(import_id)
+
+        if job is None:
+            return 404, {"message": "Resource not found."}
+
+        # Report the job as running on the first poll
+        job["polls"] += 1
+        done = job["polls"] > 1
+
+        return 200, {
+            "data": {
+                "id": job["id"],
+                "processed": job["processed"] if done else 0,
+                "imported": job["imported"] if done else 0,
+                "updated": job["updated"] if done else 0,
+                "errored": job["errored"] if done else 0,
+                "done": done,
+            }
+        }
+
+    # Groups
+
+    def list_groups(self):
+        groups = list(self.server.state.groups.values())
+        name = self.query.get("filter[name]")
+
+        if name is not None:
+            groups = [group for group in groups if name in group["name"]]
+
+        return self.page([{"id": g["id"], "name": g["name"]} for g in groups])
+
+    def post_group(self):
+        group = self.server.state.create_group(self.body["name"])
+        return 201, {"data": {"id": group["id"], "name": group["name"]}}
+
+    def delete_group(self, group_id: str):
+        if self.server.state.groups.pop(group_id, None) is None:
+            return 404, {"message": "Resource not found."}
+
+        return 204, None
+
+    def group_subscribers(self, group_id: str):
+        state = self.server.state
+        group = state.groups.get(group_id)
+
+        if group is None:
+            return 404, {"message": "Resource not found."}
+
+        limit = int(self.query.get("limit", 50))
+        start = int(self.query.get("cursor") or 0)
+        ids = group["subscribers"][start : start + limit]
+        next_cursor = None
+
+        if start + limit < len(group["subscribers"]):
+            next_cursor = str(start + limit)
+
+        return 200, {
+            "data": [state.subscribers[i] for i in ids if i in state.subscribers],
+            "meta": {"next_cursor": next_cursor, "per_page": limit},
+        }
+
+    # Campaigns
+
+    def post_campaign(self):
+        state = self.server.state
+        campaign = dict(self.body, id=state.next_id(), status="draft")
+
+        with state.lock:
+            state.campaigns[campaign["id"]] = campaign
+
+        return 201, {"data": campaign}
+
+    def get_campaign(self, campaign_id: str):
+        campaign = self.server.state.campaigns.get(campaign_id)
+
+        if campaign is None:
+            return 404, {"message": "Resource not found."}
+
+        return 200, {"data": campaign}
+
+    def put_campaign(self, campaign_id: str):
+        campaign = self.server.state.campaigns.get(campaign_id)
+
+        if campaign is None:
+            return 404, {"message": "Resource not found."}
+
+        campaign.update(self.body)
+        return 200, {"data": campaign}
+
+    def delete_campaign(self, campaign_id: str):
+        if self.server.state.campaigns.pop(campaign_id, None) is None:
+            return 404, {"message": "Resource not found."}
+
+        return 204, None
+
+    def schedule_campaign(self, campaign_id: str):
+        campaign = self.server.state.campaigns.get(campaign_id)
+
+        if campaign is None:
+            return 404, {"message": "Resource not found."}
+
+        campaign["status"] = "sent"
+        return 200, {"data": campaign}
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        handshake_delay: float = 0.0,
+        rate_limit: int | None = None,
+    ):
+        super().__init__(("127.0.0.1", 0), MockHandler)
+        self.state = MockState()
+        self.latency = latency
+        self.handshake_delay = handshake_delay
+        self.rate_limit = rate_limit
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,164 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from mailer_client import MailerLiteClient
+from template_registry import DEFAULT_TEMPLATE
+
+
+class AsyncMailerLiteClient:
+    """
+    Asyncio front-end for `MailerLiteClient`.
+
+    Every request method of `MailerLiteClient` is mirrored as a coroutine.
+    Calls are dispatched to a bounded worker pool that shares the wrapped
+    client's pooled session, so connection reuse, headers and any transport
+    policy of the sync client apply to the async calls as well. No extra
+    HTTP dependency has to be shipped in the Lambda package.
+    """
+
+    def __init__(self, client: MailerLiteClient, max_concurrency: int = 10):
+        self.client: MailerLiteClient = client
+        self.max_concurrency: int = max_concurrency
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="mailerlite"
+        )
+
+    async def _run(self, method, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+
+        return await loop.run_in_executor(
+            self._executor, functools.partial(method, *args, **kwargs)
+        )
+
+    def close(self):
+        """
+        Shuts down the worker pool. The wrapped client is left open, since it
+        is usually shared with the sync code path.
+        """
+
+        self._executor.shutdown(wait=True)
+
+    def check_status_code(self, status_code: int, body: dict | None = None):
+        """
+        Same as `MailerLiteClient.check_status_code`. It does no I/O, so it
+        is a plain method.
+        """
+
+        return self.client.check_status_code(status_code, body)
+
+    async def post(
+        self, url: str, data: dict, idempotent: bool = False
+    ) -> tuple[int, dict]:
+        return await self._run(self.client.post, url, data, idempotent)
+
+    async def batch(
+        self, requests: list[dict], idempotent: bool = False
+    ) -> tuple[int, dict]:
+        return await self._run(self.client.batch, requests, idempotent)
+
+    async def user_exists(self, email: str) -> tuple[int, dict] | None:
+        return await self._run(self.client.user_exists, email)
+
+    async def add_user(
+        self, email: str, name: str, last_name=None
+    ) -> tuple[int, dict]:
+        return await self._run(self.client.add_user, email, name, last_name)
+
+    async def upsert_subscriber(
+        self,
+        email: str,
+        name: str,
+        groups: list | None = None,
+        fields: dict | None = None,
+    ) -> tuple[int, dict]:
+        return await self._run(
+            self.client.upsert_subscriber, email, name, groups=groups, fields=fields
+        )
+
+    async def sync_subscriber(
+        self,
+        email: str,
+        name: str,
+        groups: list | None = None,
+        fields: dict | None = None,
+    ) -> tuple[int, dict]:
+        return await self._run(
+            self.client.sync_subscriber, email, name, groups=groups, fields=fields
+        )
+
+    async def list_group_subscribers(self, group_id: str, **kwargs) -> list[dict]:
+        """
+        Collects `MailerLiteClient.iter_group_subscribers` into a list.
+        """
+
+        return await self._run(
+            lambda: list(self.client.iter_group_subscribers(group_id, **kwargs))
+        )
+
+    async def user_suscribed_to_group(self, user_id: str, group_id) -> dict | None:
+        return await self._run(self.client.user_suscribed_to_group, user_id, group_id)
+
+    async def subscribe_user(self, user_id: str, group_id) -> int:
+        return await self._run(self.client.subscribe_user, user_id, group_id)
+
+    async def delete_user(self, user_id: str) -> int:
+        return await self._run(self.client.delete_user, user_id)
+
+    async def import_subscribers_to_group(
+        self, group_id: str, users, **kwargs
+    ) -> dict:
+        return await self._run(
+            self.client.import_subscribers_to_group, group_id, users, **kwargs
+        )
+
+    async def list_groups(self, name: str | None = None, **kwargs) -> list[dict]:
+        """
+        Collects `MailerLiteClient.iter_groups` into a list.
+        """
+
+        return await self._run(lambda: list(self.client.iter_groups(name, **kwargs)))
+
+    async def group_exists(self, group_name: str):
+        return await self._run(self.client.group_exists, group_name)
+
+    async def create_group(self, name: str) -> tuple[int, dict]:
+        return await self._run(self.client.create_group, name)
+
+    async def delete_group(self, group_id: str) -> int:
+        return await self._run(self.client.delete_group, group_id)
+
+    async def create_campaign(
+        self,
+        name: str,
+        groups,
+        from_email: str,
+        from_name: str,
+        subject: str,
+        content: str,
+    ) -> tuple[int, dict]:
+        return await self._run(
+            self.client.create_campaign,
+            name=name,
+            groups=groups,
+            from_email=from_email,
+            from_name=from_name,
+            subject=subject,
+            content=content,
+        )
+
+    async def get_campaign(self, campaign_id: str) -> dict:
+        return await self._run(self.client.get_campaign, campaign_id)
+
+    async def update_campaign_group(
+        self, campaign_id: str, group_id: str, template_id: str = DEFAULT_TEMPLATE
+    ):
+        return await self._run(
+            self.client.update_campaign_group, campaign_id, group_id, template_id
+        )
+
+    async def send_campaign(self, campaign_id) -> tuple[int, dict]:
+        return await self._run(self.client.send_campaign, campaign_id)
+
+    async def delete_campaign(self, campaign_id) -> int:
+        return await self._run(self.client.delete_campaign, campaign_id)
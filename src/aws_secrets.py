@@ -0,0 +1,27 @@
+# Importing boto3 and building its client is the most expensive part of a
+# cold start, so this module is only imported by `secret_cache` the first
+# time a secret is actually read.
+import threading
+
+import boto3
+
+REGION_NAME = "us-west-1"
+
+_secrets_client = None
+_lock = threading.Lock()
+
+
+def get_secrets_client():
+    """
+    Returns the Secrets Manager client, created once per container.
+    """
+
+    global _secrets_client
+
+    with _lock:
+        if _secrets_client is None:
+            _secrets_client = boto3.session.Session().client(
+                service_name="secretsmanager", region_name=REGION_NAME
+            )
+
+    return _secrets_client
@@ -0,0 +1,225 @@
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from errors import DeadlineExceeded, MailerLiteError, TransportError
+from mailer_client import MailerLiteClient
+from structured_log import log
+
+# Maximum number of requests MailerLite accepts in one batch
+MAX_BATCH_SIZE = 50
+
+
+class BatchOperation:
+    """
+    A single API request queued in a `BatchEngine`.
+
+    Attributes:
+        key: Caller-defined value used to map the result back to its origin
+             (for example the index or email of a user).
+        method (str): HTTP method.
+        path (str): Path relative to the API root, e.g. "subscribers".
+        body (dict | None): JSON body of the request.
+        idempotent (bool): Whether repeating the request is safe. A batch is
+                           only retried after a server error if all of its
+                           operations are.
+    """
+
+    def __init__(
+        self,
+        key,
+        method: str,
+        path: str,
+        body: dict | None = None,
+        idempotent: bool = True,
+    ):
+        self.key = key
+        self.method: str = method
+        self.path: str = path
+        self.body: dict | None = body
+        self.idempotent: bool = idempotent
+
+
+class BatchResult:
+    """
+    Outcome of a `BatchOperation`.
+
+    Attributes:
+        key: The key of the originating operation.
+        status_code (int): HTTP status of the sub-request, or of the whole
+                           batch request if it failed.
+        body (dict): The JSON response of the sub-request.
+    """
+
+    def __init__(self, key, status_code: int, body: dict | None):
+        self.key = key
+        self.status_code: int = status_code
+        self.body: dict = body or {}
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status_code < 300
+
+    @property
+    def error(self) -> str | None:
+        if self.ok:
+            return None
+
+        return self.body.get("message") or f"HTTP {self.status_code}"
+
+    def __repr__(self):
+        return f"BatchResult(key={self.key!r}, status_code={self.status_code})"
+
+
+class BatchEngine:
+    """
+    Packs subscriber and group operations into MailerLite `/api/batch`
+    requests.
+
+    Operations are queued with the helper methods and sent by `run`, which
+    splits them into batches of `batch_size` and dispatches up to
+    `max_workers` batches in parallel over the client's pooled session.
+    Results are returned in the order the operations were queued.
+
+    Example:
+        engine = BatchEngine(client)
+        for i, user in enumerate(users):
+            engine.upsert_subscriber(i, user["email"], user["name"], [group_id])
+        results = engine.run()
+    """
+
+    def __init__(
+        self,
+        client: MailerLiteClient,
+        batch_size: int = MAX_BATCH_SIZE,
+        max_workers: int = 4,
+    ):
+        self.client: MailerLiteClient = client
+        self.batch_size: int = max(1, min(batch_size, MAX_BATCH_SIZE))
+        self.max_workers: int = max(1, max_workers)
+        self.operations: list[BatchOperation] = []
+        self.requests_sent: int = 0
+
+        # Batch paths are relative to the host, e.g. "api/subscribers"
+        self._prefix: str = urlsplit(client.base_url).path.strip("/")
+
+    def add(
+        self,
+        key,
+        method: str,
+        path: str,
+        body: dict | None = None,
+        idempotent: bool = True,
+    ):
+        self.operations.append(BatchOperation(key, method, path, body, idempotent))
+
+    def upsert_subscriber(
+        self,
+        key,
+        email: str,
+        name: str,
+        groups: list | None = None,
+        fields: dict | None = None,
+    ):
+        body = {"email": email, "fields": {"name": name, **(fields or {})}}
+
+        if groups:
+            body["groups"] = list(groups)
+
+        self.add(key, "POST", "subscribers", body)
+
+    def subscribe_user(self, key, user_id: str, group_id: str):
+        self.add(key, "POST", f"subscribers/{user_id}/groups/{group_id}")
+
+    def unsubscribe_user(self, key, user_id: str, group_id: str):
+        self.add(key, "DELETE", f"subscribers/{user_id}/groups/{group_id}")
+
+    def delete_user(self, key, user_id: str):
+        self.add(key, "DELETE", f"subscribers/{user_id}")
+
+    def create_group(self, key, name: str):
+        self.add(key, "POST", "groups", {"name": name}, idempotent=False)
+
+    def delete_group(self, key, group_id: str):
+        self.add(key, "DELETE", f"groups/{group_id}")
+
+    def _send(self, chunk: list[BatchOperation]) -> list[BatchResult]:
+        requests = []
+
+        for operation in chunk:
+            request = {
+                "method": operation.method,
+                "path": f"{self._prefix}/{operation.path}".lstrip("/"),
+            }
+
+            if operation.body is not None:
+                request["body"] = operation.body
+
+            requests.append(request)
+
+        idempotent = all(operation.idempotent for operation in chunk)
+
+        try:
+            status_code, result = self.client.batch(requests, idempotent=idempotent)
+        except (DeadlineExceeded, TransportError):
+            # No answer at all, not a rejected batch: the handler turns these
+            # into its own responses (504 with the progress made so far)
+            raise
+        except MailerLiteError as error:
+            log.error("batch_failed", operations=len(chunk), error=error)
+            body = error.body or {"message": str(error)}
+            return [BatchResult(op.key, error.status_code or 0, body) for op in chunk]
+
+        responses = result.get("responses") if status_code == 200 else None
+
+        if not responses:
+            # The whole batch failed, every operation shares its status
+            return [BatchResult(op.key, status_code, result) for op in chunk]
+
+        if len(responses) < len(chunk):
+            # Never shift results onto the wrong operations: the ones without
+            # a response are failed
+            log.error(
+                "batch_responses_missing",
+                operations=len(chunk),
+                responses=len(responses),
+            )
+            missing = {"code": 0, "body": {"message": "No response in the batch."}}
+            responses = [*responses, *[missing] * (len(chunk) - len(responses))]
+
+        return [
+            BatchResult(op.key, response.get("code", 0), response.get("body"))
+            for op, response in zip(chunk, responses)
+        ]
+
+    def run(self) -> list[BatchResult]:
+        """
+        Sends every queued operation and clears the queue.
+
+        Returns:
+            list[BatchResult]: One result per operation, in queue order.
+        """
+
+        operations, self.operations = self.operations, []
+        chunks = [
+            operations[i : i + self.batch_size]
+            for i in range(0, len(operations), self.batch_size)
+        ]
+
+        if not chunks:
+            return []
+
+        self.requests_sent += len(chunks)
+
+        if len(chunks) == 1 or self.max_workers == 1:
+            return [result for chunk in chunks for result in self._send(chunk)]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return [
+                result
+                for results in executor.map(self._send, chunks)
+                for result in results
+            ]
+
+    @staticmethod
+    def failures(results: list[BatchResult]) -> list[BatchResult]:
+        return [result for result in results if not result.ok]
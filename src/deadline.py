@@ -0,0 +1,48 @@
+import time
+
+
+class Deadline:
+    """
+    Point in time by which an invocation must be done.
+
+    Args:
+        expires_at (float | None): `time.monotonic()` value of the deadline,
+                                   or None for no deadline.
+    """
+
+    def __init__(self, expires_at: float | None = None):
+        self.expires_at: float | None = expires_at
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        return cls(time.monotonic() + seconds)
+
+    @classmethod
+    def from_context(cls, context, reserve: float = 0.0) -> "Deadline":
+        """
+        Builds the deadline of a Lambda invocation.
+
+        Args:
+            context: The Lambda context, or None outside Lambda (no
+                     deadline).
+            reserve (float): Seconds kept free to build the response before
+                             Lambda stops the invocation.
+        """
+
+        if context is None or not hasattr(context, "get_remaining_time_in_millis"):
+            return cls()
+
+        return cls.after(context.get_remaining_time_in_millis() / 1000 - reserve)
+
+    def remaining(self) -> float:
+        """
+        Returns the seconds left, `math.inf` if there is no deadline.
+        """
+
+        if self.expires_at is None:
+            return float("inf")
+
+        return self.expires_at - time.monotonic()
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
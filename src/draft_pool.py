@@ -0,0 +1,272 @@
+import json
+import os
+import threading
+import time
+
+from errors import MailerLiteError
+from mailer_client import MailerLiteClient
+from structured_log import log
+
+
+class DraftPool:
+    """
+    Pool of ready-to-send draft campaigns, each addressed to its own empty
+    group.
+
+    `claim` hands out a draft so the handler only has to fill the group and
+    send the campaign; group and campaign creation happen in `refill`,
+    outside the request's critical path. The pool is saved to a small JSON
+    state file (e.g. in /tmp) after every change and loaded on cold start.
+
+    Drafts record the hash of their email content, so a request only
+    claims a draft that already carries the email it wants to send.
+
+    Drafts older than `max_age` are not handed out; they are kept (and
+    saved) until the next `refill` deletes their campaign and group with
+    `delete_draft`. The drafts a container holds, ready or waiting to be
+    deleted, never exceed `max_outstanding`, which bounds what is left in
+    the account if the container and its state file disappear.
+
+    Args:
+        create_draft: Function called with a MailerLiteClient that creates
+                      an empty group and a draft campaign for it, returning
+                      a dict with 'group_id', 'campaign_id' and
+                      'template_hash'.
+        size (int): Drafts kept ready.
+        path (str | None): State file.
+        max_age (float): Seconds after which an unclaimed draft expires.
+        delete_draft: Function called with a MailerLiteClient and an
+                      expired draft that deletes its campaign and group.
+                      Without it expired drafts are only forgotten.
+        max_outstanding (int | None): Most drafts held at once, expired
+                                      ones included. Defaults to twice
+                                      `size`.
+    """
+
+    def __init__(
+        self,
+        create_draft,
+        size: int = 2,
+        path: str | None = None,
+        max_age: float = 86400.0,
+        delete_draft=None,
+        max_outstanding: int | None = None,
+    ):
+        self.create_draft = create_draft
+        self.delete_draft = delete_draft
+        self.size: int = max(0, size)
+        self.path: str | None = path
+        self.max_age: float = max_age
+        self.max_outstanding: int = max(
+            self.size, 2 * self.size if max_outstanding is None else max_outstanding
+        )
+
+        # Each draft: {"group_id", "campaign_id", "template_hash", "created_at"}
+        self.drafts: list[dict] = []
+        # Expired drafts whose campaign and group are still to be deleted
+        self.expired: list[dict] = []
+        self.claimed: int = 0
+        self.missed: int = 0
+        self.deleted: int = 0
+
+        self._lock = threading.Lock()
+        self._refilling = threading.Lock()
+
+        self.load()
+
+    def claim(self, template_hash: str | None = None) -> dict | None:
+        """
+        Takes the oldest fresh draft out of the pool.
+
+        Args:
+            template_hash (str | None): Only claim a draft with this content.
+
+        Returns:
+            dict | None: The draft's 'group_id' and 'campaign_id', or None
+                         if no draft matches.
+        """
+
+        with self._lock:
+            self._expire()
+
+            draft = next(
+                (
+                    draft
+                    for draft in self.drafts
+                    if template_hash is None
+                    or draft.get("template_hash") == template_hash
+                ),
+                None,
+            )
+
+            if draft is None:
+                self.missed += 1
+                return None
+
+            self.drafts.remove(draft)
+            self.claimed += 1
+
+        self.save()
+
+        return draft
+
+    def _expire(self):
+        # Called with the lock held
+        now = time.time()
+
+        for draft in list(self.drafts):
+            if now - draft["created_at"] >= self.max_age:
+                self.drafts.remove(draft)
+                self.expired.append(draft)
+
+    def delete_expired(self, client: MailerLiteClient) -> int:
+        """
+        Deletes the campaign and group of every expired draft. A draft that
+        fails to be deleted is kept for the next call.
+
+        Returns:
+            int: The number of drafts deleted.
+        """
+
+        with self._lock:
+            self._expire()
+            expired = list(self.expired)
+
+        if self.delete_draft is None:
+            deleted = expired
+        else:
+            deleted = []
+
+            for draft in expired:
+                try:
+                    self.delete_draft(client, draft)
+                except MailerLiteError as error:
+                    log.warning("draft_delete_failed", error=error, **draft)
+                    break
+
+                deleted.append(draft)
+
+        if deleted:
+            with self._lock:
+                for draft in deleted:
+                    self.expired.remove(draft)
+
+                self.deleted += len(deleted)
+
+            self.save()
+
+        return len(deleted)
+
+    def refill(self, client: MailerLiteClient, max_new: int | None = None) -> int:
+        """
+        Deletes the expired drafts, then creates drafts until the pool is
+        full or holds `max_outstanding` drafts. Failures are logged and
+        stop the refill, the pool is retried on the next call.
+
+        Args:
+            max_new (int | None): Most drafts created by this call, e.g. the
+                                  number an invocation claimed, so a request
+                                  never fills a cold pool. None fills it.
+
+        Returns:
+            int: The number of drafts created.
+        """
+
+        # Only one refill at a time, a concurrent call has nothing to do
+        if not self._refilling.acquire(blocking=False):
+            return 0
+
+        created = 0
+
+        try:
+            self.delete_expired(client)
+
+            while (
+                (max_new is None or created < max_new)
+                and len(self.drafts) < self.size
+                and len(self.drafts) + len(self.expired) < self.max_outstanding
+            ):
+                try:
+                    draft = self.create_draft(client)
+                except MailerLiteError as error:
+                    log.warning("draft_refill_failed", error=error)
+                    break
+
+                with self._lock:
+                    self.drafts.append({**draft, "created_at": time.time()})
+
+                created += 1
+                self.save()
+        finally:
+            self._refilling.release()
+
+        return created
+
+    def refill_async(
+        self, client: MailerLiteClient, max_new: int | None = None
+    ) -> threading.Thread:
+        """
+        Runs `refill` on a background thread.
+
+        The caller should join the thread before the invocation returns,
+        so Lambda never freezes it in the middle of a request, and pass a
+        client with its own retry budget and deadline (see
+        `MailerLiteClient.for_invocation`).
+
+        Returns:
+            threading.Thread: The started thread.
+        """
+
+        thread = threading.Thread(
+            target=self.refill, args=(client, max_new), daemon=True
+        )
+        thread.start()
+
+        return thread
+
+    def stats(self) -> dict:
+        return {
+            "ready": len(self.drafts),
+            "claimed": self.claimed,
+            "missed": self.missed,
+            "expired": len(self.expired),
+            "deleted": self.deleted,
+        }
+
+    def save(self):
+        if not self.path:
+            return
+
+        with self._lock:
+            data = {"drafts": list(self.drafts), "expired": list(self.expired)}
+
+        # Per thread, a background refill may save at the same time
+        tmp_path = f"{self.path}.{threading.get_ident()}.tmp"
+
+        try:
+            with open(tmp_path, "w") as file:
+                json.dump(data, file)
+
+            os.replace(tmp_path, self.path)
+        except OSError as error:
+            log.warning("draft_pool_not_saved", error=error)
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path) as file:
+                data = json.load(file)
+        except (OSError, ValueError) as error:
+            log.warning("draft_pool_not_loaded", error=error)
+            return
+
+        # Older state files only hold the list of ready drafts
+        if isinstance(data, list):
+            data = {"drafts": data}
+
+        with self._lock:
+            self.drafts = data.get("drafts", [])
+            self.expired = data.get("expired", [])
+            self._expire()
@@ -0,0 +1,126 @@
+class MailerLiteError(Exception):
+    """
+    Base class for errors returned by the MailerLite API.
+
+    Attributes:
+        status_code (int | None): The HTTP status returned by MailerLite, or
+                                  None if no response was received.
+        body (dict): The JSON-decoded error response, if any.
+        http_status (int): The status the Lambda handler answers with when
+                           this error reaches it.
+    """
+
+    http_status: int = 502
+
+    def __init__(
+        self, message: str, status_code: int | None = None, body: dict | None = None
+    ):
+        super().__init__(message)
+        self.message: str = message
+        self.status_code: int | None = status_code
+        self.body: dict = body or {}
+
+
+class AuthenticationError(MailerLiteError):
+    """
+    The API key was rejected (401/403).
+    """
+
+
+class ValidationError(MailerLiteError):
+    """
+    MailerLite rejected the request data (400/422).
+    """
+
+    http_status = 422
+
+
+class NotFoundError(MailerLiteError):
+    """
+    The requested resource does not exist (404).
+    """
+
+    http_status = 404
+
+
+class RateLimitedError(MailerLiteError):
+    """
+    The account rate limit was exceeded (429).
+
+    Attributes:
+        retry_after (float | None): Seconds to wait before retrying, if the
+                                    server said so.
+    """
+
+    http_status = 429
+
+    def __init__(
+        self,
+        message: str,
+        status_code: int | None = 429,
+        body: dict | None = None,
+        retry_after: float | None = None,
+    ):
+        super().__init__(message, status_code, body)
+        self.retry_after: float | None = retry_after
+
+
+class ServerError(MailerLiteError):
+    """
+    MailerLite failed to process the request (5xx).
+    """
+
+
+class TransportError(MailerLiteError):
+    """
+    No response was received from MailerLite (connection or read failure).
+    """
+
+
+class DeadlineExceeded(MailerLiteError):
+    """
+    The invocation ran out of time before the request could complete.
+    """
+
+    http_status = 504
+
+
+class ImportTimeout(MailerLiteError):
+    """
+    A bulk import job did not finish within its timeout.
+    """
+
+    http_status = 504
+
+
+_ERRORS_BY_STATUS: dict = {
+    400: ValidationError,
+    401: AuthenticationError,
+    403: AuthenticationError,
+    404: NotFoundError,
+    422: ValidationError,
+    429: RateLimitedError,
+}
+
+
+def error_for_status(status_code: int, body: dict | None = None) -> MailerLiteError:
+    """
+    Builds the exception that matches an HTTP status code.
+
+    Args:
+        status_code (int): The HTTP status code returned by MailerLite.
+        body (dict | None): The JSON-decoded response, used for the message.
+
+    Returns:
+        MailerLiteError: The matching exception instance.
+    """
+
+    body = body or {}
+    message = body.get("message") or f"Unexpected status code: {status_code}"
+
+    if status_code >= 500:
+        return ServerError(message, status_code, body)
+
+    error_class = _ERRORS_BY_STATUS.get(status_code, MailerLiteError)
+
+    return error_class(message, status_code, body)
@@ -0,0 +1,177 @@
+import hashlib
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from batch import BatchEngine
+from mailer_client import MailerLiteClient
+
+
+class GroupAllocation:
+    """
+    The group picked for an invocation.
+
+    Attributes:
+        group_id (str): The MailerLite group ID.
+        name (str): The group name.
+        empty (bool): True if the group is known to have no subscribers, so
+                      its membership does not need to be downloaded.
+    """
+
+    def __init__(self, group_id: str, name: str, empty: bool):
+        self.group_id: str = group_id
+        self.name: str = name
+        self.empty: bool = empty
+
+    def __repr__(self):
+        return f"GroupAllocation(group_id={self.group_id!r}, empty={self.empty})"
+
+
+def _timestamp() -> str:
+    return datetime.now().strftime("%Y%m%d%H%M%S%f")[:-3]
+
+
+def _create_group(client: MailerLiteClient, name: str) -> str:
+    status_code, result = client.create_group(name)
+    client.check_status_code(status_code, result)
+
+    return result["data"]["id"]
+
+
+class AlwaysNewGroups:
+    """
+    Creates a new group with a timestamped name on every invocation.
+
+    The name is unique by construction, so no lookup is done: one
+    create-group request per invocation.
+    """
+
+    name = "always-new"
+
+    def allocate(self, client: MailerLiteClient, users: list[dict]) -> GroupAllocation:
+        group_name = f"code group {_timestamp()}"
+
+        return GroupAllocation(_create_group(client, group_name), group_name, True)
+
+
+class FingerprintGroups:
+    """
+    Uses one group per distinct set of recipients.
+
+    The group name is derived from a hash of the (canonical) emails, so
+    repeated requests for the same list land in the same group. Group IDs
+    are cached by name; on a miss the group is searched with
+    `group_exists` and created if it does not exist.
+
+    Args:
+        ttl (float): Seconds a cached group ID is trusted.
+    """
+
+    name = "fingerprint"
+
+    def __init__(self, ttl: float = 3600.0):
+        self.ttl: float = ttl
+        # group name -> (group ID, cached at)
+        self._groups: dict = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(users: list[dict]) -> str:
+        emails = sorted({user["email"].lower() for user in users})
+
+        return hashlib.sha1("\n".join(emails).encode()).hexdigest()[:16]
+
+    def forget(self, group_id: str):
+        """
+        Drops a cached group, e.g. after it was deleted.
+        """
+
+        with self._lock:
+            for name, (cached_id, _) in list(self._groups.items()):
+                if cached_id == group_id:
+                    del self._groups[name]
+
+    def allocate(self, client: MailerLiteClient, users: list[dict]) -> GroupAllocation:
+        group_name = f"code group {self.fingerprint(users)}"
+
+        with self._lock:
+            cached = self._groups.get(group_name)
+
+        if cached is not None and time.monotonic() - cached[1] <= self.ttl:
+            return GroupAllocation(cached[0], group_name, False)
+
+        group = client.group_exists(group_name)
+
+        if group:
+            group_id, empty = group["id"], False
+        else:
+            group_id, empty = _create_group(client, group_name), True
+
+        with self._lock:
+            self._groups[group_name] = (group_id, time.monotonic())
+
+        return GroupAllocation(group_id, group_name, empty)
+
+
+class GroupPool:
+    """
+    Hands out empty groups created ahead of time.
+
+    When the pool runs dry, `size` groups are created with a single batch
+    request, so on average an invocation costs `1 / size` requests for its
+    group. Groups are never handed out twice.
+
+    Args:
+        size (int): Groups created per refill (one batch request per 50).
+    """
+
+    name = "pool"
+
+    def __init__(self, size: int = 10):
+        self.size: int = max(1, size)
+        self._groups: deque = deque()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._groups)
+
+    def refill(self, client: MailerLiteClient):
+        """
+        Creates `size` new groups and adds them to the pool.
+        """
+
+        prefix = f"code group {_timestamp()}"
+        engine = BatchEngine(client, max_workers=1)
+
+        for i in range(self.size):
+            engine.create_group(f"{prefix}-{i}", f"{prefix}-{i}")
+
+        results = engine.run()
+
+        with self._lock:
+            self._groups.extend(
+                (result.body["data"]["id"], result.key)
+                for result in results
+                if result.ok
+            )
+
+        for failure in BatchEngine.failures(results):
+            client.check_status_code(failure.status_code, failure.body)
+
+    def allocate(self, client: MailerLiteClient, users: list[dict]) -> GroupAllocation:
+        while True:
+            with self._lock:
+                if self._groups:
+                    group_id, group_name = self._groups.popleft()
+                    return GroupAllocation(group_id, group_name, True)
+
+            self.refill(client)
+
+
+GROUP_POLICIES: dict = {
+    AlwaysNewGroups.name: AlwaysNewGroups,
+    FingerprintGroups.name: FingerprintGroups,
+    GroupPool.name: GroupPool,
+}
+
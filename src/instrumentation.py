@@ -0,0 +1,274 @@
+import json
+import re
+import threading
+import time
+from urllib.parse import urlsplit
+
+# Upper bounds (ms) of the latency histogram buckets, the last one catches
+# everything slower
+LATENCY_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+# Value reported for the overflow bucket
+_BOUNDS = (*LATENCY_BUCKETS, LATENCY_BUCKETS[-1] * 2)
+# Path segments holding IDs or emails, e.g. /subscribers/123 or /subscribers/a@b.c
+_ID_SEGMENT = re.compile(r"[0-9@]|%40")
+
+
+def endpoint_template(url: str, base_url: str = "") -> str:
+    """
+    Returns the endpoint of `url` with its IDs replaced, so calls to the same
+    endpoint are aggregated together.
+
+    Example:
+        `https://connect.mailerlite.com/api/subscribers/42/groups/7?x=1`
+        becomes `/subscribers/{id}/groups/{id}`.
+    """
+
+    path = urlsplit(url).path
+
+    if base_url:
+        base_path = urlsplit(base_url).path.rstrip("/")
+
+        if path.startswith(base_path):
+            path = path[len(base_path) :]
+
+    return "/".join(
+        "{id}" if _ID_SEGMENT.search(segment) else segment
+        for segment in path.split("/")
+    )
+
+
+class RequestRecord:
+    """
+    One API call of a `MailerLiteClient`, retries included.
+
+    Attributes:
+        method (str): The HTTP method.
+        endpoint (str): The endpoint template, see `endpoint_template`.
+        status (int | None): Status of the last response, None if no
+                             response was received.
+        bytes_sent (int): Size of the request body.
+        bytes_received (int): Size of the response body.
+        latency (float): Seconds from the first attempt to the last
+                         response, backoff and rate-limit waits included.
+        retries (int): Attempts after the first one.
+    """
+
+    def __init__(
+        self,
+        method: str,
+        endpoint: str,
+        status: int | None,
+        bytes_sent: int,
+        bytes_received: int,
+        latency: float,
+        retries: int,
+    ):
+        self.method: str = method
+        self.endpoint: str = endpoint
+        self.status: int | None = status
+        self.bytes_sent: int = bytes_sent
+        self.bytes_received: int = bytes_received
+        self.latency: float = latency
+        self.retries: int = retries
+
+    def __repr__(self):
+        return (
+            f"RequestRecord({self.method} {self.endpoint}, status={self.status}, "
+            f"latency={self.latency:.3f})"
+        )
+
+
+class RequestMetrics:
+    """
+    Instrumentation hook of `MailerLiteClient` that aggregates its requests.
+
+    Any object with a `record(RequestRecord)` method can be passed as the
+    client's `instrumentation`. This one keeps, per endpoint and method,
+    the number of calls, errors, retries, bytes and a latency histogram,
+    and `emit` prints them as a single CloudWatch Embedded Metric Format
+    line. It is thread-safe; `reset` starts a new invocation.
+
+    Args:
+        namespace (str): CloudWatch namespace of the metrics.
+        dimensions (dict | None): Dimensions of every metric, e.g.
+                                  {"Service": "lambda-email"}.
+    """
+
+    def __init__(self, namespace: str = "LambdaEmail", dimensions: dict | None = None):
+        self.namespace: str = namespace
+        self.dimensions: dict = dimensions or {"Service": "lambda-email"}
+        # "METHOD /endpoint" -> aggregate, see `_new_endpoint`
+        self.endpoints: dict = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _new_endpoint() -> dict:
+        return {
+            "count": 0,
+            "errors": 0,
+            "retries": 0,
+            "bytes_sent": 0,
+            "bytes_received": 0,
+            "latency_ms_sum": 0.0,
+            "latency_ms_max": 0.0,
+            "statuses": {},
+            "histogram": [0] * (len(LATENCY_BUCKETS) + 1),
+        }
+
+    def record(self, record: RequestRecord):
+        latency_ms = record.latency * 1000
+        bucket = next(
+            (i for i, bound in enumerate(LATENCY_BUCKETS) if latency_ms <= bound),
+            len(LATENCY_BUCKETS),
+        )
+        status = str(record.status) if record.status is not None else "error"
+
+        with self._lock:
+            endpoint = self.endpoints.get(f"{record.method} {record.endpoint}")
+
+            if endpoint is None:
+                endpoint = self._new_endpoint()
+                self.endpoints[f"{record.method} {record.endpoint}"] = endpoint
+
+            endpoint["count"] += 1
+            endpoint["errors"] += record.status is None or record.status >= 400
+            endpoint["retries"] += record.retries
+            endpoint["bytes_sent"] += record.bytes_sent
+            endpoint["bytes_received"] += record.bytes_received
+            endpoint["latency_ms_sum"] += latency_ms
+            endpoint["latency_ms_max"] = max(endpoint["latency_ms_max"], latency_ms)
+            endpoint["statuses"][status] = endpoint["statuses"].get(status, 0) + 1
+            endpoint["histogram"][bucket] += 1
+
+    def reset(self):
+        with self._lock:
+            self.endpoints = {}
+
+    def summary(self) -> dict:
+        """
+        Returns the per-endpoint aggregates. Latency percentiles are
+        approximate, see `_percentile`.
+        """
+
+        with self._lock:
+            endpoints = {
+                name: {
+                    **endpoint,
+                    "statuses": dict(endpoint["statuses"]),
+                    "histogram": list(endpoint["histogram"]),
+                }
+                for name, endpoint in self.endpoints.items()
+            }
+
+        for endpoint in endpoints.values():
+            histogram = endpoint.pop("histogram")
+            endpoint["latency_ms_sum"] = round(endpoint["latency_ms_sum"], 1)
+            endpoint["latency_ms_max"] = round(endpoint["latency_ms_max"], 1)
+            slowest = endpoint["latency_ms_max"]
+            endpoint["latency_ms_p50"] = _percentile(histogram, 50, slowest)
+            endpoint["latency_ms_p95"] = _percentile(histogram, 95, slowest)
+            endpoint["latency_ms_histogram"] = {
+                f"le_{bound}": count
+                for bound, count in zip(_BOUNDS, histogram)
+                if count
+            }
+
+        return endpoints
+
+    def emf(self, metrics: dict | None = None, **properties) -> dict:
+        """
+        Builds the Embedded Metric Format document of the invocation.
+
+        Totals and latency percentiles are CloudWatch metrics; the
+        per-endpoint breakdown, histograms included, is a plain property
+        that can be searched with Logs Insights.
+
+        Args:
+            metrics (dict | None): Extra "Count" metrics of the invocation,
+                                   e.g. the rate-limit budget. None values
+                                   are left out.
+            **properties: Extra properties of the log line, e.g. the
+                          request ID.
+        """
+
+        with self._lock:
+            endpoints = [
+                {**endpoint, "histogram": list(endpoint["histogram"])}
+                for endpoint in self.endpoints.values()
+            ]
+
+        histogram = [
+            sum(counts) for counts in zip(*(e["histogram"] for e in endpoints))
+        ]
+        slowest = round(max((e["latency_ms_max"] for e in endpoints), default=0.0), 1)
+        extra = {
+            name: value for name, value in (metrics or {}).items() if value is not None
+        }
+        metrics = {
+            "Requests": sum(e["count"] for e in endpoints),
+            "RequestErrors": sum(e["errors"] for e in endpoints),
+            "RequestRetries": sum(e["retries"] for e in endpoints),
+            "BytesSent": sum(e["bytes_sent"] for e in endpoints),
+            "BytesReceived": sum(e["bytes_received"] for e in endpoints),
+            "RequestTime": round(sum(e["latency_ms_sum"] for e in endpoints), 1),
+            "RequestLatencyP50": _percentile(histogram, 50, slowest),
+            "RequestLatencyP95": _percentile(histogram, 95, slowest),
+            "RequestLatencyMax": slowest,
+            **extra,
+        }
+        units = {
+            **dict.fromkeys(extra, "Count"),
+            "Requests": "Count",
+            "RequestErrors": "Count",
+            "RequestRetries": "Count",
+            "BytesSent": "Bytes",
+            "BytesReceived": "Bytes",
+        }
+
+        return {
+            "_aws": {
+                "Timestamp": int(time.time() * 1000),
+                "CloudWatchMetrics": [
+                    {
+                        "Namespace": self.namespace,
+                        "Dimensions": [list(self.dimensions)],
+                        "Metrics": [
+                            {"Name": name, "Unit": units.get(name, "Milliseconds")}
+                            for name in metrics
+                        ],
+                    }
+                ],
+            },
+            **self.dimensions,
+            **properties,
+            **metrics,
+            "endpoints": self.summary(),
+        }
+
+    def emit(self, metrics: dict | None = None, **properties):
+        """
+        Prints the invocation's metrics as one EMF JSON line, which
+        CloudWatch Logs turns into metrics. Nothing is printed if no request
+        was recorded. Arguments are the same as `emf`.
+        """
+
+        if self.endpoints:
+            print(json.dumps(self.emf(metrics, **properties), separators=(",", ":")))
+
+
+def _percentile(histogram: list[int], pct: float, slowest: float) -> float:
+    """
+    Returns the upper bound of the bucket holding the `pct` percentile,
+    capped at the slowest call.
+    """
+
+    rank = pct / 100 * sum(histogram)
+    seen = 0
+
+    for bound, count in zip(_BOUNDS, histogram):
+        seen += count
+
+        if seen >= rank:
+            return min(bound, slowest)
+
+    return slowest
@@ -1,28 +1,556 @@
+import asyncio
+import atexit
+import functools
 import json
-from mailer_client import MailerLiteClient
-import boto3
-from botocore.exceptions import ClientError
-from datetime import datetime
+import os
+import random
+import time
+from async_mailer_client import AsyncMailerLiteClient
+from batch import BatchEngine
+from deadline import Deadline
+from draft_pool import DraftPool
+from errors import AuthenticationError, MailerLiteError, RateLimitedError
+from group_allocation import GROUP_POLICIES, AlwaysNewGroups
+from instrumentation import RequestMetrics
+from mailer_client import BASE_URL, MailerLiteClient
+from membership import get_membership_index
+from normalize import normalize_users
+from pipeline import Pipeline
+from rate_limiter import RateLimiter
+from retry import RetryBudget, RetryPolicy
+from secret_cache import SecretCache
+from structured_log import log
+from subscriber_cache import SubscriberCache
+from template_registry import DEFAULT_TEMPLATE, get_template, registry
 
+try:
+    # Runtime hooks, only available on runtimes with SnapStart
+    from snapshot_restore_py import register_after_restore, register_before_snapshot
+except ImportError:
+    register_after_restore = register_before_snapshot = None
 
-def get_secret(secret_name):
-    session = boto3.session.Session()
-    client = session.client(
-        service_name="secretsmanager", region_name="us-west-1")
+MAILER_BASE_URL = os.environ.get("MAILER_BASE_URL", BASE_URL)
+POOL_MAXSIZE = int(os.environ.get("MAILER_POOL_MAXSIZE", "10"))
+KEEP_ALIVE = os.environ.get("MAILER_KEEP_ALIVE", "1") != "0"
+# Starting budget of the rate limiter, corrected by MailerLite's headers
+RATE_LIMIT_RPM = int(os.environ.get("MAILER_RATE_LIMIT_RPM", "120"))
+# Attempts per request, and retries allowed per invocation
+RETRY_ATTEMPTS = int(os.environ.get("MAILER_RETRY_ATTEMPTS", "4"))
+RETRY_BUDGET = int(os.environ.get("MAILER_RETRY_BUDGET", "20"))
+# Seconds kept before the Lambda timeout to return a partial-progress response
+DEADLINE_RESERVE = float(os.environ.get("MAILER_DEADLINE_RESERVE", "1.5"))
+# Seconds a group's membership index is reused across warm invocations
+MEMBERSHIP_TTL = float(os.environ.get("MAILER_MEMBERSHIP_TTL", "300"))
+# Users processed at the same time. 1 keeps the sequential path
+CONCURRENCY = int(os.environ.get("MAILER_CONCURRENCY", "10"))
+# "legacy": exists + create + check + subscribe, "upsert": one request per user,
+# "batch": upserts packed into /api/batch requests. Upserts overwrite the name
+# of existing subscribers, legacy leaves existing records untouched
+INGEST_MODE = os.environ.get("MAILER_INGEST_MODE", "legacy")
+# Only write subscribers whose fields changed since they were last pushed
+DELTA_SYNC = os.environ.get("MAILER_DELTA_SYNC", "0") == "1"
+# Batch requests sent in parallel in "batch" mode
+BATCH_WORKERS = int(os.environ.get("MAILER_BATCH_WORKERS", "4"))
+# Lists with at least this many users use the bulk group import instead
+IMPORT_THRESHOLD = int(os.environ.get("MAILER_IMPORT_THRESHOLD", "10000"))
+IMPORT_CHUNK_SIZE = int(os.environ.get("MAILER_IMPORT_CHUNK_SIZE", "1000"))
+# How the group of an invocation is picked: "always-new", "fingerprint" or "pool"
+GROUP_POLICY = os.environ.get("MAILER_GROUP_POLICY", "always-new")
+# Groups created per refill of the "pool" policy
+GROUP_POOL_SIZE = int(os.environ.get("MAILER_GROUP_POOL_SIZE", "10"))
+# Draft campaigns (each with an empty group) kept ready; 0 disables the pool
+DRAFT_POOL_SIZE = int(os.environ.get("MAILER_DRAFT_POOL_SIZE", "0"))
+DRAFT_POOL_PATH = os.environ.get("MAILER_DRAFT_POOL_PATH", "/tmp/mailer_drafts.json")
+DRAFT_MAX_AGE = float(os.environ.get("MAILER_DRAFT_MAX_AGE", "86400"))
+# Most drafts a container holds, expired ones waiting to be deleted included
+DRAFT_MAX_OUTSTANDING = int(
+    os.environ.get("MAILER_DRAFT_MAX_OUTSTANDING", str(2 * DRAFT_POOL_SIZE))
+)
+# Seconds the eager init phase may spend filling the draft pool
+DRAFT_INIT_TIMEOUT = float(os.environ.get("MAILER_DRAFT_INIT_TIMEOUT", "5"))
+# Email -> subscriber ID cache; set the path (e.g. in /tmp) to persist it
+SUBSCRIBER_CACHE_SIZE = int(os.environ.get("MAILER_SUBSCRIBER_CACHE_SIZE", "10000"))
+SUBSCRIBER_CACHE_TTL = float(os.environ.get("MAILER_SUBSCRIBER_CACHE_TTL", "3600"))
+SUBSCRIBER_CACHE_PATH = os.environ.get("MAILER_SUBSCRIBER_CACHE_PATH", "")
+SECRET_NAME = os.environ.get("MAILER_SECRET_NAME", "test/email/Mailer")
+# Seconds the API key is cached, and how long before expiry it is refreshed
+SECRET_TTL = float(os.environ.get("MAILER_SECRET_TTL", "300"))
+SECRET_REFRESH_AHEAD = float(os.environ.get("MAILER_SECRET_REFRESH_AHEAD", "60"))
+# Lowest level logged, and records kept per event and invocation (the rest are
+# only counted)
+LOG_LEVEL = os.environ.get("MAILER_LOG_LEVEL", "INFO")
+LOG_SAMPLE_LIMIT = int(os.environ.get("MAILER_LOG_SAMPLE_LIMIT", "5"))
+# Per-endpoint request metrics, printed once per invocation as an EMF line
+METRICS = os.environ.get("MAILER_METRICS", "1") != "0"
+METRICS_NAMESPACE = os.environ.get("MAILER_METRICS_NAMESPACE", "LambdaEmail")
+# Read the API key, build the client and open its first connection during the
+# init phase. On by default when init is off the request path (provisioned
+# concurrency, SnapStart)
+INIT_TYPE = os.environ.get("AWS_LAMBDA_INITIALIZATION_TYPE", "on-demand")
+EAGER_INIT = (
+    os.environ.get("MAILER_EAGER_INIT", "0" if INIT_TYPE == "on-demand" else "1")
+    == "1"
+)
+
+log.set_level(LOG_LEVEL)
+log.sample_limit = max(1, LOG_SAMPLE_LIMIT)
+
+# Reused across warm invocations so the connection pool survives
+_client: MailerLiteClient | None = None
+_async_client: AsyncMailerLiteClient | None = None
+# The account limit is shared by every client built in this container
+_limiter = RateLimiter(RATE_LIMIT_RPM)
+_api_key = SecretCache(
+    SECRET_NAME,
+    key="MAILER_KEY",
+    ttl=SECRET_TTL,
+    refresh_ahead=SECRET_REFRESH_AHEAD,
+)
+_subscriber_cache = SubscriberCache(
+    max_entries=SUBSCRIBER_CACHE_SIZE,
+    ttl=SUBSCRIBER_CACHE_TTL,
+    path=SUBSCRIBER_CACHE_PATH or None,
+)
+_subscriber_cache.load()
+# Keeps its cached groups or pool across warm invocations
+_group_allocator = GROUP_POLICIES.get(GROUP_POLICY, AlwaysNewGroups)(
+    **({"size": GROUP_POOL_SIZE} if GROUP_POLICY == "pool" else {})
+)
+_metrics = RequestMetrics(METRICS_NAMESPACE) if METRICS else None
+_draft_pool = (
+    DraftPool(
+        # Defined below, resolved when the pool is refilled or cleaned
+        lambda client: create_draft(client),
+        size=DRAFT_POOL_SIZE,
+        path=DRAFT_POOL_PATH,
+        max_age=DRAFT_MAX_AGE,
+        delete_draft=lambda client, draft: delete_draft(client, draft),
+        max_outstanding=DRAFT_MAX_OUTSTANDING,
+    )
+    if DRAFT_POOL_SIZE > 0
+    else None
+)
+
+
+def get_client(api_key: str) -> MailerLiteClient:
+    """
+    Returns the module-level MailerLiteClient, creating it on first use.
+
+    The client (and its pooled connections) is kept between warm Lambda
+    invocations. If the API key changes, the old client is closed and a new
+    one is built.
+
+    Args:
+        api_key (str): The MailerLite API key.
+
+    Returns:
+        MailerLiteClient: The shared client.
+    """
+
+    global _client, _async_client
+
+    if _client is not None and _client.api_key == api_key:
+        return _client
+
+    _close_client()
+
+    _client = MailerLiteClient(
+        api_key,
+        base_url=MAILER_BASE_URL,
+        pool_maxsize=max(POOL_MAXSIZE, CONCURRENCY),
+        keep_alive=KEEP_ALIVE,
+        limiter=_limiter,
+        retry_policy=RetryPolicy(max_attempts=RETRY_ATTEMPTS),
+        subscriber_cache=_subscriber_cache,
+        instrumentation=_metrics,
+    )
+    _async_client = None
+
+    return _client
+
+
+def get_async_client(client: MailerLiteClient) -> AsyncMailerLiteClient:
+    """
+    Returns the module-level AsyncMailerLiteClient wrapping `client`.
+
+    Args:
+        client (MailerLiteClient): The shared sync client.
+
+    Returns:
+        AsyncMailerLiteClient: The shared async client.
+    """
+
+    global _async_client
+
+    if _async_client is None or _async_client.client is not client:
+        if _async_client is not None:
+            _async_client.close()
+
+        _async_client = AsyncMailerLiteClient(client, max_concurrency=CONCURRENCY)
+
+    return _async_client
+
+
+@atexit.register
+def _close_client():
+    if _async_client is not None:
+        _async_client.close()
+
+    if _client is not None:
+        _client.close()
+
+
+def initialize(eager: bool = EAGER_INIT) -> dict:
+    """
+    The init phase, run once at module scope when the container starts.
+
+    The rate limiter and the caches are built with the module. This loads
+    and compiles the default template and, if `eager`, reads the API key,
+    builds the shared client and opens its first pooled connection. A
+    failure is logged and left to the first invocation, which does the
+    same work lazily.
+
+    Args:
+        eager (bool): Also do the steps that call AWS or MailerLite.
+
+    Returns:
+        dict: Milliseconds spent in each step.
+    """
+
+    timings = {}
+    start = time.perf_counter()
+
+    get_template(DEFAULT_TEMPLATE)
+    timings["template_ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+    if not eager:
+        return timings
+
+    start = time.perf_counter()
+
+    try:
+        api_key = _api_key.get()
+    except Exception as error:
+        log.error("init_secret_failed", error=error)
+        return timings
+
+    timings["secret_ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+    if not api_key:
+        return timings
+
+    start = time.perf_counter()
+    client = get_client(api_key)
+    client.warm_up()
+    timings["connect_ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+    # Every copy restored from a SnapStart snapshot would hand out the same
+    # drafts, so the pool is only filled when the container is not cloned
+    if _draft_pool is not None and INIT_TYPE != "snap-start":
+        start = time.perf_counter()
+        deadline = Deadline.after(DRAFT_INIT_TIMEOUT)
+        _draft_pool.refill(
+            client.for_invocation(
+                RetryBudget(max_retries=RETRY_BUDGET, deadline=deadline), deadline
+            )
+        )
+        timings["draft_pool_ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+    return timings
+
+
+def before_snapshot():
+    """
+    Runs before SnapStart snapshots the initialized container.
+
+    Open connections would be dead (or shared by every restored copy) after
+    the restore, so they are closed here.
+    """
+
+    if _client is not None:
+        _client.close()
+
+
+def after_restore():
+    """
+    Runs when a SnapStart snapshot is restored, before the first invocation.
+
+    Re-seeds the retry jitter (every copy of the snapshot would draw the
+    same delays), resets the rate limiter, reads the API key again in case
+    it was rotated since the snapshot, and opens a fresh connection.
+    """
+
+    random.seed()
+    _limiter.reset()
 
     try:
-        get_secret_value_response = client.get_secret_value(
-            SecretId=secret_name)
-    except ClientError as e:
-        raise e
+        api_key = _api_key.refresh()
+    except Exception as error:
+        # The stale key must not be used, the handler reads it again
+        log.error("restore_secret_failed", error=error)
+        _api_key.invalidate()
+        return
+
+    if not api_key:
+        return
+
+    if _client is not None and _client.api_key == api_key:
+        _client.reconnect()
+
+    get_client(api_key).warm_up()
+
+
+if register_before_snapshot is not None:
+    register_before_snapshot(before_snapshot)
+    register_after_restore(after_restore)
+
+
+# Subscribe statuses meaning the subscriber ID no longer exists
+STALE_ID_STATUSES = (404, 422)
+
+
+def add_user_to_group(client: MailerLiteClient, user: dict, group_id: str) -> str:
+    """
+    Creates the user if needed and subscribes it to the group.
+
+    Args:
+        client (MailerLiteClient): The MailerLite client.
+        user (dict): A dict with the user's 'email' and 'name'.
+        group_id (str): The group the user must belong to.
+
+    Returns:
+        str: The subscriber ID of the user.
+    """
+
+    status_code, result = client.add_user(email=user["email"], name=user["name"])
+    client.check_status_code(status_code, result)
+    user_id = result["data"]["id"]
+
+    membership = get_membership_index(client, group_id, ttl=MEMBERSHIP_TTL)
+
+    if user_id not in membership:
+        status_code = client.subscribe_user(user_id, group_id)
+
+        if status_code in STALE_ID_STATUSES:
+            # The cached ID went stale and was dropped, look the user up again
+            status_code, result = client.add_user(
+                email=user["email"], name=user["name"]
+            )
+            client.check_status_code(status_code, result)
+            user_id = result["data"]["id"]
+            status_code = client.subscribe_user(user_id, group_id)
 
-    secret = get_secret_value_response["SecretString"]
-    return secret
+        if 200 <= status_code < 300:
+            membership.add(user_id)
+
+    return user_id
+
+
+def upsert_user_to_group(client: MailerLiteClient, user: dict, group_id: str) -> str:
+    """
+    Creates or updates the user and subscribes it to the group with a single
+    request.
+
+    Args:
+        client (MailerLiteClient): The MailerLite client.
+        user (dict): A dict with the user's 'email' and 'name'.
+        group_id (str): The group the user must belong to.
+
+    Returns:
+        str: The subscriber ID of the user.
+    """
+
+    write = client.sync_subscriber if DELTA_SYNC else client.upsert_subscriber
+    status_code, result = write(
+        email=user["email"], name=user["name"], groups=[group_id]
+    )
+    client.check_status_code(status_code, result)
+
+    return result["data"]["id"]
+
+
+async def add_user_to_group_async(
+    client: AsyncMailerLiteClient, user: dict, group_id: str
+) -> str:
+    """
+    Async version of `add_user_to_group`.
+    """
+
+    status_code, result = await client.add_user(email=user["email"], name=user["name"])
+    client.check_status_code(status_code, result)
+    user_id = result["data"]["id"]
+
+    # Loaded before the users are dispatched, so this lookup does no I/O
+    membership = get_membership_index(client.client, group_id, ttl=MEMBERSHIP_TTL)
+
+    if user_id not in membership:
+        status_code = await client.subscribe_user(user_id, group_id)
+
+        if status_code in STALE_ID_STATUSES:
+            status_code, result = await client.add_user(
+                email=user["email"], name=user["name"]
+            )
+            client.check_status_code(status_code, result)
+            user_id = result["data"]["id"]
+            status_code = await client.subscribe_user(user_id, group_id)
+
+        if 200 <= status_code < 300:
+            membership.add(user_id)
+
+    return user_id
+
+
+async def upsert_user_to_group_async(
+    client: AsyncMailerLiteClient, user: dict, group_id: str
+) -> str:
+    """
+    Async version of `upsert_user_to_group`.
+    """
+
+    write = client.sync_subscriber if DELTA_SYNC else client.upsert_subscriber
+    status_code, result = await write(
+        email=user["email"], name=user["name"], groups=[group_id]
+    )
+    client.check_status_code(status_code, result)
+
+    return result["data"]["id"]
+
+
+# mode: (sync worker, async worker)
+INGEST_WORKERS = {
+    "legacy": (add_user_to_group, add_user_to_group_async),
+    "upsert": (upsert_user_to_group, upsert_user_to_group_async),
+}
+
+
+async def add_users_to_group_async(
+    client: AsyncMailerLiteClient,
+    users: list[dict],
+    group_id: str,
+    worker,
+    progress: dict,
+) -> list[str]:
+    """
+    Runs the async `worker` for every user with at most
+    `client.max_concurrency` users in flight.
+
+    Returns:
+        list[str]: The subscriber IDs, in the same order as `users`.
+    """
+
+    semaphore = asyncio.Semaphore(client.max_concurrency)
+
+    async def bounded(user: dict) -> str:
+        async with semaphore:
+            user_id = await worker(client, user, group_id)
+
+        progress["users_added"] += 1
+
+        return user_id
+
+    return list(await asyncio.gather(*(bounded(user) for user in users)))
+
+
+def batch_users_to_group(
+    client: MailerLiteClient, users: list[dict], group_id: str, progress: dict
+) -> list[str]:
+    """
+    Upserts every user into the group through MailerLite batch requests.
+
+    With `DELTA_SYNC`, users whose fields did not change since they were
+    last pushed are only assigned to the group. Those whose cached ID went
+    stale are upserted in a second round.
+
+    Failed items are reported with their index in `users` and then go
+    through `check_status_code`, like a failed request in the other modes.
+
+    Returns:
+        list[str]: The subscriber IDs, in the same order as `users`.
+    """
+
+    engine = BatchEngine(client, max_workers=BATCH_WORKERS)
+    cache = client.subscriber_cache if DELTA_SYNC else None
+    # Cached IDs of the users that are only assigned to the group
+    known_ids: dict = {}
+
+    for i, user in enumerate(users):
+        entry = None
+
+        if cache is not None:
+            entry = cache.unchanged(user["email"], {"name": user["name"]})
+
+        if entry is not None:
+            known_ids[i] = entry["id"]
+            engine.subscribe_user(i, entry["id"], group_id)
+        else:
+            engine.upsert_subscriber(
+                i, email=user["email"], name=user["name"], groups=[group_id]
+            )
+
+    results = engine.run()
+
+    stale = [
+        result.key
+        for result in results
+        if result.key in known_ids and result.status_code in STALE_ID_STATUSES
+    ]
+
+    for i in stale:
+        cache.invalidate_id(known_ids.pop(i))
+        engine.upsert_subscriber(
+            i, email=users[i]["email"], name=users[i]["name"], groups=[group_id]
+        )
+
+    if stale:
+        retried = {result.key: result for result in engine.run()}
+        results = [retried.get(result.key, result) for result in results]
+
+    skipped = sum(1 for result in results if result.key in known_ids and result.ok)
+
+    client.count_skipped_writes(skipped)
+
+    failures = BatchEngine.failures(results)
+    progress["users_added"] += len(results) - len(failures)
+
+    log.info(
+        "batch_ingest",
+        requests=engine.requests_sent,
+        users=len(results),
+        failed=len(failures),
+    )
+
+    for failure in failures:
+        log.warning("user_failed", index=failure.key, error=failure.error)
+
+    for failure in failures:
+        client.check_status_code(failure.status_code, failure.body)
+
+    for result in results:
+        if result.key not in known_ids:
+            pushed_fields = {"name": users[result.key]["name"]}
+            client.cache_subscriber(result.status_code, result.body, pushed_fields)
+
+    return [
+        known_ids.get(result.key) or result.body["data"]["id"] for result in results
+    ]
 
 
 def lambda_handler(event, context):
-    api_key = get_secret("test/email/Mailer")
-    api_key = json.loads(api_key)["MAILER_KEY"]
+    """
+    Lambda entry point: runs `handle_event` and writes its buffered logs,
+    tagged with the request ID, once it is done.
+    """
+
+    log.start_invocation(getattr(context, "aws_request_id", None))
+
+    try:
+        return handle_event(event, context)
+    finally:
+        log.flush()
+
+
+def handle_event(event, context):
+    api_key = _api_key.get()
 
     try:
         body = json.loads(event.get("body", "{}"))
@@ -47,7 +575,11 @@ def lambda_handler(event, context):
         }
 
     for i, user in enumerate(users):
-        if not isinstance(user, dict) or "email" not in user or "name" not in user:
+        if (
+            not isinstance(user, dict)
+            or not isinstance(user.get("email"), str)
+            or "name" not in user
+        ):
             return {
                 "statusCode": 400,
                 "body": json.dumps(
@@ -57,48 +589,460 @@ def lambda_handler(event, context):
                 ),
             }
 
+    template_id = body.get("template", DEFAULT_TEMPLATE)
+
+    if not isinstance(template_id, str) or not registry.exists(template_id):
+        return {
+            "statusCode": 400,
+            "body": json.dumps({"error": f"Unknown template: {template_id}"}),
+        }
+
     if api_key is None:
-        print("MAILER_KEY is not set in enviroment variables")
-        # NOTE: return a status code if server has an error? 3xx
-        exit(1)
+        log.error("api_key_missing", secret_name=SECRET_NAME)
+        return {
+            "statusCode": 500,
+            "body": json.dumps({"error": "Mailer service is not configured"}),
+        }
+
+    # Duplicates are processed once, `user_index` maps them back
+    users_total = len(users)
+    users, user_index = normalize_users(users)
 
-    client = MailerLiteClient(api_key)
+    deadline = Deadline.from_context(context, reserve=DEADLINE_RESERVE)
+    # The deadline already keeps DEADLINE_RESERVE free, retries may use the rest
+    retry_budget = RetryBudget(max_retries=RETRY_BUDGET, deadline=deadline, reserve=0.0)
+    progress = {
+        "users_total": users_total,
+        "users_unique": len(users),
+        "users_added": 0,
+        "writes_skipped": 0,
+        "group_id": None,
+        "group_policy": None,
+        "campaign_id": None,
+        "sent": False,
+    }
 
-    # unique name
-    timestamp = datetime.now().strftime("%Y%m%d%H%M%S%f")[:-3]
-    group_name = f"code group {timestamp}"
+    if _metrics is not None:
+        _metrics.reset()
 
-    # Check group exists
-    group_available = client.group_exists(group_name)
+    try:
+        return process_invocation(
+            api_key, users, user_index, retry_budget, deadline, progress, template_id
+        )
+    finally:
+        _subscriber_cache.save()
+        log.info("subscriber_cache", **_subscriber_cache.stats())
 
-    group_id: str
+        # Also after a 429 or a timeout, when the budget matters most
+        rate_limit = _limiter.snapshot()
+        log.info("rate_limit_budget", **rate_limit)
 
-    if not group_available:
-        # Create group
-        status_code, result = client.create_group(group_name)
-        client.check_status_code(status_code)
-        group_id = result["data"]["id"]
-    else:
-        group_id = group_available["id"]
+        if _metrics is not None:
+            _metrics.emit(
+                {
+                    "RateLimitTokens": rate_limit["tokens"],
+                    "RateLimitServerRemaining": rate_limit["server_remaining"],
+                },
+                request_id=getattr(context, "aws_request_id", None),
+                users=progress["users_unique"],
+                sent=progress["sent"],
+                group_policy=progress["group_policy"],
+            )
+
+
+def process_invocation(
+    api_key: str,
+    users: list[dict],
+    user_index: list[int],
+    retry_budget: RetryBudget,
+    deadline: Deadline,
+    progress: dict,
+    template_id: str = DEFAULT_TEMPLATE,
+) -> dict:
+    """
+    Runs `send_mails`, retrying once with a refreshed key if the current
+    one was rejected, and maps MailerLite errors to a response.
+    """
+
+    try:
+        try:
+            client = get_client(api_key)
+            client.start_invocation(retry_budget, deadline)
+
+            return send_mails(client, users, progress, user_index, template_id)
+        except AuthenticationError:
+            # The key may have been rotated: reload it and retry once
+            new_api_key = _api_key.refresh()
+
+            if not new_api_key or new_api_key == api_key:
+                raise
+
+            client = get_client(new_api_key)
+            client.start_invocation(retry_budget, deadline)
+
+            return send_mails(client, users, progress, user_index, template_id)
+    except MailerLiteError as error:
+        log.error("invocation_failed", error=error, progress=progress)
+        return error_response(error, progress)
+
+
+def error_response(error: MailerLiteError, progress: dict | None = None) -> dict:
+    """
+    Maps a MailerLite error to the HTTP response of the handler.
+
+    Args:
+        error (MailerLiteError): The error raised by the client.
+        progress (dict | None): What was done before the error, e.g. when
+                                the invocation ran out of time.
+
+    Returns:
+        dict: The Lambda proxy response.
+    """
+
+    response = {
+        "statusCode": error.http_status,
+        "body": json.dumps(
+            {
+                "error": error.message,
+                "type": type(error).__name__,
+                "upstream_status": error.status_code,
+                "progress": progress,
+            }
+        ),
+    }
+
+    if isinstance(error, RateLimitedError) and error.retry_after is not None:
+        response["headers"] = {"Retry-After": str(int(error.retry_after))}
+
+    return response
+
+
+def prepare_group(client: MailerLiteClient, users: list[dict], progress: dict) -> str:
+    """
+    Picks the group of this invocation with the `GROUP_POLICY` allocator.
+
+    Returns:
+        str: The group ID.
+    """
+
+    allocation = _group_allocator.allocate(client, users)
+    group_id = allocation.group_id
+
+    if allocation.empty:
+        # A new group has no members, no need to download it
+        get_membership_index(client, group_id, ttl=MEMBERSHIP_TTL).mark_empty()
+
+    progress["group_id"] = group_id
+    progress["group_policy"] = _group_allocator.name
+    log.info(
+        "group_allocated",
+        group_id=group_id,
+        policy=_group_allocator.name,
+        empty=allocation.empty,
+    )
+
+    return group_id
+
+
+def ingest_users(
+    client: MailerLiteClient, users: list[dict], group_id: str, progress: dict
+) -> list[str]:
+    """
+    Creates the users and adds them to the group, with the path picked by
+    the list size and `INGEST_MODE`.
 
-    print(f"{group_id=}")
+    Returns:
+        list[str]: The subscriber IDs, in the same order as `users`. Empty
+                   if the users were imported in bulk.
+    """
 
     # Create users and add to group
-    users_id: list[str] = []
-    for user in users:
-        status_code, result = client.add_user(
-            email=user["email"], name=user["name"])
-        client.check_status_code(status_code)
-        user_id = result["data"]["id"]
+    worker, async_worker = INGEST_WORKERS.get(INGEST_MODE, INGEST_WORKERS["legacy"])
 
-        # HACK:
-        user_is_subscribed = client.user_suscribed_to_group(user_id, group_id)
-        if not user_is_subscribed:
-            client.subscribe_user(user_id, group_id)
+    users_id: list[str]
+    if len(users) >= IMPORT_THRESHOLD:
+        # The import endpoint does not return subscriber IDs
+        import_progress = client.import_subscribers_to_group(
+            group_id,
+            users,
+            chunk_size=IMPORT_CHUNK_SIZE,
+            on_progress=lambda current: progress.update(
+                users_added=current["processed"]
+            ),
+        )
+        log.info("import_finished", **import_progress)
+        users_id = []
+    elif INGEST_MODE == "batch":
+        users_id = batch_users_to_group(client, users, group_id, progress)
+    elif CONCURRENCY > 1 and len(users) > 1:
+        if INGEST_MODE == "legacy":
+            get_membership_index(client, group_id, ttl=MEMBERSHIP_TTL).ensure_loaded()
 
-        users_id.append(user_id)
+        users_id = asyncio.run(
+            add_users_to_group_async(
+                get_async_client(client), users, group_id, async_worker, progress
+            )
+        )
+    else:
+        users_id = []
+
+        for user in users:
+            users_id.append(worker(client, user, group_id))
+            progress["users_added"] += 1
+
+    progress["writes_skipped"] = client.writes_skipped
+    log.info(
+        "users_ingested",
+        mode=INGEST_MODE,
+        users=len(users),
+        writes_skipped=client.writes_skipped,
+    )
+
+    return users_id
+
+
+def claim_draft(client: MailerLiteClient, draft: dict, progress: dict) -> str:
+    """
+    Uses the empty group and draft campaign claimed from the draft pool.
+
+    Returns:
+        str: The group ID.
+    """
+
+    group_id = draft["group_id"]
+    get_membership_index(client, group_id, ttl=MEMBERSHIP_TTL).mark_empty()
+
+    progress["group_id"] = group_id
+    progress["group_policy"] = "draft-pool"
+    progress["campaign_id"] = draft["campaign_id"]
+    log.info("draft_claimed", **draft)
+
+    return group_id
+
+
+def create_draft(client: MailerLiteClient, template_id: str = DEFAULT_TEMPLATE) -> dict:
+    """
+    Creates an empty group and a draft campaign for the draft pool.
+
+    Returns:
+        dict: The 'group_id', 'campaign_id' and 'template_hash' of the draft.
+    """
+
+    group_id = AlwaysNewGroups().allocate(client, []).group_id
+
+    try:
+        campaign_id = create_group_campaign(client, group_id, template_id=template_id)
+    except MailerLiteError:
+        # Do not leave the empty group behind
+        client.delete_group(group_id)
+        raise
+
+    return {
+        "group_id": group_id,
+        "campaign_id": campaign_id,
+        "template_hash": get_template(template_id).content_hash,
+    }
+
+
+def delete_draft(client: MailerLiteClient, draft: dict):
+    """
+    Deletes the campaign and the group of an expired draft. Either one may
+    already be gone.
+    """
+
+    for status_code in (
+        client.delete_campaign(draft["campaign_id"]),
+        client.delete_group(draft["group_id"]),
+    ):
+        if status_code != 404:
+            client.check_status_code(status_code)
+
+
+def create_group_campaign(
+    client: MailerLiteClient,
+    group_id: str,
+    progress: dict | None = None,
+    template_id: str = DEFAULT_TEMPLATE,
+) -> str:
+    """
+    Creates the campaign addressed to the group.
+
+    Args:
+        template_id (str): The template with the email content.
 
-    print(f"{users_id=}")
+    Returns:
+        str: The campaign ID.
+    """
+
+    # Create campaign
+    template = get_template(template_id)
+
+    status_code, result = client.create_campaign(
+        name="lambda campaña",
+        groups=[group_id],
+        subject="prueba campaña",
+        from_email="contacto@valledelosangeles.com",
+        from_name="Valle de los Ángeles",
+        content=template.content,
+    )
+
+    client.check_status_code(status_code, result)
+
+    campaign_id = result["data"]["id"]
+
+    if progress is not None:
+        progress["campaign_id"] = campaign_id
+
+    log.info("campaign_created", campaign_id=campaign_id, status_code=status_code)
+
+    return campaign_id
+
+
+def discard_campaign(client: MailerLiteClient, campaign_id: str, progress: dict):
+    """
+    Deletes the campaign of a failed invocation, so it is not left behind as
+    a draft. A campaign that is no longer a draft (e.g. the send request
+    timed out but went through) is kept.
+
+    The invocation usually failed because its deadline passed, so the
+    cleanup runs on a copy of the client that may use half of
+    `DEADLINE_RESERVE`, without retries; the other half is left to build
+    the response.
+    """
+
+    expires_at = client.deadline.expires_at
+    deadline = Deadline(
+        None if expires_at is None else expires_at + DEADLINE_RESERVE / 2
+    )
+    client = client.for_invocation(RetryBudget(max_retries=0, deadline=deadline))
+
+    campaign = client.get_campaign(campaign_id).get("data", {})
+
+    if campaign.get("status") != "draft":
+        return
+
+    status_code = client.delete_campaign(campaign_id)
+    client.check_status_code(status_code)
+    progress["campaign_id"] = None
+    log.info("campaign_discarded", campaign_id=campaign_id)
+
+
+def send_group_campaign(client: MailerLiteClient, campaign_id: str, progress: dict):
+    """
+    Sends the campaign once its group is complete.
+    """
+
+    # Send campaign
+    status_code, result = client.send_campaign(campaign_id)
+
+    log.info("campaign_sent", campaign_id=campaign_id, status_code=status_code)
+    client.check_status_code(status_code, result)
+    progress["sent"] = True
+
+
+def send_mails(
+    client: MailerLiteClient,
+    users: list[dict],
+    progress: dict,
+    user_index: list[int] | None = None,
+    template_id: str = DEFAULT_TEMPLATE,
+) -> dict:
+    """
+    Creates a group with the users and sends the campaign to it.
+
+    Args:
+        client (MailerLiteClient): The MailerLite client.
+        users (list[dict]): The validated, deduplicated users.
+        progress (dict): Updated as each step completes, so an error
+                         response can report how far the invocation got.
+        user_index (list[int] | None): For every user of the request, its
+                                       position in `users`. Used to report
+                                       the subscriber IDs per request index.
+        template_id (str): The template with the email content.
+
+    Returns:
+        dict: The Lambda proxy response.
+
+    Raises:
+        MailerLiteError: If a MailerLite request fails.
+    """
+
+    template_hash = get_template(template_id).content_hash
+    draft = None
+    refill = None
+
+    if _draft_pool is not None:
+        # A draft is only reused if it already has this email content
+        draft = _draft_pool.claim(template_hash)
+        claimed = 1 if draft is not None else 0
+
+        # Replaces the claimed draft (and deletes expired ones) while this
+        # invocation runs, with its own retry budget so it cannot use up the
+        # invocation's. An empty pool is filled by `initialize`, not here
+        if claimed or _draft_pool.expired:
+            refill = _draft_pool.refill_async(
+                client.for_invocation(
+                    RetryBudget(
+                        max_retries=RETRY_BUDGET, deadline=client.deadline, reserve=0.0
+                    ),
+                    client.deadline,
+                ),
+                max_new=claimed,
+            )
+
+    pipeline = Pipeline()
+    # Campaign creation runs before ingestion is done: if anything fails,
+    # the draft campaign is deleted instead of being left in the account
+    discard = functools.partial(discard_campaign, client, progress=progress)
+
+    if draft is not None:
+        # Group and campaign already exist, only the users are missing
+        pipeline.add("group_id", lambda: claim_draft(client, draft, progress))
+        pipeline.add(
+            "campaign_id",
+            lambda group_id: draft["campaign_id"],
+            after=["group_id"],
+            undo=discard,
+        )
+    else:
+        pipeline.add("group_id", lambda: prepare_group(client, users, progress))
+        # Campaign creation only needs the group, so it runs during ingestion
+        pipeline.add(
+            "campaign_id",
+            lambda group_id: create_group_campaign(
+                client, group_id, progress, template_id
+            ),
+            after=["group_id"],
+            undo=discard,
+        )
+
+    pipeline.add(
+        "users_id",
+        lambda group_id: ingest_users(client, users, group_id, progress),
+        after=["group_id"],
+    )
+    pipeline.add(
+        "sent",
+        lambda users_id, campaign_id: send_group_campaign(
+            client, campaign_id, progress
+        ),
+        after=["users_id", "campaign_id"],
+    )
+    try:
+        results = pipeline.run()
+    finally:
+        if refill is not None:
+            # Lambda freezes threads between invocations: never leave one
+            # in the middle of a request
+            remaining = client.deadline.remaining()
+            refill.join(None if remaining == float("inf") else max(0.0, remaining))
+
+    users_id = results["users_id"]
+
+    log.info("step_timings", **pipeline.timings)
+
+    if _draft_pool is not None:
+        log.info("draft_pool", **_draft_pool.stats())
 
     # # Create users and add to group
     # users_id: list[str] = []
@@ -131,30 +1075,6 @@ def lambda_handler(event, context):
     #
     # client.send_campaign(campaign_id)
 
-    # Create campaign
-    content = '<!doctype html>\n<html lang dir="ltr" xmlns:v="urn:schemas-microsoft-com:vml" xmlns:o="urn:schemas-microsoft-com:office:office"><head><!--{$head_top}-->\n    <meta charset="utf-8">\n    \n    <meta http-equiv="X-UA-Compatible" content="IE=edge">\n    <meta name="viewport" content="width=device-width, initial-scale=1, user-scalable=yes">\n    <meta name="format-detection" content="telephone=no, date=no, address=no, email=no, url=no">\n    <meta name="x-apple-disable-message-reformatting">\n    <!--[if !mso]>\n    <meta http-equiv="X-UA-Compatible" content="IE=edge">\n    <![endif]-->\n    <!--[if mso]>\n    <style>\n        * { font-family: sans-serif !important; }\n    </style>\n    <noscript>\n        <xml>\n            <o:OfficeDocumentSettings>\n                <o:PixelsPerInch>96</o:PixelsPerInch>\n            </o:OfficeDocumentSettings>\n        </xml>\n    </noscript>\n    <![endif]-->\n    <style type="text/css">\n        /* Outlines the grids, remove when sending */\n        /*table td { border: 1px solid cyan; }*/\n        /* RESET STYLES */\n        html, body { margin: 0 !important; padding: 0 !important; width: 100% !important; height: 100% !important; }\n        body { -webkit-font-smoothing: antialiased; -moz-osx-font-smoothing: grayscale; text-rendering: optimizeLegibility;}\n        .document { margin: 0 !important; padding: 0 !important; width: 100% !important; }\n        img { border: 0; outline: none; text-decoration: none;  -ms-interpolation-mode: bicubic; }\n        table { border-collapse: collapse; }\n        table, td { mso-table-lspace: 0pt; mso-table-rspace: 0pt; }\n        body, table, td, a { -webkit-text-size-adjust: 100%; -ms-text-size-adjust: 100%; }\n        h1, h2, h3, h4, h5, p { margin:0; word-break: break-word;}\n        /* iOS BLUE LINKS */\n        a[x-apple-data-detectors] {\n            color: inherit !important;\n            text-decoration: none !important;\n            font-size: inherit !important;\n            font-family: inherit !important;\n            font-weight: inherit !important;\n            line-height: inherit !important;\n        }\n        /* ANDROID CENTER FIX */\n        div[style*="margin: 16px 0;"] { margin: 0 !important; }\n        /* MEDIA QUERIES */\n        @media all and (max-width:639px){\n            .wrapper{ width:100%!important; }\n            .container{ width:100%!important; min-width:100%!important; padding: 0 !important; }\n            .row{padding-left: 20px!important; padding-right: 20px!important;}\n            .col-mobile {width: 20px!important;}\n            .table-between-col-mobile {width:100%!important;}\n            .col{display: block!important; width: 100%!important;}\n            .col-feature{display: block!important; width: 100%!important;}\n            .mobile-center{text-align: center!important; float: none!important;}\n            .mobile-mx-auto {margin: 0 auto!important; float: none!important;}\n            .mobile-left{text-align: center!important; float: left!important;}\n            .mobile-hide{display: none!important;}\n            .img{ width:100% !important; height:auto !important; }\n            .ml-btn { width: 100% !important; max-width: 100%!important;}\n            .ml-btn-container { width: 100% !important; max-width: 100%!important;}\n            *[class="mobileOff"] { width: 0px !important; display: none !important; }\n            *[class*="mobileOn"] { display: block !important; max-height:none !important; }\n            .mlContentTable{ width: 100%!important; min-width: 10%!important; margin: 0!important; float: none!important; }\n            .mlContentButton a { display: block!important; width: auto!important; }\n            .mlContentOuter { padding-bottom: 0px!important; padding-left: 15px!important; padding-right: 15px!important; padding-top: 0px!important; }\n            .mlContentSurvey { float: none!important; margin-bottom: 10px!important; width:100%!important; }\n            .multiple-choice-item-table { width: 100% !important; min-width: 10% !important; float: none !important; }\n            .ml-default, .ml-card, .ml-fullwidth { width: 100%; min-width: 100%; }\n        }\n\n        @media screen and (max-width: 600px) {\n            .col-feature {\n                margin-bottom: 30px;\n            }\n        }\n\n        /* Carousel style */\n        @media screen and (-webkit-min-device-pixel-ratio: 0) {\n            .webkit {\n                display: block !important;\n            }\n        }  @media screen and (-webkit-min-device-pixel-ratio: 0) {\n            .non-webkit {\n                display: none !important;\n            }\n        }  @media screen and (-webkit-min-device-pixel-ratio: 0) {\n            /* TARGET OUTLOOK.COM */\n            [class="x_non-webkit"] {\n                display: block !important;\n            }\n        }  @media screen and (-webkit-min-device-pixel-ratio: 0) {\n            [class="x_webkit"] {\n                display: none !important;\n            }\n        }\n    </style>\n    \n    <style type="text/css">@import url("https://assets.mlcdn.com/fonts-v2.css?version=1745332");</style>\n<style type="text/css">\n            @media screen {\n                body {\n                    font-family: \'Inter\', sans-serif;\n                }\n            }\n        </style><meta name="robots" content="noindex, nofollow">\n<title>prueba campaña</title>\n<!--{$head_bottom}--></head>\n<body style="margin: 0 !important; padding: 0 !important; background-color:#F4F7FA;"><!--{$body_top}-->\n\n    \n        \n        \n    \n\n    \n\n        \n            \n\n            \n            \n            \n            \n            \n            \n        \n\n        \n            \n\n            \n        \n\n        \n            \n\n            \n        \n\n    \n\n    \n\n        \n\n        \n\n        \n            \n            \n            \n            \n            \n        \n\n        \n            \n            \n            \n            \n            \n        \n\n        \n            \n            \n            \n            \n            \n        \n\n        \n            \n            \n            \n            \n            \n        \n\n        \n            \n            \n            \n            \n            \n        \n\n        \n            \n            \n            \n            \n            \n        \n\n        \n            \n            \n            \n            \n        \n\n        \n            \n            \n        \n\n        \n            \n            \n            \n        \n\n        \n            \n            \n            \n            \n            \n            \n            \n            \n            \n            \n        \n\n        \n            \n            \n            \n            \n            \n            \n            \n            \n            \n            \n        \n\n        \n\n            \n                \n                \n                \n                \n                \n            \n\n            \n                \n                \n                \n            \n\n            \n                \n                \n                \n                \n                \n            \n\n            \n                \n                \n                \n                \n                \n            \n\n            \n                \n                \n                \n                \n                \n            \n\n            \n                \n                \n                \n                \n            \n\n            \n                \n                \n            \n\n            \n                \n                \n            \n\n        \n    \n\n    <div class="document" role="article" aria-roledescription="email" aria-label lang dir="ltr" style="background-color:#F4F7FA; line-height: 100%; font-size:medium; font-size:max(16px, 1rem);">\n\n        <!--[if gte mso 9]>\n        <v:background xmlns:v="urn:schemas-microsoft-com:vml" fill="t" if="variable.bodyBackgroundImage.value">\n            <v:fill type="tile" src="" color="#F4F7FA"/>\n        </v:background>\n        <![endif]-->\n\n        \n\n        <table width="100%" align="center" cellspacing="0" cellpadding="0" border="0">\n            <tr>\n                <td class background bgcolor="#F4F7FA" align="center" valign="top" style="padding: 0 8px;">\n\n                    <table class="container" align="center" width="640" cellpadding="0" cellspacing="0" border="0" style="max-width: 640px;">\n    <tr>\n        <td align="center">\n            \n\n                \n\n                <table align="center" width="100%" cellpadding="0" cellspacing="0" border="0">\n                    <tr>\n                        <td colspan="2" height="20" style="line-height: 20px"></td>\n                    </tr>\n                    <tr>\n                        \n                        <td align="left" style="font-family: \'Inter\', sans-serif; color: #111111; font-size: 12px; line-height: 18px;">\n                            \n                            \n                        </td>\n                        \n                        <td align="right" style="font-family: \'Inter\', sans-serif; color: #111111; font-size: 12px; line-height: 18px;">\n                            <a style="color: #111111; font-weight: normal; font-style: normal; text-decoration: underline;" href="{$url}" data-link-id="152432757093434783" data-link-type="webview">View in browser</a>&nbsp;\n                        </td>\n                    </tr>\n                    <tr>\n                        <td colspan="2" height="20" style="line-height: 20px;"></td>\n                    </tr>\n                </table>\n\n                \n\n                \n                    \n                    \n                    \n                \n\n                \n                    \n                    \n                \n\n            \n        </td>\n    </tr>\n</table>\n\n\n                    <table width="640" class="wrapper" align="center" border="0" cellpadding="0" cellspacing="0" style="\n                        max-width: 640px;\n                        border:1px solid #E5E5E5;\n                        border-radius:8px; border-collapse: separate!important; overflow: hidden;\n                        ">\n                        <tr>\n                            <td align="center">\n\n                                \n    <!-- {% if true %} -->\n<table class="ml-default" width="100%" bgcolor border="0" cellspacing="0" cellpadding="0">\n    <tr>\n        <td style>\n            \n                \n                \n\n                \n                \n\n                <table class="container ml-4 ml-default-border" width="640" bgcolor="#ffffff" align="center" border="0" cellspacing="0" cellpadding="0" style="\n                width: 640px; min-width: 640px;\n                ;\n                \n                ">\n                    <tr>\n                        <td class="ml-default-border container" height="40" style="line-height: 40px; min-width: 640px;"></td>\n                    </tr>\n                    <tr>\n                        <td>\n\n    \n    \n    \n    \n\n\n<table align="center" width="100%" border="0" cellspacing="0" cellpadding="0">\n    <tr>\n        <td class="row mobile-center" align="center" style="padding: 0 50px;">\n            \n\n    \n\n\n\n\n\n\n<img src="https://storage.mlcdn.com/account_image/1043022/VmjzhOMrYV5tCc5ld0UYBqeBLWRCTaDhNdYB8CjL.png" border="0" alt width="120" class="logo" style="max-width: 120px; display: inline-block;">\n\n\n\n\n\n\n\n\n        </td>\n    </tr>\n    <tr>\n        <td height="25" style="line-height: 25px;"></td>\n    </tr>\n    \n    <tr>\n        <td class="row mobile-center" style="padding: 0 50px;" align="center">\n            \n\n    \n\n\n<table class="menu mobile-mx-auto" width cellpadding="0" cellspacing="0" border="0">\n    <tr>\n        <td align="center" class="menu-item" style="padding: 0 20px 0 0;">\n            <a href="https://" target="blank" style="font-family: \'Inter\', sans-serif; font-size: 14px; line-height: 150%; color: #2C438D; font-weight: normal; font-style: normal; text-decoration: none;" data-link-id="152432757100774816">\n                <span style="color: #2C438D;">About</span>\n            </a>\n        </td><td align="center" class="menu-item" style="padding: 0 20px 0 20px;">\n            <a href="https://" target="blank" style="font-family: \'Inter\', sans-serif; font-size: 14px; line-height: 150%; color: #2C438D; font-weight: normal; font-style: normal; text-decoration: none;" data-link-id="152432757106017698">\n                <span style="color: #2C438D;">New!</span>\n            </a>\n        </td><td align="center" class="menu-item" style="padding: 0 0 0 20px;">\n            <a href="https://" target="blank" style="font-family: \'Inter\', sans-serif; font-size: 14px; line-height: 150%; color: #2C438D; font-weight: normal; font-style: normal; text-decoration: none;" data-link-id="152432757109163427">\n                <span style="color: #2C438D;">Shop</span>\n            </a>\n        </td>\n    </tr>\n</table>\n\n\n\n\n        </td>\n    </tr>\n    \n</table>\n\n\n    \n    \n    \n    \n    \n\n\n\n    \n    \n\n\n\n\n                            </td>\n                    </tr>\n                    <tr>\n                        <td height="40" style="line-height: 40px;"></td>\n                    </tr>\n                </table>\n                \n                    \n                    \n                \n            \n        </td>\n    </tr>\n</table>\n<!-- {% endif %} -->\n\n\n    <!-- {% if true %} -->\n<table class="ml-default" width="100%" bgcolor border="0" cellspacing="0" cellpadding="0">\n    <tr>\n        <td style>\n            \n                \n                \n                \n                \n                \n                \n                \n                \n\n                <table class="ml-default-border" width="100%" align="center" bgcolor="#ffffff" border="0" cellspacing="0" cellpadding="0" style="\n                ;\n                \n                ">\n                    <tr>\n                        <td class="ml-default-border" background style="background-size: cover; background-position: center center;" valign="top" align="center">\n\n                            \n                            <table class="container ml-9" width="640" align="center" border="0" cellpadding="0" cellspacing="0" style="color: #242424; width: 640px; min-width: 640px;">\n                                <tr>\n                                    <td class="container" height="20" style="line-height: 20px; min-width: 640px;"></td>\n                                </tr>\n                                <tr>\n                                    <td>\n\n    \n    \n\n\n\n\n\n\n    <table class="container" width="640" border="0" cellspacing="0" cellpadding="0">\n        <tr>\n            <td class="row" align="center" style="padding: 0 50px" colspan="3">\n                \n\n    \n    <img src="https://storage.mlcdn.com/account_image/1043022/tlW3EOUmz0rNUT4J9PILS6KXxubqO4LNUAxWKS79.png" border="0" alt class="img" width="540" style="display: block;">\n\n\n\n            </td>\n        </tr>\n        <tr>\n            <td class="col-mobile" width="50" height="0" style="line-height: 0;"></td>\n            <td>\n                <table class="table-between-col-mobile" width="540" border="0" cellspacing="0" cellpadding="0">\n                    <tr>\n                        <td height="30" style="line-height:30px;"></td>\n                    </tr>\n                    <tr>\n                        <td>\n                            <h1 style="font-family: \'Inter\', sans-serif; color: #2C438D; font-size: 36px; line-height: 125%; font-weight: bold; font-style: normal; text-decoration: none; ;margin-bottom: 10px; text-align: center;">Cotización</h1>\n<p style="font-family: \'Inter\', sans-serif; color: #242424; font-size: 16px; line-height: 165%; margin-top: 0; margin-bottom: 0; text-align: center;">{$name} ha recibido una nueva cotización</p>\n                        </td>\n                    </tr>\n                    <tr>\n                        <td height="30" style="line-height:30px;"></td>\n                    </tr>\n                    <tr>\n                        <td align="center">\n                            \n\n    \n    \n    \n    \n\n    \n\n\n\n\n\n\n                        </td>\n                    </tr>\n                    \n                    \n                </table>\n            </td>\n            <td class="col-mobile" width="50" height="0" style="line-height: 0;"></td>\n        </tr>\n    </table>\n\n\n\n\n    \n    \n    \n    \n    \n\n\n\n    \n    \n    \n    \n    \n\n\n\n    \n    \n    \n    \n    \n\n\n\n    \n    \n    \n    \n    \n\n\n\n    \n    \n    \n    \n\n\n\n    \n    \n\n\n\n\n\n\n    \n    \n    \n    \n    \n    \n    \n    \n    \n    \n    \n\n\n\n\n\n\n\n\n    \n    \n    \n    \n    \n    \n    \n    \n    \n    \n\n\n\n\n\n\n\n                                        </td>\n                                </tr>\n                                <tr>\n                                    <td height="40" style="line-height: 40px;"></td>\n                                </tr>\n                            </table>\n\n                            \n                            \n                                \n                            \n\n                        </td>\n                    </tr>\n                </table>\n\n            \n        </td>\n    </tr>\n</table>\n<!-- {% endif %} -->\n\n\n    <!-- {% if true %} -->\n<table class="ml-default" width="100%" bgcolor border="0" cellspacing="0" cellpadding="0">\n    <tr>\n        <td style>\n            \n\n                \n                \n\n                \n                \n\n                <table class="container ml-11 ml-default-border" width="640" bgcolor="#ffffff" align="center" border="0" cellspacing="0" cellpadding="0" style="\n                width: 640px; min-width: 640px;\n                ;\n                \n                ">\n                    <tr>\n                        <td class="ml-default-border container" height="40" style="line-height: 40px; min-width: 640px;"></td>\n                    </tr>\n                    <tr>\n                        <td class="row" style="padding: 0 50px;">\n\n\n    \n    \n\n<table align="center" width="100%" cellpadding="0" cellspacing="0" border="0">\n    <tr>\n        <td class="col" align="left" width="250" valign="top" style="text-align: left!important;">\n            \n                <h5 style="font-family: \'Inter\', sans-serif; color: #2C438D; font-size: 15px; line-height: 125%; font-weight: bold; font-style: normal; text-decoration: none; margin-bottom: 6px;">Valle de los Ángeles</h5>\n            \n            <p style="font-family: \'Inter\', sans-serif; color: #242424; font-size: 14px; line-height: 150%; margin-bottom: 6px;"><strong>Valle de los Ángeles</strong></p>\n<p style="font-family: \'Inter\', sans-serif; color: #242424; font-size: 14px; line-height: 150%; margin-bottom: 6px;">T. 222 237 4455</p>\n<p style="font-family: \'Inter\', sans-serif; color: #242424; font-size: 14px; line-height: 150%; margin-bottom: 6px;">Av. Manuel Espinosa Yglesias 1212, Puebla<br>Col. Ladrillera de Benítez,&nbsp;Puebla, Puebla,&nbsp;México</p>\n\n            <table width="100%" cellpadding="0" cellspacing="0" border="0">\n                <tr>\n                    <td height="16" style="line-height: 16px;"></td>\n                </tr>\n                <tr>\n                    <td>\n                        \n\n\n\n\n<table class="**$class**" role="presentation" cellpadding="0" cellspacing="0" border="0">\n    <tr>\n        <td align="center" valign="middle" width="18" ng-show="slink.link != \'\'" style="padding: 0 5px 0 0;">\n            <a href="https://www.facebook.com/grupovalledelosangeles" target="blank" style="text-decoration: none;" data-link-id="152432757113357733">\n                <img src="https://assets.mlcdn.com/ml/images/icons/default/rounded_corners/black/facebook.png" width="18" alt="facebook">\n            </a>\n        </td><td align="center" valign="middle" width="18" ng-show="slink.link != \'\'" style="padding: 0 0 0 5px;">\n            <a href="https://www.instagram.com/funerariavalledelosangeles/" target="blank" style="text-decoration: none;" data-link-id="152432757117552038">\n                <img src="https://assets.mlcdn.com/ml/images/icons/default/rounded_corners/black/instagram.png" width="18" alt="instagram">\n            </a>\n        </td>\n    </tr>\n</table>\n\n                        \n                    </td>\n                </tr>\n            </table>\n        </td>\n        <td class="col" width="40" height="30" style="line-height: 30px;"></td>\n        <td class="col" align="left" width="250" valign="top" style="text-align: left!important;">\n            \n                <p style="font-family: \'Inter\', sans-serif; color: #242424; font-size: 14px; line-height: 150%; margin-bottom: 6px;">You received this email because you signed up on our website or made a purchase from us.</p>\n            \n\n            <table width="100%" cellpadding="0" cellspacing="0" border="0">\n                <tr>\n                    <td height="8" style="line-height: 8px;"></td>\n                </tr>\n                <tr>\n                    <td align="left">\n                        <p style="font-family: \'Inter\', sans-serif; color: #242424; font-size: 14px; line-height: 150%; margin-bottom: 0;">\n                            <a href="{$unsubscribe}" style="color: #242424; font-weight: normal; font-style: normal; text-decoration: underline;" data-link-id="152432757120697769" data-link-type="unsubscribe">Unsuscribe</a>\n                            \n                            \n                            \n                        </p>\n                    </td>\n                </tr>\n            </table>\n        </td>\n    </tr>\n</table>\n\n\n\n\n\n\n\n\n    \n    \n    \n    \n    \n\n\n\n    \n    \n    \n    \n\n\n\n    \n    \n\n\n\n\n\n    \n    \n    \n\n\n\n                            </td>\n                    </tr>\n                    <tr>\n                        <td height="40" style="line-height: 40px;"></td>\n                    </tr>\n                </table>\n                \n                    \n                    \n                \n            \n        </td>\n    </tr>\n</table>\n<!-- {% endif %} -->\n\n\n\n                            </td>\n                        </tr>\n                    </table>\n\n                    <table cellpadding="0" cellspacing="0" border="0" align="center" width="640" style="max-width: 640px; width: 100%;">\n    <tr class="ml-hide-branding">\n        <td height="40" style="line-height: 40px;"></td>\n    </tr>\n    <tr class="ml-hide-branding">\n        <td align="center">\n            <a href="https://www.mailerlite.com" target="_blank" style="text-decoration: none;" data-link-id="152432757125940650">\n                <img width="100" border="0" alt="Sent by MailerLite" src="https://assets.mlcdn.com/ml/logo/sent-by-mailerlite.png" style="display: block;">\n            </a>\n        </td>\n    </tr>\n    <tr class="ml-hide-branding">\n        <td height="40" style="line-height: 40px;"></td>\n    </tr>\n</table>\n\n\n                </td>\n            </tr>\n        </table>\n\n    </div>\n\n    \n\n    \n\n<!--{$body_bottom}--></body>\n</html>'
-
-    status_code, result = client.create_campaign(
-        name="lambda campaña",
-        groups=[group_id],
-        subject="prueba campaña",
-        from_email="contacto@valledelosangeles.com",
-        from_name="Valle de los Ángeles",
-        content=content,
-    )
-
-    # TODO: Check status code
-    print(f"Create campaign status code: {status_code}")
-
-    campaign_id = result["data"]["id"]
-
-    print(f"{campaign_id=}")
-
-    # Send campaign
-    status_code, result = client.send_campaign(campaign_id)
-
-    print(f"Send campaign status code: {status_code}")
-
     # NOTE: If delete campaign and group immediately, it does not send emails
 
     # # Delete campaign
@@ -169,4 +1089,17 @@ def lambda_handler(event, context):
     #
     # print(f"{status_code}")
 
-    return {"statusCode": 200, "body": json.dumps({"message": "mails are being sent"})}
+    response = {"message": "mails are being sent"}
+
+    if users_id:
+        # One subscriber ID per user of the request, duplicates included
+        response["subscriber_ids"] = [
+            users_id[i] for i in (user_index or range(len(users_id)))
+        ]
+
+    return {"statusCode": 200, "body": json.dumps(response)}
+
+
+# Init phase, at the end so every function it may call is defined
+log.info("init", init_type=INIT_TYPE, eager=EAGER_INIT, **initialize())
+log.flush()
@@ -1,51 +1,391 @@
+import copy
+import itertools
+import threading
+import time
+
+from urllib.parse import urljoin
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+from deadline import Deadline
+from errors import (
+    DeadlineExceeded,
+    ImportTimeout,
+    MailerLiteError,
+    RateLimitedError,
+    ServerError,
+    TransportError,
+    error_for_status,
+)
+from instrumentation import RequestRecord, endpoint_template
+from rate_limiter import RateLimiter
+from retry import RETRY_STATUSES, RetryBudget, RetryPolicy
+from structured_log import log
+from subscriber_cache import SubscriberCache, fields_hash
+from template_registry import DEFAULT_TEMPLATE, get_template
+
+BASE_URL = "https://connect.mailerlite.com/api"
 
 
 class MailerLiteClient:
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = BASE_URL,
+        pool_connections: int = 1,
+        pool_maxsize: int = 10,
+        keep_alive: bool = True,
+        requests_per_minute: int = 120,
+        limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        connect_timeout: float = 3.05,
+        read_timeout: float = 30.0,
+        subscriber_cache: SubscriberCache | None = None,
+        instrumentation=None,
+    ):
         self.api_key: str = api_key
+        self.base_url: str = base_url.rstrip("/")
         self.headers: dict = {
             "Content-Type": "application/json",
             "Authorization": f"Bearer {self.api_key}",
         }
 
+        if not keep_alive:
+            self.headers["Connection"] = "close"
+
+        self.pool_connections: int = pool_connections
+        self.pool_maxsize: int = pool_maxsize
+        self.session: requests.Session = self._build_session(
+            pool_connections, pool_maxsize
+        )
+        self.limiter: RateLimiter = limiter or RateLimiter(requests_per_minute)
+        self.retry_policy: RetryPolicy = retry_policy or RetryPolicy()
+        self.connect_timeout: float = connect_timeout
+        self.read_timeout: float = read_timeout
+        # Optional email -> subscriber ID cache used by `add_user`
+        self.subscriber_cache: SubscriberCache | None = subscriber_cache
+        # Subscriber writes avoided by `sync_subscriber` in this invocation
+        self.writes_skipped: int = 0
+        self._writes_lock = threading.Lock()
+        # Optional hook whose `record(RequestRecord)` is called after every
+        # API call, e.g. `instrumentation.RequestMetrics`
+        self.instrumentation = instrumentation
+
+        # Replaced at the start of every invocation, see `start_invocation`
+        self.retry_budget: RetryBudget = RetryBudget()
+        self.deadline: Deadline = Deadline()
+
         self._status_codes: dict = {
             200: "Ok",
             201: "Created",
-            422: "Unprocessable Entity",
+            202: "Accepted",
+            204: "No Content",
         }
 
-    def check_status_code(self, status_code: int):
+    def _build_session(
+        self, pool_connections: int, pool_maxsize: int
+    ) -> requests.Session:
         """
-        Checks the provided HTTP status code against predefined status codes.
+        Builds the pooled HTTP session shared by every request method.
+
+        A single `requests.Session` keeps TCP/TLS connections to the
+        MailerLite API alive between calls, so only the first request of a
+        warm container pays for the handshake.
+
+        Args:
+            pool_connections (int): Number of per-host connection pools
+                                    to cache.
+            pool_maxsize (int): Maximum number of connections kept alive
+                                per host.
+
+        Returns:
+            requests.Session: The configured session.
+        """
+
+        session = requests.Session()
+        session.headers.update(self.headers)
+
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        return session
+
+    def start_invocation(
+        self, retry_budget: RetryBudget, deadline: Deadline | None = None
+    ):
+        """
+        Sets the retry budget and the deadline shared by every request of an
+        invocation.
+
+        Args:
+            retry_budget (RetryBudget): The budget, usually built with
+                                        `RetryBudget.from_context`.
+            deadline (Deadline | None): When the invocation must be done.
+                                        Defaults to the budget's deadline.
+        """
+
+        self.retry_budget = retry_budget
+        self.deadline = deadline or retry_budget.deadline
+        self.writes_skipped = 0
+
+    def for_invocation(
+        self, retry_budget: RetryBudget, deadline: Deadline | None = None
+    ) -> "MailerLiteClient":
+        """
+        Returns a copy of the client with its own retry budget and deadline.
+
+        The copy shares the session, rate limiter, caches and
+        instrumentation, so it is cheap. It is meant for work that runs
+        beside the invocation (e.g. a background refill), which must not
+        spend the invocation's budget or see it replaced by the next one.
+        """
+
+        client = copy.copy(self)
+        client.start_invocation(retry_budget, deadline)
+
+        return client
+
+    def _timeout(self, method: str, url: str) -> tuple[float, float]:
+        """
+        Returns the (connect, read) timeouts of the next request, shortened
+        so the request cannot outlive the invocation's deadline.
+
+        Raises:
+            DeadlineExceeded: If there is no time left for the request.
+        """
+
+        remaining = self.deadline.remaining()
+
+        if remaining <= 0:
+            raise DeadlineExceeded(f"No time left to send {method} {url}")
+
+        return min(self.connect_timeout, remaining), min(self.read_timeout, remaining)
+
+    def _request(
+        self, method: str, url: str, idempotent: bool | None = None, **kwargs
+    ) -> requests.Response:
+        """
+        Sends a request through the pooled session.
+
+        Every API call goes through here: it waits for a token of the rate
+        limiter, feeds the rate-limit headers of the response back to it and
+        retries transient failures with jittered exponential backoff.
+
+        Connect and read timeouts are derived from the invocation deadline
+        (see `start_invocation`), so a stalled socket fails fast instead of
+        holding the invocation until Lambda kills it.
+
+        Connection failures and 429 responses are always retried, since the
+        request never reached or was rejected before processing. Read errors
+        and 5xx responses are only retried for idempotent requests, so a
+        campaign is never created or sent twice. Every retry is taken from
+        the invocation's retry budget. A 429 or 5xx that cannot be retried
+        raises the matching error instead of being returned, whatever its
+        body (e.g. a gateway's HTML error page).
+
+        If an instrumentation hook is set, the call (endpoint, status,
+        bytes, latency and retries) is reported to it once it is done.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The full request URL.
+            idempotent (bool | None): Whether repeating the request is safe.
+                                      Defaults to True for GET, PUT and
+                                      DELETE.
+            **kwargs: Passed to `requests.Session.request`.
+
+        Returns:
+            requests.Response: The last response received.
+
+        Raises:
+            TransportError: If no response could be received.
+            DeadlineExceeded: If the deadline passed before a response.
+            RateLimitedError: If the last response was a 429.
+            ServerError: If the last response was a 5xx.
+        """
+
+        if idempotent is None:
+            idempotent = method in ("GET", "PUT", "DELETE")
+
+        retry = 0
+        response = None
+        start = time.perf_counter()
+
+        try:
+            while True:
+                if self.limiter.acquire(max_wait=self.deadline.remaining()) is None:
+                    raise DeadlineExceeded(
+                        f"Rate limit leaves no time to send {method} {url}"
+                    )
+
+                timeout = self._timeout(method, url)
+
+                try:
+                    response = self.session.request(
+                        method, url, timeout=timeout, **kwargs
+                    )
+                except requests.RequestException as error:
+                    if self.deadline.expired():
+                        raise DeadlineExceeded(
+                            f"{method} {url} did not finish before the deadline"
+                        ) from error
+
+                    safe = idempotent or _request_not_sent(error)
+                    failure, response, retry_after = error, None, None
+                else:
+                    self.limiter.update(response.headers, response.status_code)
+
+                    if response.status_code not in RETRY_STATUSES:
+                        return response
+
+                    safe = idempotent or response.status_code == 429
+                    failure, retry_after = None, _retry_after(response)
+
+                delay = self.retry_policy.delay(retry, retry_after)
+                can_retry = safe and retry + 1 < self.retry_policy.max_attempts
+
+                if can_retry and not self.retry_budget.try_spend(delay):
+                    log.warning(
+                        "retry_budget_exhausted",
+                        method=method,
+                        endpoint=endpoint_template(url, self.base_url),
+                        delay=round(delay, 2),
+                        used=self.retry_budget.used,
+                        remaining=round(self.deadline.remaining(), 2),
+                    )
+                    can_retry = False
+
+                if not can_retry:
+                    if response is not None:
+                        raise _error_for_response(response)
+
+                    raise TransportError(
+                        f"{method} {url} failed: {failure}"
+                    ) from failure
+
+                reason = failure or response.status_code
+                log.warning(
+                    "request_retry",
+                    method=method,
+                    endpoint=endpoint_template(url, self.base_url),
+                    delay=round(delay, 2),
+                    reason=reason,
+                )
+                time.sleep(delay)
+                retry += 1
+        finally:
+            if self.instrumentation is not None:
+                self._record(method, url, response, retry, start)
+
+    def _record(
+        self,
+        method: str,
+        url: str,
+        response: requests.Response | None,
+        retries: int,
+        start: float,
+    ):
+        """
+        Reports a finished API call to the instrumentation hook.
+        """
+
+        if response is None:
+            status, sent, received = None, 0, 0
+        else:
+            body = response.request.body
+            status = response.status_code
+            sent = len(body) if body else 0
+            received = len(response.content)
+
+        self.instrumentation.record(
+            RequestRecord(
+                method,
+                endpoint_template(url, self.base_url),
+                status,
+                sent,
+                received,
+                time.perf_counter() - start,
+                retries,
+            )
+        )
+
+    def close(self):
+        """
+        Closes the pooled session and every kept-alive connection.
+        """
+
+        self.session.close()
+
+    def reconnect(self):
+        """
+        Replaces the session with a new one, dropping every pooled
+        connection. Used after a Lambda snapshot is restored, when the
+        connections it holds are dead.
+        """
+
+        self.session.close()
+        self.session = self._build_session(self.pool_connections, self.pool_maxsize)
+
+    def warm_up(self) -> bool:
+        """
+        Opens a pooled connection ahead of the first API call, so the TCP/TLS
+        handshake is paid now. Sends a HEAD request to the API root, which
+        does not take a token from the rate limiter.
+
+        Returns:
+            bool: True if the server answered.
+        """
+
+        try:
+            self.session.head(self.base_url, timeout=self.connect_timeout)
+        except requests.RequestException as error:
+            log.warning("warm_up_failed", error=error)
+            return False
+
+        return True
+
+    def __enter__(self):
+        return self
 
-        If the status code is not defined in the _status_codes dictionary,
-        it prints an undefined status message and exits the program.
+    def __exit__(self, *exc_info):
+        self.close()
 
-        If the status code is 422, it prints the corresponding status message
-        and exits the program.
+    def check_status_code(self, status_code: int, body: dict | None = None):
+        """
+        Checks the provided HTTP status code against predefined status codes.
+
+        For defined status codes, it prints the status code and its
+        corresponding message.
 
-        For all other defined status codes, it prints the status code and
-        its corresponding message.
+        Any other status code raises the matching `MailerLiteError` subclass
+        (ValidationError for 422, RateLimitedError for 429, ...). Raising
+        instead of exiting lets the Lambda handler turn the error into an
+        HTTP response while the runtime stays warm.
 
         Args:
             status_code (int): The HTTP status code to check.
+            body (dict | None): The JSON-decoded response, used to build the
+                                error message.
+
+        Raises:
+            MailerLiteError: If the status code is not a success.
         """
 
         status = self._status_codes.get(status_code)
 
         if not status:
-            print(f"Status code not defined: {status}")
-            # NOTE: Return status code in json
-            exit(0)
-
-        print(f"{status_code}: {self._status_codes[status_code]}")
+            raise error_for_status(status_code, body)
 
-        if status_code == 422:
-            # NOTE: Return status code in json
-            exit(0)
+        log.debug("status_ok", status_code=status_code, status=status)
 
-    def post(self, url: str, data: dict) -> tuple[int, dict]:
+    def post(
+        self, url: str, data: dict, idempotent: bool = False
+    ) -> tuple[int, dict]:
         """
         Sends a POST request to the specified URL with the provided JSON data.
 
@@ -57,6 +397,9 @@ class MailerLiteClient:
             url (str): The endpoint URL to which the POST request will be sent.
             data (dict): A dictionary representing the JSON payload to include
                          in the request body.
+            idempotent (bool): Whether the request can be repeated safely,
+                               which allows retrying it after a server
+                               error.
 
         Returns:
             tuple:
@@ -67,13 +410,40 @@ class MailerLiteClient:
         status_code, response_data = self.post("https://api.example.com/data", {"key": "value"})
         """
 
-        try:
-            response = requests.post(url, headers=self.headers, json=data)
-        except Exception as error:
-            print(f"{error=}")
-            # NOTE: return a status code if server has an error? 3xx
+        response = self._request("POST", url, idempotent=idempotent, json=data)
+
+        return response.status_code, _decode(response)
+
+    def batch(
+        self, requests: list[dict], idempotent: bool = False
+    ) -> tuple[int, dict]:
+        """
+        Sends several API requests in a single batch request.
+
+        Each item is a dict with the 'method', the 'path' relative to the
+        host (e.g. "api/subscribers") and an optional 'body'. MailerLite runs
+        them in order and returns one response per item.
+
+        Parameters:
+            requests (list): The requests to run. At most 50 per batch.
+            idempotent (bool): Whether every request in the batch can be
+                               repeated safely.
+
+        Returns:
+            tuple:
+                - int: The HTTP status code of the batch request.
+                - dict: The JSON-decoded response content from the server,
+                        with a 'responses' list in the same order as
+                        `requests`.
+
+        Reference:
+            MailerLite API Documentation:
+            https://developers.mailerlite.com/docs/batching
+        """
 
-        return response.status_code, response.json()
+        return self.post(
+            f"{self.base_url}/batch", {"requests": requests}, idempotent=idempotent
+        )
 
     def user_exists(self, email: str) -> tuple[int, dict] | None:
         """
@@ -92,22 +462,23 @@ class MailerLiteClient:
                                      user data if found, otherwise None.
         """
 
-        try:
-            response = requests.get(
-                f"https://connect.mailerlite.com/api/subscribers/{email}",
-                headers=self.headers,
-            )
-        except Exception as error:
-            print(f"{error=}")
-            # NOTE: return a status code if server has an error? 3xx
+        response = self._request(
+            "GET",
+            f"{self.base_url}/subscribers/{email}",
+        )
 
         if response.status_code == 200:
-            return response.status_code, response.json()
+            return response.status_code, _decode(response)
 
         return None
 
     def add_user(self, email: str, name: str, last_name=None) -> tuple[int, dict]:
         """
+        Returns the subscriber with the given email, creating it if needed.
+
+        If the client has a `subscriber_cache` and the email is in it, no
+        request is sent and the cached subscriber is returned with a 200.
+
         Parameters:
             email (str): The subscriber's email address.
             groups (list): A group IDs (strings) to which the subscriber should
@@ -124,27 +495,213 @@ class MailerLiteClient:
             https://developers.mailerlite.com/docs/subscribers
         """
 
+        if self.subscriber_cache is not None:
+            entry = self.subscriber_cache.get(email)
+
+            if entry is not None:
+                subscriber = {"id": entry["id"], "email": email}
+                subscriber["fields"] = entry["fields"]
+
+                return 200, {"data": subscriber}
+
         user_available = self.user_exists(email)
 
         if user_available:
+            self.cache_subscriber(*user_available)
             return user_available
 
         data = {}
         data["email"] = email
         data["fields"] = {"name": name, "last_name": last_name}
 
-        return self.post("https://connect.mailerlite.com/api/subscribers", data)
+        status_code, result = self.post(
+            f"{self.base_url}/subscribers", data, idempotent=True
+        )
+        self.cache_subscriber(status_code, result)
+
+        return status_code, result
+
+    def cache_subscriber(
+        self, status_code: int, result: dict, pushed_fields: dict | None = None
+    ):
+        """
+        Stores the subscriber of a successful response in
+        `subscriber_cache`, if the client has one.
+
+        Args:
+            status_code (int): The HTTP status of the response.
+            result (dict): The JSON-decoded response, with the subscriber in
+                           'data'.
+            pushed_fields (dict | None): The fields sent in the request. Their
+                                         hash is kept for `sync_subscriber`.
+        """
+
+        if self.subscriber_cache is None or status_code not in (200, 201):
+            return
+
+        subscriber = (result or {}).get("data") or {}
+
+        if not subscriber.get("id") or not subscriber.get("email"):
+            return
+
+        extra = {}
+
+        if pushed_fields is not None:
+            extra["fields_hash"] = fields_hash(pushed_fields)
+
+        self.subscriber_cache.put(
+            subscriber["email"], subscriber["id"], subscriber.get("fields"), **extra
+        )
+
+    def upsert_subscriber(
+        self,
+        email: str,
+        name: str,
+        groups: list | None = None,
+        fields: dict | None = None,
+    ) -> tuple[int, dict]:
+        """
+        Creates or updates a subscriber and assigns it to groups in a
+        single request.
+
+        MailerLite's create endpoint is an upsert: if the email already
+        exists the subscriber is updated (200), otherwise it is created
+        (201). Groups listed in `groups` are added to the subscriber's
+        existing groups, so no separate existence check or subscribe call
+        is needed.
+
+        Parameters:
+            email (str): The subscriber's email address.
+            name (str): The subscriber's name, stored in the 'name' field.
+            groups (list): Group IDs to assign the subscriber to.
+            fields (dict): Extra custom fields to set on the subscriber.
+
+        Returns:
+            tuple:
+                - int: The HTTP status code returned by the server.
+                - dict: The JSON-decoded response content from the server.
+
+        Reference:
+            MailerLite API Documentation:
+            https://developers.mailerlite.com/docs/subscribers
+        """
+
+        data = {}
+        data["email"] = email
+        data["fields"] = {"name": name, **(fields or {})}
+
+        if groups:
+            data["groups"] = list(groups)
+
+        status_code, result = self.post(
+            f"{self.base_url}/subscribers", data, idempotent=True
+        )
+        self.cache_subscriber(status_code, result, data["fields"])
+
+        return status_code, result
+
+    def sync_subscriber(
+        self,
+        email: str,
+        name: str,
+        groups: list | None = None,
+        fields: dict | None = None,
+    ) -> tuple[int, dict]:
+        """
+        Delta-sync version of `upsert_subscriber`.
+
+        If `subscriber_cache` shows these exact fields were already pushed
+        for the email, the subscriber is not written again: it is only
+        assigned to `groups`, and `writes_skipped` is incremented. New or
+        changed records, and cached IDs that turn out to be stale, go
+        through `upsert_subscriber`.
+
+        Parameters:
+            email (str): The subscriber's email address.
+            name (str): The subscriber's name, stored in the 'name' field.
+            groups (list): Group IDs to assign the subscriber to.
+            fields (dict): Extra custom fields to set on the subscriber.
+
+        Returns:
+            tuple:
+                - int: The HTTP status code returned by the server.
+                - dict: The subscriber, under 'data'.
+        """
+
+        pushed_fields = {"name": name, **(fields or {})}
+        entry = None
+
+        if self.subscriber_cache is not None:
+            entry = self.subscriber_cache.unchanged(email, pushed_fields)
+
+        if entry is not None:
+            for group_id in groups or []:
+                if self.subscribe_user(entry["id"], group_id) not in (200, 201):
+                    # The ID went stale and was dropped from the cache
+                    return self.upsert_subscriber(email, name, groups, fields)
+
+            self.count_skipped_writes(1)
+
+            subscriber = {"id": entry["id"], "email": email}
+            subscriber["fields"] = entry["fields"]
+
+            return 200, {"data": subscriber}
+
+        return self.upsert_subscriber(email, name, groups, fields)
+
+    def count_skipped_writes(self, count: int):
+        with self._writes_lock:
+            self.writes_skipped += count
+
+    def iter_group_subscribers(self, group_id: str, page_size: int = 1000):
+        """
+        Iterates over the subscribers of a group, following the cursor
+        pagination of the API. Pages are requested lazily.
+
+        Args:
+            group_id (str): The ID of the group.
+            page_size (int): Subscribers requested per page.
+
+        Yields:
+            dict: A subscriber of the group.
+
+        Raises:
+            MailerLiteError: If a page cannot be retrieved.
+        """
+
+        params = {"limit": page_size}
+
+        while True:
+            response = self._request(
+                "GET",
+                f"{self.base_url}/groups/{group_id}/subscribers",
+                params=params,
+            )
+            result = _decode(response)
+
+            if response.status_code != 200:
+                raise error_for_status(response.status_code, result)
+
+            yield from result.get("data") or []
+
+            cursor = (result.get("meta") or {}).get("next_cursor")
+
+            if not cursor:
+                return
+
+            params = {"limit": page_size, "cursor": cursor}
 
     def user_suscribed_to_group(self, user_id: str, group_id) -> dict | None:
         """
         Checks if a specific user is subscribed to a given group.
 
-        Sends a GET request to the MailerLite API to retrieve all subscribers
-        of the specified group.
-        Iterates through the subscriber list to check if the user ID exists in
-        the group's data.
+        Pages through the subscribers of the specified group and stops as
+        soon as the user ID is found.
         Returns the subscriber's data if found, otherwise returns None.
 
+        To check many users against the same group, use
+        `GroupMembershipIndex`, which downloads the group only once.
+
         Args:
             user_id (str): The ID of the user to check.
             group_id (str): The ID of the group to search within.
@@ -154,19 +711,7 @@ class MailerLiteClient:
                          in the group, otherwise None.
         """
 
-        try:
-            response = requests.get(
-                f"https://connect.mailerlite.com/api/groups/{
-                    group_id}/subscribers",
-                headers=self.headers,
-            )
-        except Exception as error:
-            print(f"{error=}")
-            # NOTE: return a status code if server has an error? 3xx
-
-        result = response.json()
-
-        for item in result["data"]:
+        for item in self.iter_group_subscribers(group_id):
             if item.get("id") == user_id:
                 return item  # dict
 
@@ -178,10 +723,12 @@ class MailerLiteClient:
 
         Sends a POST request to the MailerLite API to add the specified user
         to the given group.
-        Handles exceptions during the request and prints the error
-        if one occurs.
+        Transient failures are retried by the transport.
         Returns the HTTP status code of the response.
 
+        A 404 or 422 means the user ID is no longer valid (for example the
+        subscriber was deleted), so it is dropped from `subscriber_cache`.
+
         Args:
             user_id (str): The ID of the user to subscribe.
             group_id (str): The ID of the group to subscribe the user to.
@@ -190,16 +737,14 @@ class MailerLiteClient:
             int: The HTTP status code of the API response.
         """
 
-        try:
-            response = requests.post(
-                f"https://connect.mailerlite.com/api/subscribers/{user_id}/groups/{
-                    group_id
-                }",
-                headers=self.headers,
-            )
-        except Exception as error:
-            print(f"{error=}")
-            # NOTE: return a status code if server has an error? 3xx
+        response = self._request(
+            "POST",
+            f"{self.base_url}/subscribers/{user_id}/groups/{group_id}",
+            idempotent=True,
+        )
+
+        if response.status_code in (404, 422) and self.subscriber_cache is not None:
+            self.subscriber_cache.invalidate_id(user_id)
 
         return response.status_code
 
@@ -222,25 +767,236 @@ class MailerLiteClient:
             https://developers.mailerlite.com/docs/subscribers
         """
 
-        try:
-            response = requests.delete(
-                f"https://connect.mailerlite.com/api/subscribers/{user_id}",
-                headers=self.headers,
-            )
-        except Exception as error:
-            print(f"{error=}")
-            # NOTE: return a status code if server has an error? 3xx
+        response = self._request(
+            "DELETE",
+            f"{self.base_url}/subscribers/{user_id}",
+        )
+
+        if self.subscriber_cache is not None:
+            self.subscriber_cache.invalidate_id(user_id)
 
         return response.status_code
 
+    def import_subscribers_to_group(
+        self,
+        group_id: str,
+        users,
+        chunk_size: int = 1000,
+        poll_interval: float = 0.5,
+        max_poll_interval: float = 8.0,
+        timeout: float = 600.0,
+        on_progress=None,
+    ) -> dict:
+        """
+        Imports subscribers into a group using the bulk import endpoint.
+
+        `users` can be any iterable of dicts with 'email' and 'name'; it is
+        consumed lazily in chunks of `chunk_size`, so very large lists never
+        have to be serialized in one request. Each chunk starts an import job
+        that is polled until it is done, waiting `poll_interval` seconds
+        between polls and doubling the wait up to `max_poll_interval`.
+
+        Parameters:
+            group_id (str): The group to import the subscribers into.
+            users (iterable): Dicts with the 'email' and 'name' of each user.
+            chunk_size (int): Subscribers sent per import request.
+            poll_interval (float): First wait between progress polls.
+            max_poll_interval (float): Longest wait between progress polls.
+            timeout (float): Seconds to wait for a single import job.
+            on_progress (callable): Called with the progress counters after
+                                    every poll.
+
+        Returns:
+            dict: Progress counters for the whole import: 'chunks', 'sent',
+                  'processed', 'imported', 'updated', 'errored' and 'done'.
+
+        Reference:
+            MailerLite API Documentation:
+            https://developers.mailerlite.com/docs/groups
+        """
+
+        progress = {
+            "chunks": 0,
+            "sent": 0,
+            "processed": 0,
+            "imported": 0,
+            "updated": 0,
+            "errored": 0,
+            "done": False,
+        }
+        users = iter(users)
+
+        while True:
+            chunk = list(itertools.islice(users, chunk_size))
+
+            if not chunk:
+                break
+
+            subscribers = [
+                {"email": user["email"], "fields": {"name": user["name"]}}
+                for user in chunk
+            ]
+
+            status_code, result = self.post(
+                f"{self.base_url}/groups/{group_id}/import-subscribers",
+                {"subscribers": subscribers},
+            )
+            self.check_status_code(status_code, result)
+
+            progress_url = (
+                result.get("import_progress_url") if isinstance(result, dict) else None
+            )
+
+            if not progress_url:
+                raise ServerError(
+                    "Import response has no import_progress_url", status_code, result
+                )
+
+            progress["chunks"] += 1
+            progress["sent"] += len(subscribers)
+
+            job = self._wait_for_import(
+                progress_url,
+                poll_interval,
+                max_poll_interval,
+                timeout,
+                progress,
+                on_progress,
+            )
+
+            for counter in ("processed", "imported", "updated", "errored"):
+                progress[counter] += job.get(counter) or 0
+
+        progress["done"] = True
+
+        if on_progress:
+            on_progress(dict(progress))
+
+        return progress
+
+    def _wait_for_import(
+        self,
+        progress_url: str,
+        poll_interval: float,
+        max_poll_interval: float,
+        timeout: float,
+        progress: dict,
+        on_progress,
+    ) -> dict:
+        """
+        Polls an import job with exponential backoff until it is done.
+
+        Returns:
+            dict: The final state of the import job.
+
+        Raises:
+            MailerLiteError: If a poll fails (e.g. NotFoundError for an
+                             unknown job).
+            ImportTimeout: If the job is not done after `timeout` seconds.
+            DeadlineExceeded: If the invocation's deadline comes first, so
+                              the handler can answer with the progress.
+        """
+
+        if not progress_url.startswith("http"):
+            progress_url = f"{self.base_url}/{progress_url.lstrip('/')}"
+
+        deadline = time.monotonic() + timeout
+        wait = poll_interval
+
+        while True:
+            response = self._request("GET", progress_url)
+            result = _decode(response)
+            self.check_status_code(response.status_code, result)
+
+            job = result.get("data") or {}
+
+            if on_progress:
+                current = dict(progress)
+
+                for counter in ("processed", "imported", "updated", "errored"):
+                    current[counter] += job.get(counter) or 0
+
+                on_progress(current)
+
+            if job.get("done") or job.get("finished_at"):
+                return job
+
+            if time.monotonic() + wait > deadline:
+                raise ImportTimeout(f"Import not finished after {timeout}s")
+
+            # Never sleep into the time kept to answer before Lambda's timeout
+            remaining = self.deadline.remaining()
+
+            if remaining <= 0:
+                raise DeadlineExceeded("Import not finished before the deadline")
+
+            time.sleep(min(wait, remaining))
+            wait = min(wait * 2, max_poll_interval)
+
+    def iter_groups(
+        self,
+        name: str | None = None,
+        page_size: int = 100,
+        fields: tuple = ("id", "name"),
+    ):
+        """
+        Iterates over the groups of the account, page by page.
+
+        Pages are requested lazily, so a caller that stops iterating early
+        does not download the remaining pages. When `name` is given it is
+        sent as `filter[name]`, letting MailerLite return only the groups
+        whose name contains it.
+
+        Args:
+            name (str | None): Server-side name filter (partial match).
+            page_size (int): Groups requested per page.
+            fields (tuple): Keys kept from each group, to avoid holding on to
+                            the full group objects.
+
+        Yields:
+            dict: A group with only the requested `fields`.
+
+        Raises:
+            MailerLiteError: If a page cannot be retrieved.
+        """
+
+        params = {"limit": page_size, "page": 1}
+
+        if name is not None:
+            params["filter[name]"] = name
+
+        url = f"{self.base_url}/groups"
+
+        while url:
+            response = self._request("GET", url, params=params)
+            result = _decode(response)
+
+            if response.status_code != 200:
+                raise error_for_status(response.status_code, result)
+
+            items = result.get("data") or []
+
+            for item in items:
+                yield {field: item.get(field) for field in fields}
+
+            next_url = (result.get("links") or {}).get("next")
+
+            if next_url:
+                # The next link already carries every query parameter
+                url, params = urljoin(url, next_url), None
+            elif len(items) == page_size and params is not None:
+                params["page"] += 1
+            else:
+                url = None
+
     def group_exists(self, group_name: str):
         """
         Checks if a group with the specified name exists.
 
-        Sends a GET request to the MailerLite API to retrieve all groups.
-        Iterates through the groups and compares their names with the provided
-        group name.
-        Handles request exceptions and prints any errors.
+        Pages through the groups filtered by name on the server and stops at
+        the first group whose name matches exactly, so only the pages before
+        the match are requested.
+        Transient failures are retried by the transport.
         Returns the group data as a dictionary if found,
         otherwise returns None.
 
@@ -248,22 +1004,12 @@ class MailerLiteClient:
             group_name (str): The name of the group to search for.
 
         Returns:
-            dict or None: The group data if found, otherwise None.
+            dict or None: The group's 'id' and 'name' if found,
+                          otherwise None.
         """
 
-        try:
-            response = requests.get(
-                "https://connect.mailerlite.com/api/groups",
-                headers=self.headers,
-            )
-        except Exception as error:
-            print(f"{error=}")
-            # NOTE: return a status code if server has an error? 3xx
-
-        result = response.json()
-
-        for item in result["data"]:
-            if item.get("name") == group_name:
+        for item in self.iter_groups(name=group_name):
+            if item["name"] == group_name:
                 return item  # dict
 
         return None
@@ -295,7 +1041,7 @@ class MailerLiteClient:
         data = {}
         data["name"] = name
 
-        return self.post("https://connect.mailerlite.com/api/groups", data=data)
+        return self.post(f"{self.base_url}/groups", data=data)
 
     def delete_group(self, group_id: str) -> int:
         """
@@ -317,14 +1063,10 @@ class MailerLiteClient:
             MailerLite API Documentation:
             https://developers.mailerlite.com/docs/groups
         """
-        try:
-            response = requests.delete(
-                f"https://connect.mailerlite.com/api/groups/{group_id}",
-                headers=self.headers,
-            )
-        except Exception as error:
-            print(f"{error=}")
-            # NOTE: return a status code if server has an error? 3xx
+        response = self._request(
+            "DELETE",
+            f"{self.base_url}/groups/{group_id}",
+        )
 
         return response.status_code
 
@@ -391,7 +1133,7 @@ class MailerLiteClient:
             ],
         }
 
-        return self.post("https://connect.mailerlite.com/api/campaigns", data=data)
+        return self.post(f"{self.base_url}/campaigns", data=data)
 
     def get_campaign(self, campaign_id: str) -> dict:
         """
@@ -399,8 +1141,7 @@ class MailerLiteClient:
 
         Sends a GET request to the MailerLite API to
         retrieve the campaign information.
-        Handles request exceptions and prints any errors encountered
-        during the request.
+        Transient failures are retried by the transport.
         Returns the JSON response containing campaign details.
 
         Args:
@@ -410,17 +1151,16 @@ class MailerLiteClient:
             dict: The JSON response containing the campaign details.
         """
 
-        try:
-            response = requests.get(
-                f"https://connect.mailerlite.com/api/campaigns/{campaign_id}",
-                headers=self.headers,
-            )
-        except Exception as error:
-            print(f"{error=}")
+        response = self._request(
+            "GET",
+            f"{self.base_url}/campaigns/{campaign_id}",
+        )
 
-        return response.json()
+        return _decode(response)
 
-    def update_campaign_group(self, campaign_id: str, group_id: str):
+    def update_campaign_group(
+        self, campaign_id: str, group_id: str, template_id: str = DEFAULT_TEMPLATE
+    ):
         """
         Updates the group of a specific campaign.
 
@@ -428,13 +1168,13 @@ class MailerLiteClient:
         with a new group ID.
         The method maintains other campaign details such as name,
         email content, and subject.
-        Handles request exceptions and prints any errors encountered
-        during the request.
+        Transient failures are retried by the transport.
         Returns the JSON response with the updated campaign data.
 
         Args:
             campaign_id (str): The ID of the campaign to update.
             group_id (str): The new group ID to associate with the campaign.
+            template_id (str): The template with the email content.
 
         Returns:
             dict: The JSON response containing the updated campaign details.
@@ -453,23 +1193,18 @@ class MailerLiteClient:
                     "subject": "prueba campaña",
                     "from": "contacto@valledelosangeles.com",
                     "from_name": "Valle de los Ángeles",
-                    # "content": old_data["emails"][0]["content"],
-                    # HACK:
-                    "content": '<!doctype html>\n<html lang dir="ltr" xmlns:v="urn:schemas-microsoft-com:vml" xmlns:o="urn:schemas-microsoft-com:office:office"><head><!--{$head_top}-->\n    <meta charset="utf-8">\n    \n    <meta http-equiv="X-UA-Compatible" content="IE=edge">\n    <meta name="viewport" content="width=device-width, initial-scale=1, user-scalable=yes">\n    <meta name="format-detection" content="telephone=no, date=no, address=no, email=no, url=no">\n    <meta name="x-apple-disable-message-reformatting">\n    <!--[if !mso]>\n    <meta http-equiv="X-UA-Compatible" content="IE=edge">\n    <![endif]-->\n    <!--[if mso]>\n    <style>\n        * { font-family: sans-serif !important; }\n    </style>\n    <noscript>\n        <xml>\n            <o:OfficeDocumentSettings>\n                <o:PixelsPerInch>96</o:PixelsPerInch>\n            </o:OfficeDocumentSettings>\n        </xml>\n    </noscript>\n    <![endif]-->\n    <style type="text/css">\n        /* Outlines the grids, remove when sending */\n        /*table td { border: 1px solid cyan; }*/\n        /* RESET STYLES */\n        html, body { margin: 0 !important; padding: 0 !important; width: 100% !important; height: 100% !important; }\n        body { -webkit-font-smoothing: antialiased; -moz-osx-font-smoothing: grayscale; text-rendering: optimizeLegibility;}\n        .document { margin: 0 !important; padding: 0 !important; width: 100% !important; }\n        img { border: 0; outline: none; text-decoration: none;  -ms-interpolation-mode: bicubic; }\n        table { border-collapse: collapse; }\n        table, td { mso-table-lspace: 0pt; mso-table-rspace: 0pt; }\n        body, table, td, a { -webkit-text-size-adjust: 100%; -ms-text-size-adjust: 100%; }\n        h1, h2, h3, h4, h5, p { margin:0; word-break: break-word;}\n        /* iOS BLUE LINKS */\n        a[x-apple-data-detectors] {\n            color: inherit !important;\n            text-decoration: none !important;\n            font-size: inherit !important;\n            font-family: inherit !important;\n            font-weight: inherit !important;\n            line-height: inherit !important;\n        }\n        /* ANDROID CENTER FIX */\n        div[style*="margin: 16px 0;"] { margin: 0 !important; }\n        /* MEDIA QUERIES */\n        @media all and (max-width:639px){\n            .wrapper{ width:100%!important; }\n            .container{ width:100%!important; min-width:100%!important; padding: 0 !important; }\n            .row{padding-left: 20px!important; padding-right: 20px!important;}\n            .col-mobile {width: 20px!important;}\n            .table-between-col-mobile {width:100%!important;}\n            .col{display: block!important; width: 100%!important;}\n            .col-feature{display: block!important; width: 100%!important;}\n            .mobile-center{text-align: center!important; float: none!important;}\n            .mobile-mx-auto {margin: 0 auto!important; float: none!important;}\n            .mobile-left{text-align: center!important; float: left!important;}\n            .mobile-hide{display: none!important;}\n            .img{ width:100% !important; height:auto !important; }\n            .ml-btn { width: 100% !important; max-width: 100%!important;}\n            .ml-btn-container { width: 100% !important; max-width: 100%!important;}\n            *[class="mobileOff"] { width: 0px !important; display: none !important; }\n            *[class*="mobileOn"] { display: block !important; max-height:none !important; }\n            .mlContentTable{ width: 100%!important; min-width: 10%!important; margin: 0!important; float: none!important; }\n            .mlContentButton a { display: block!important; width: auto!important; }\n            .mlContentOuter { padding-bottom: 0px!important; padding-left: 15px!important; padding-right: 15px!important; padding-top: 0px!important; }\n            .mlContentSurvey { float: none!important; margin-bottom: 10px!important; width:100%!important; }\n            .multiple-choice-item-table { width: 100% !important; min-width: 10% !important; float: none !important; }\n            .ml-default, .ml-card, .ml-fullwidth { width: 100%; min-width: 100%; }\n        }\n\n        @media screen and (max-width: 600px) {\n            .col-feature {\n                margin-bottom: 30px;\n            }\n        }\n\n        /* Carousel style */\n        @media screen and (-webkit-min-device-pixel-ratio: 0) {\n            .webkit {\n                display: block !important;\n            }\n        }  @media screen and (-webkit-min-device-pixel-ratio: 0) {\n            .non-webkit {\n                display: none !important;\n            }\n        }  @media screen and (-webkit-min-device-pixel-ratio: 0) {\n            /* TARGET OUTLOOK.COM */\n            [class="x_non-webkit"] {\n                display: block !important;\n            }\n        }  @media screen and (-webkit-min-device-pixel-ratio: 0) {\n            [class="x_webkit"] {\n                display: none !important;\n            }\n        }\n    </style>\n    \n    <style type="text/css">@import url("https://assets.mlcdn.com/fonts-v2.css?version=1745332");</style>\n<style type="text/css">\n            @media screen {\n                body {\n                    font-family: \'Inter\', sans-serif;\n                }\n            }\n        </style><meta name="robots" content="noindex, nofollow">\n<title>prueba campaña</title>\n<!--{$head_bottom}--></head>\n<body style="margin: 0 !important; padding: 0 !important; background-color:#F4F7FA;"><!--{$body_top}-->\n\n    \n        \n        \n    \n\n    \n\n        \n            \n\n            \n            \n            \n            \n            \n            \n        \n\n        \n            \n\n            \n        \n\n        \n            \n\n            \n        \n\n    \n\n    \n\n        \n\n        \n\n        \n            \n            \n            \n            \n            \n        \n\n        \n            \n            \n            \n            \n            \n        \n\n        \n            \n            \n            \n            \n            \n        \n\n        \n            \n            \n            \n            \n            \n        \n\n        \n            \n            \n            \n            \n            \n        \n\n        \n            \n            \n            \n            \n            \n        \n\n        \n            \n            \n            \n            \n        \n\n        \n            \n            \n        \n\n        \n            \n            \n            \n        \n\n        \n            \n            \n            \n            \n            \n            \n            \n            \n            \n            \n        \n\n        \n            \n            \n            \n            \n            \n            \n            \n            \n            \n            \n        \n\n        \n\n            \n                \n                \n                \n                \n                \n            \n\n            \n                \n                \n                \n            \n\n            \n                \n                \n                \n                \n                \n            \n\n            \n                \n                \n                \n                \n                \n            \n\n            \n                \n                \n                \n                \n                \n            \n\n            \n                \n                \n                \n                \n            \n\n            \n                \n                \n            \n\n            \n                \n                \n            \n\n        \n    \n\n    <div class="document" role="article" aria-roledescription="email" aria-label lang dir="ltr" style="background-color:#F4F7FA; line-height: 100%; font-size:medium; font-size:max(16px, 1rem);">\n\n        <!--[if gte mso 9]>\n        <v:background xmlns:v="urn:schemas-microsoft-com:vml" fill="t" if="variable.bodyBackgroundImage.value">\n            <v:fill type="tile" src="" color="#F4F7FA"/>\n        </v:background>\n        <![endif]-->\n\n        \n\n        <table width="100%" align="center" cellspacing="0" cellpadding="0" border="0">\n            <tr>\n                <td class background bgcolor="#F4F7FA" align="center" valign="top" style="padding: 0 8px;">\n\n                    <table class="container" align="center" width="640" cellpadding="0" cellspacing="0" border="0" style="max-width: 640px;">\n    <tr>\n        <td align="center">\n            \n\n                \n\n                <table align="center" width="100%" cellpadding="0" cellspacing="0" border="0">\n                    <tr>\n                        <td colspan="2" height="20" style="line-height: 20px"></td>\n                    </tr>\n                    <tr>\n                        \n                        <td align="left" style="font-family: \'Inter\', sans-serif; color: #111111; font-size: 12px; line-height: 18px;">\n                            \n                            \n                        </td>\n                        \n                        <td align="right" style="font-family: \'Inter\', sans-serif; color: #111111; font-size: 12px; line-height: 18px;">\n                            <a style="color: #111111; font-weight: normal; font-style: normal; text-decoration: underline;" href="{$url}" data-link-id="152432757093434783" data-link-type="webview">View in browser</a>&nbsp;\n                        </td>\n                    </tr>\n                    <tr>\n                        <td colspan="2" height="20" style="line-height: 20px;"></td>\n                    </tr>\n                </table>\n\n                \n\n                \n                    \n                    \n                    \n                \n\n                \n                    \n                    \n                \n\n            \n        </td>\n    </tr>\n</table>\n\n\n                    <table width="640" class="wrapper" align="center" border="0" cellpadding="0" cellspacing="0" style="\n                        max-width: 640px;\n                        border:1px solid #E5E5E5;\n                        border-radius:8px; border-collapse: separate!important; overflow: hidden;\n                        ">\n                        <tr>\n                            <td align="center">\n\n                                \n    <!-- {% if true %} -->\n<table class="ml-default" width="100%" bgcolor border="0" cellspacing="0" cellpadding="0">\n    <tr>\n        <td style>\n            \n                \n                \n\n                \n                \n\n                <table class="container ml-4 ml-default-border" width="640" bgcolor="#ffffff" align="center" border="0" cellspacing="0" cellpadding="0" style="\n                width: 640px; min-width: 640px;\n                ;\n                \n                ">\n                    <tr>\n                        <td class="ml-default-border container" height="40" style="line-height: 40px; min-width: 640px;"></td>\n                    </tr>\n                    <tr>\n                        <td>\n\n    \n    \n    \n    \n\n\n<table align="center" width="100%" border="0" cellspacing="0" cellpadding="0">\n    <tr>\n        <td class="row mobile-center" align="center" style="padding: 0 50px;">\n            \n\n    \n\n\n\n\n\n\n<img src="https://storage.mlcdn.com/account_image/1043022/VmjzhOMrYV5tCc5ld0UYBqeBLWRCTaDhNdYB8CjL.png" border="0" alt width="120" class="logo" style="max-width: 120px; display: inline-block;">\n\n\n\n\n\n\n\n\n        </td>\n    </tr>\n    <tr>\n        <td height="25" style="line-height: 25px;"></td>\n    </tr>\n    \n    <tr>\n        <td class="row mobile-center" style="padding: 0 50px;" align="center">\n            \n\n    \n\n\n<table class="menu mobile-mx-auto" width cellpadding="0" cellspacing="0" border="0">\n    <tr>\n        <td align="center" class="menu-item" style="padding: 0 20px 0 0;">\n            <a href="https://" target="blank" style="font-family: \'Inter\', sans-serif; font-size: 14px; line-height: 150%; color: #2C438D; font-weight: normal; font-style: normal; text-decoration: none;" data-link-id="152432757100774816">\n                <span style="color: #2C438D;">About</span>\n            </a>\n        </td><td align="center" class="menu-item" style="padding: 0 20px 0 20px;">\n            <a href="https://" target="blank" style="font-family: \'Inter\', sans-serif; font-size: 14px; line-height: 150%; color: #2C438D; font-weight: normal; font-style: normal; text-decoration: none;" data-link-id="152432757106017698">\n                <span style="color: #2C438D;">New!</span>\n            </a>\n        </td><td align="center" class="menu-item" style="padding: 0 0 0 20px;">\n            <a href="https://" target="blank" style="font-family: \'Inter\', sans-serif; font-size: 14px; line-height: 150%; color: #2C438D; font-weight: normal; font-style: normal; text-decoration: none;" data-link-id="152432757109163427">\n                <span style="color: #2C438D;">Shop</span>\n            </a>\n        </td>\n    </tr>\n</table>\n\n\n\n\n        </td>\n    </tr>\n    \n</table>\n\n\n    \n    \n    \n    \n    \n\n\n\n    \n    \n\n\n\n\n                            </td>\n                    </tr>\n                    <tr>\n                        <td height="40" style="line-height: 40px;"></td>\n                    </tr>\n                </table>\n                \n                    \n                    \n                \n            \n        </td>\n    </tr>\n</table>\n<!-- {% endif %} -->\n\n\n    <!-- {% if true %} -->\n<table class="ml-default" width="100%" bgcolor border="0" cellspacing="0" cellpadding="0">\n    <tr>\n        <td style>\n            \n                \n                \n                \n                \n                \n                \n                \n                \n\n                <table class="ml-default-border" width="100%" align="center" bgcolor="#ffffff" border="0" cellspacing="0" cellpadding="0" style="\n                ;\n                \n                ">\n                    <tr>\n                        <td class="ml-default-border" background style="background-size: cover; background-position: center center;" valign="top" align="center">\n\n                            \n                            <table class="container ml-9" width="640" align="center" border="0" cellpadding="0" cellspacing="0" style="color: #242424; width: 640px; min-width: 640px;">\n                                <tr>\n                                    <td class="container" height="20" style="line-height: 20px; min-width: 640px;"></td>\n                                </tr>\n                                <tr>\n                                    <td>\n\n    \n    \n\n\n\n\n\n\n    <table class="container" width="640" border="0" cellspacing="0" cellpadding="0">\n        <tr>\n            <td class="row" align="center" style="padding: 0 50px" colspan="3">\n                \n\n    \n    <img src="https://storage.mlcdn.com/account_image/1043022/tlW3EOUmz0rNUT4J9PILS6KXxubqO4LNUAxWKS79.png" border="0" alt class="img" width="540" style="display: block;">\n\n\n\n            </td>\n        </tr>\n        <tr>\n            <td class="col-mobile" width="50" height="0" style="line-height: 0;"></td>\n            <td>\n                <table class="table-between-col-mobile" width="540" border="0" cellspacing="0" cellpadding="0">\n                    <tr>\n                        <td height="30" style="line-height:30px;"></td>\n                    </tr>\n                    <tr>\n                        <td>\n                            <h1 style="font-family: \'Inter\', sans-serif; color: #2C438D; font-size: 36px; line-height: 125%; font-weight: bold; font-style: normal; text-decoration: none; ;margin-bottom: 10px; text-align: center;">Cotización</h1>\n<p style="font-family: \'Inter\', sans-serif; color: #242424; font-size: 16px; line-height: 165%; margin-top: 0; margin-bottom: 0; text-align: center;">{$name} ha recibido una nueva cotización</p>\n                        </td>\n                    </tr>\n                    <tr>\n                        <td height="30" style="line-height:30px;"></td>\n                    </tr>\n                    <tr>\n                        <td align="center">\n                            \n\n    \n    \n    \n    \n\n    \n\n\n\n\n\n\n                        </td>\n                    </tr>\n                    \n                    \n                </table>\n            </td>\n            <td class="col-mobile" width="50" height="0" style="line-height: 0;"></td>\n        </tr>\n    </table>\n\n\n\n\n    \n    \n    \n    \n    \n\n\n\n    \n    \n    \n    \n    \n\n\n\n    \n    \n    \n    \n    \n\n\n\n    \n    \n    \n    \n    \n\n\n\n    \n    \n    \n    \n\n\n\n    \n    \n\n\n\n\n\n\n    \n    \n    \n    \n    \n    \n    \n    \n    \n    \n    \n\n\n\n\n\n\n\n\n    \n    \n    \n    \n    \n    \n    \n    \n    \n    \n\n\n\n\n\n\n\n                                        </td>\n                                </tr>\n                                <tr>\n                                    <td height="40" style="line-height: 40px;"></td>\n                                </tr>\n                            </table>\n\n                            \n                            \n                                \n                            \n\n                        </td>\n                    </tr>\n                </table>\n\n            \n        </td>\n    </tr>\n</table>\n<!-- {% endif %} -->\n\n\n    <!-- {% if true %} -->\n<table class="ml-default" width="100%" bgcolor border="0" cellspacing="0" cellpadding="0">\n    <tr>\n        <td style>\n            \n\n                \n                \n\n                \n                \n\n                <table class="container ml-11 ml-default-border" width="640" bgcolor="#ffffff" align="center" border="0" cellspacing="0" cellpadding="0" style="\n                width: 640px; min-width: 640px;\n                ;\n                \n                ">\n                    <tr>\n                        <td class="ml-default-border container" height="40" style="line-height: 40px; min-width: 640px;"></td>\n                    </tr>\n                    <tr>\n                        <td class="row" style="padding: 0 50px;">\n\n\n    \n    \n\n<table align="center" width="100%" cellpadding="0" cellspacing="0" border="0">\n    <tr>\n        <td class="col" align="left" width="250" valign="top" style="text-align: left!important;">\n            \n                <h5 style="font-family: \'Inter\', sans-serif; color: #2C438D; font-size: 15px; line-height: 125%; font-weight: bold; font-style: normal; text-decoration: none; margin-bottom: 6px;">Valle de los Ángeles</h5>\n            \n            <p style="font-family: \'Inter\', sans-serif; color: #242424; font-size: 14px; line-height: 150%; margin-bottom: 6px;"><strong>Valle de los Ángeles</strong></p>\n<p style="font-family: \'Inter\', sans-serif; color: #242424; font-size: 14px; line-height: 150%; margin-bottom: 6px;">T. 222 237 4455</p>\n<p style="font-family: \'Inter\', sans-serif; color: #242424; font-size: 14px; line-height: 150%; margin-bottom: 6px;">Av. Manuel Espinosa Yglesias 1212, Puebla<br>Col. Ladrillera de Benítez,&nbsp;Puebla, Puebla,&nbsp;México</p>\n\n            <table width="100%" cellpadding="0" cellspacing="0" border="0">\n                <tr>\n                    <td height="16" style="line-height: 16px;"></td>\n                </tr>\n                <tr>\n                    <td>\n                        \n\n\n\n\n<table class="**$class**" role="presentation" cellpadding="0" cellspacing="0" border="0">\n    <tr>\n        <td align="center" valign="middle" width="18" ng-show="slink.link != \'\'" style="padding: 0 5px 0 0;">\n            <a href="https://www.facebook.com/grupovalledelosangeles" target="blank" style="text-decoration: none;" data-link-id="152432757113357733">\n                <img src="https://assets.mlcdn.com/ml/images/icons/default/rounded_corners/black/facebook.png" width="18" alt="facebook">\n            </a>\n        </td><td align="center" valign="middle" width="18" ng-show="slink.link != \'\'" style="padding: 0 0 0 5px;">\n            <a href="https://www.instagram.com/funerariavalledelosangeles/" target="blank" style="text-decoration: none;" data-link-id="152432757117552038">\n                <img src="https://assets.mlcdn.com/ml/images/icons/default/rounded_corners/black/instagram.png" width="18" alt="instagram">\n            </a>\n        </td>\n    </tr>\n</table>\n\n                        \n                    </td>\n                </tr>\n            </table>\n        </td>\n        <td class="col" width="40" height="30" style="line-height: 30px;"></td>\n        <td class="col" align="left" width="250" valign="top" style="text-align: left!important;">\n            \n                <p style="font-family: \'Inter\', sans-serif; color: #242424; font-size: 14px; line-height: 150%; margin-bottom: 6px;">You received this email because you signed up on our website or made a purchase from us.</p>\n            \n\n            <table width="100%" cellpadding="0" cellspacing="0" border="0">\n                <tr>\n                    <td height="8" style="line-height: 8px;"></td>\n                </tr>\n                <tr>\n                    <td align="left">\n                        <p style="font-family: \'Inter\', sans-serif; color: #242424; font-size: 14px; line-height: 150%; margin-bottom: 0;">\n                            <a href="{$unsubscribe}" style="color: #242424; font-weight: normal; font-style: normal; text-decoration: underline;" data-link-id="152432757120697769" data-link-type="unsubscribe">Unsuscribe</a>\n                            \n                            \n                            \n                        </p>\n                    </td>\n                </tr>\n            </table>\n        </td>\n    </tr>\n</table>\n\n\n\n\n\n\n\n\n    \n    \n    \n    \n    \n\n\n\n    \n    \n    \n    \n\n\n\n    \n    \n\n\n\n\n\n    \n    \n    \n\n\n\n                            </td>\n                    </tr>\n                    <tr>\n                        <td height="40" style="line-height: 40px;"></td>\n                    </tr>\n                </table>\n                \n                    \n                    \n                \n            \n        </td>\n    </tr>\n</table>\n<!-- {% endif %} -->\n\n\n\n                            </td>\n                        </tr>\n                    </table>\n\n                    <table cellpadding="0" cellspacing="0" border="0" align="center" width="640" style="max-width: 640px; width: 100%;">\n    <tr class="ml-hide-branding">\n        <td height="40" style="line-height: 40px;"></td>\n    </tr>\n    <tr class="ml-hide-branding">\n        <td align="center">\n            <a href="https://www.mailerlite.com" target="_blank" style="text-decoration: none;" data-link-id="152432757125940650">\n                <img width="100" border="0" alt="Sent by MailerLite" src="https://assets.mlcdn.com/ml/logo/sent-by-mailerlite.png" style="display: block;">\n            </a>\n        </td>\n    </tr>\n    <tr class="ml-hide-branding">\n        <td height="40" style="line-height: 40px;"></td>\n    </tr>\n</table>\n\n\n                </td>\n            </tr>\n        </table>\n\n    </div>\n\n    \n\n    \n\n<!--{$body_bottom}--></body>\n</html>',
+                    "content": get_template(template_id).content,
                 }
             ],
         }
 
-        try:
-            response = requests.put(
-                f"https://connect.mailerlite.com/api/campaigns/{campaign_id}",
-                headers=self.headers,
-                json=data,
-            )
-        except Exception as error:
-            print(f"{error=}")
+        response = self._request(
+            "PUT",
+            f"{self.base_url}/campaigns/{campaign_id}",
+            json=data,
+        )
 
-        return response.json()
+        return _decode(response)
 
     def send_campaign(self, campaign_id) -> tuple[int, dict]:
         """
@@ -507,8 +1242,7 @@ class MailerLiteClient:
         data["delivery"] = "instant"
 
         return self.post(
-            f"https://connect.mailerlite.com/api/campaigns/{
-                campaign_id}/schedule",
+            f"{self.base_url}/campaigns/{campaign_id}/schedule",
             data=data,
         )
 
@@ -535,13 +1269,69 @@ class MailerLiteClient:
             https://developers.mailerlite.com/docs/campaigns
         """
 
-        try:
-            response = requests.delete(
-                f"https://connect.mailerlite.com/api/campaigns/{campaign_id}",
-                headers=self.headers,
-            )
-        except Exception as error:
-            print(f"{error=}")
-            # NOTE: return a status code if server has an error? 3xx
+        response = self._request(
+            "DELETE",
+            f"{self.base_url}/campaigns/{campaign_id}",
+        )
 
         return response.status_code
+
+
+def _request_not_sent(error: requests.RequestException) -> bool:
+    """
+    Returns True if the request failed before reaching the server, so
+    retrying it cannot duplicate its effect.
+    """
+
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+
+    if isinstance(error, requests.exceptions.ConnectionError):
+        reason = getattr(error.args[0], "reason", None) if error.args else None
+        return isinstance(reason, NewConnectionError)
+
+    return False
+
+
+def _decode(response: requests.Response):
+    """
+    Returns the JSON body of a response.
+
+    Raises:
+        MailerLiteError: If the body is not JSON, e.g. a proxy's HTML error
+                         page: the error matching the status, or
+                         ServerError for a success status.
+    """
+
+    try:
+        return response.json()
+    except ValueError:
+        if response.status_code >= 400:
+            raise error_for_status(response.status_code) from None
+
+        raise ServerError(
+            f"Invalid JSON response ({response.status_code})", response.status_code
+        ) from None
+
+
+def _error_for_response(response: requests.Response) -> MailerLiteError:
+    try:
+        body = response.json()
+    except ValueError:
+        body = None
+
+    error = error_for_status(
+        response.status_code, body if isinstance(body, dict) else None
+    )
+
+    if isinstance(error, RateLimitedError):
+        error.retry_after = _retry_after(response)
+
+    return error
+
+
+def _retry_after(response: requests.Response) -> float | None:
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
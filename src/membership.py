@@ -0,0 +1,152 @@
+import threading
+import time
+
+from mailer_client import MailerLiteClient
+
+
+class GroupMembershipIndex:
+    """
+    Set of the subscriber IDs that belong to a group.
+
+    The group's subscribers are paged through once and kept in a set, so
+    checking a user is O(1) instead of one `user_suscribed_to_group` request
+    (and a scan of the group) per user. Successful subscriptions are added
+    with `add`, keeping the index current without reloading it.
+
+    The index expires after `ttl` seconds and is reloaded on the next
+    lookup. Use `get_membership_index` to share indexes across warm
+    invocations.
+
+    Args:
+        client (MailerLiteClient): Client used to load the group.
+        group_id (str): The group to index.
+        ttl (float): Seconds the loaded members are trusted.
+        page_size (int): Subscribers requested per page when loading.
+    """
+
+    def __init__(
+        self,
+        client: MailerLiteClient,
+        group_id: str,
+        ttl: float = 300.0,
+        page_size: int = 1000,
+    ):
+        self.client: MailerLiteClient = client
+        self.group_id: str = group_id
+        self.ttl: float = ttl
+        self.page_size: int = page_size
+
+        self._members: set = set()
+        self._loaded_at: float | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def expired(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl
+
+    def _load(self):
+        members = {
+            item["id"]
+            for item in self.client.iter_group_subscribers(self.group_id, self.page_size)
+        }
+
+        self._members = members
+        self._loaded_at = time.monotonic()
+
+    def ensure_loaded(self):
+        """
+        Loads the group's members if the index is empty or expired.
+        Concurrent callers wait for a single load.
+        """
+
+        if not self.expired:
+            return
+
+        with self._lock:
+            if self.expired:
+                self._load()
+
+    def mark_empty(self):
+        """
+        Marks the index as loaded with no members, e.g. for a group that was
+        just created, so no request is needed to load it.
+        """
+
+        with self._lock:
+            self._members = set()
+            self._loaded_at = time.monotonic()
+
+    def invalidate(self):
+        """
+        Drops the loaded members; the next lookup reloads them.
+        """
+
+        with self._lock:
+            self._loaded_at = None
+            self._members = set()
+
+    def add(self, user_id: str):
+        self._members.add(user_id)
+
+    def discard(self, user_id: str):
+        self._members.discard(user_id)
+
+    def __contains__(self, user_id: str) -> bool:
+        self.ensure_loaded()
+        return user_id in self._members
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+
+# Indexes kept across warm invocations, by group ID
+_indexes: dict = {}
+_indexes_lock = threading.Lock()
+
+
+def get_membership_index(
+    client: MailerLiteClient, group_id: str, ttl: float = 300.0
+) -> GroupMembershipIndex:
+    """
+    Returns the shared index of a group, creating it on first use.
+
+    Args:
+        client (MailerLiteClient): Client used to load the group.
+        group_id (str): The group to index.
+        ttl (float): Seconds the loaded members are trusted.
+
+    Returns:
+        GroupMembershipIndex: The index of the group.
+    """
+
+    with _indexes_lock:
+        index = _indexes.get(group_id)
+
+        if index is None:
+            # Each invocation usually indexes a new group, drop stale ones
+            for stale_id in [key for key, item in _indexes.items() if item.expired]:
+                del _indexes[stale_id]
+
+            index = GroupMembershipIndex(client, group_id, ttl=ttl)
+            _indexes[group_id] = index
+
+        # The client may have been rebuilt after a key rotation
+        index.client = client
+
+        return index
+
+
+def invalidate_membership(group_id: str | None = None):
+    """
+    Invalidates the index of a group, or every index if `group_id` is None.
+    """
+
+    with _indexes_lock:
+        if group_id is None:
+            indexes = list(_indexes.values())
+        else:
+            indexes = [_indexes.get(group_id)]
+
+    for index in indexes:
+        if index is not None:
+            index.invalidate()
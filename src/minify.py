@@ -0,0 +1,107 @@
+import hashlib
+import re
+import threading
+
+from structured_log import log
+
+# Kept verbatim: MSO conditional comments, comments holding MailerLite
+# template syntax ({$tag}, {% if %}) and whitespace-sensitive elements
+_PROTECTED = re.compile(
+    r"<!--\[if.*?<!\[endif\]-->"
+    r"|<!--(?:(?!-->).)*?\{[$%].*?-->"
+    r"|<(pre|textarea)\b.*?</\1\s*>",
+    re.DOTALL | re.IGNORECASE,
+)
+_COMMENT = re.compile(r"<!--.*?-->", re.DOTALL)
+# MSO or template conditionals with nothing inside
+_EMPTY_CONDITIONAL = re.compile(
+    r"<!--\[if[^\]]*\]>\s*<!\[endif\]-->"
+    r"|<!--\s*\{%\s*if\b[^%]*%\}\s*-->\s*<!--\s*\{%\s*endif\s*%\}\s*-->",
+    re.IGNORECASE,
+)
+# Whitespace runs with a line break become one line break (which also keeps
+# lines short for SMTP), other runs become one space
+_NEWLINE_RUN = re.compile(r"[ \t\r\f\v]*\n\s*")
+_SPACE_RUN = re.compile(r"[ \t\r\f\v]{2,}")
+_MERGE_TAG = re.compile(r"\{\$[^{}]*\}")
+
+_cache: dict = {}
+_lock = threading.Lock()
+
+
+def merge_tags(html: str) -> list[str]:
+    """
+    Returns the MailerLite merge tags (e.g. `{$name}`) of `html`, in order.
+    """
+
+    return _MERGE_TAG.findall(html)
+
+
+def _minify_text(text: str) -> str:
+    text = _COMMENT.sub("", text)
+    text = _NEWLINE_RUN.sub("\n", text)
+
+    return _SPACE_RUN.sub(" ", text)
+
+
+def minify_html(html: str) -> str:
+    """
+    Minifies an email template.
+
+    Drops plain HTML comments and empty conditional blocks and collapses
+    whitespace runs, leaving MSO conditional comments, MailerLite template
+    comments and `<pre>` / `<textarea>` contents untouched. If the merge
+    tags of the result differ in any way from the source, the source is
+    returned unchanged.
+
+    Results are cached by content hash.
+
+    Args:
+        html (str): The template source.
+
+    Returns:
+        str: The minified HTML.
+    """
+
+    key = hashlib.sha256(html.encode()).hexdigest()
+    cached = _cache.get(key)
+
+    if cached is not None:
+        return cached
+
+    source = _EMPTY_CONDITIONAL.sub("", html)
+    parts = []
+    position = 0
+
+    for match in _PROTECTED.finditer(source):
+        parts.append(_minify_text(source[position : match.start()]))
+        parts.append(match.group(0))
+        position = match.end()
+
+    parts.append(_minify_text(source[position:]))
+    minified = "".join(parts).strip()
+
+    if merge_tags(minified) != merge_tags(html):
+        log.warning("minify_changed_merge_tags")
+        minified = html
+
+    with _lock:
+        _cache[key] = minified
+
+    return minified
+
+
+def savings(source: str, minified: str) -> dict:
+    """
+    Returns the size of a template before and after minification.
+    """
+
+    before = len(source.encode())
+    after = len(minified.encode())
+
+    return {
+        "source_bytes": before,
+        "minified_bytes": after,
+        "saved_bytes": before - after,
+        "saved_percent": round(100 * (before - after) / before, 1) if before else 0.0,
+    }
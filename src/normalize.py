@@ -0,0 +1,75 @@
+from functools import lru_cache
+
+
+def canonical_email(email: str) -> str:
+    """
+    Returns the canonical form of an email address.
+
+    Surrounding whitespace is removed and the domain is lowercased and, if
+    it is internationalized, converted to its ASCII (punycode) form. The
+    local part is kept as given.
+
+    Args:
+        email (str): The email address as sent by the caller.
+
+    Returns:
+        str: The canonical address.
+    """
+
+    email = email.strip()
+    local, at, domain = email.rpartition("@")
+
+    if not at:
+        return email
+
+    return f"{local}@{_canonical_domain(domain)}"
+
+
+# Lists usually share a handful of domains, and the IDNA codec is slow
+@lru_cache(maxsize=4096)
+def _canonical_domain(domain: str) -> str:
+    domain = domain.lower()
+
+    if not domain.isascii():
+        try:
+            domain = domain.encode("idna").decode("ascii")
+        except UnicodeError:
+            # Left as is, MailerLite reports it as an invalid address
+            pass
+
+    return domain
+
+
+def normalize_users(users: list[dict]) -> tuple[list[dict], list[int]]:
+    """
+    Canonicalizes the emails of `users` and removes duplicates.
+
+    Two users are duplicates if their canonical emails are equal ignoring
+    case. The first occurrence is kept, with its name. Runs in linear time.
+
+    Args:
+        users (list[dict]): The validated users, with 'email' and 'name'.
+
+    Returns:
+        tuple:
+            - list[dict]: The unique users, in order of first occurrence.
+            - list[int]: For every input index, the index of its user in
+                         the unique list.
+    """
+
+    unique: list[dict] = []
+    index: list[int] = []
+    positions: dict = {}
+
+    for user in users:
+        email = canonical_email(user["email"])
+        key = email.lower()
+        position = positions.get(key)
+
+        if position is None:
+            position = positions[key] = len(unique)
+            unique.append({**user, "email": email})
+
+        index.append(position)
+
+    return unique, index
@@ -0,0 +1,126 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from structured_log import log
+
+
+class Pipeline:
+    """
+    Runs a small graph of dependent steps, each one as soon as the steps it
+    depends on have finished.
+
+    A step is a function called with the results of its dependencies as
+    keyword arguments, named after the steps that produced them. Steps
+    whose dependencies are met run in parallel threads.
+
+    A step can have an `undo` function that reverts it (e.g. deletes what it
+    created). If the pipeline fails, the undo of every step that finished is
+    called with its result, in reverse order.
+
+    Example:
+        pipeline = Pipeline()
+        pipeline.add("group_id", create_group)
+        pipeline.add("users_id", add_users, after=["group_id"])
+        pipeline.add("campaign_id", create_campaign, after=["group_id"])
+        pipeline.add("sent", send, after=["users_id", "campaign_id"])
+        results = pipeline.run()
+
+    Attributes:
+        timings (dict): Seconds each finished step took, by name.
+    """
+
+    def __init__(self):
+        self.steps: dict = {}
+        self.timings: dict = {}
+
+    def add(self, name: str, function, after: list[str] | tuple = (), undo=None):
+        """
+        Adds a step.
+
+        Args:
+            name (str): Unique name, also the keyword its result is passed
+                        as to the steps that depend on it.
+            function: Called with one keyword argument per dependency.
+            after (list[str]): Steps that must finish first.
+            undo: Called with the step's result if the pipeline fails after
+                  the step finished.
+        """
+
+        if name in self.steps:
+            raise ValueError(f"Duplicate pipeline step: {name}")
+
+        for dependency in after:
+            if dependency not in self.steps:
+                raise ValueError(f"Unknown pipeline step: {dependency}")
+
+        self.steps[name] = (function, tuple(after), undo)
+
+    def _timed(self, name: str, function, kwargs: dict):
+        start = time.perf_counter()
+
+        try:
+            return function(**kwargs)
+        finally:
+            self.timings[name] = round(time.perf_counter() - start, 3)
+
+    def run(self) -> dict:
+        """
+        Runs every step.
+
+        If a step raises, no new step is started, the running ones are
+        waited for, the finished steps are undone and the first error is
+        raised. Undo failures are logged, they do not hide that error.
+
+        Returns:
+            dict: The result of every step, by name.
+        """
+
+        results: dict = {}
+        pending = dict(self.steps)
+        running: dict = {}
+        error: BaseException | None = None
+
+        with ThreadPoolExecutor(max_workers=max(1, len(self.steps))) as executor:
+            while pending or running:
+                if error is None:
+                    for name, (function, after, _) in list(pending.items()):
+                        if not all(step in results for step in after):
+                            continue
+
+                        kwargs = {step: results[step] for step in after}
+                        future = executor.submit(self._timed, name, function, kwargs)
+                        running[future] = name
+                        del pending[name]
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    name = running.pop(future)
+
+                    try:
+                        results[name] = future.result()
+                    except BaseException as step_error:
+                        if error is None:
+                            error = step_error
+
+        if error is not None:
+            self._undo(results)
+            raise error
+
+        return results
+
+    def _undo(self, results: dict):
+        # `results` is in the order the steps finished
+        for name in reversed(list(results)):
+            undo = self.steps[name][2]
+
+            if undo is None:
+                continue
+
+            try:
+                undo(results[name])
+            except Exception as error:
+                log.error("pipeline_undo_failed", step=name, error=error)
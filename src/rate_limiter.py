@@ -0,0 +1,155 @@
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    Token bucket shared by every request of a `MailerLiteClient`.
+
+    The bucket starts from `requests_per_minute` and is refilled
+    continuously. After every response `update` corrects it with what
+    MailerLite reports: `X-RateLimit-Limit` sets the refill rate,
+    `X-RateLimit-Remaining` caps the available tokens and `Retry-After`
+    blocks all requests until the server allows them again.
+
+    It is thread-safe, so the sync client, the async client's workers and
+    the batch engine all draw from the same budget.
+
+    Args:
+        requests_per_minute (int): Starting limit, MailerLite's default is
+                                   120.
+        burst (int | None): Bucket capacity. Defaults to
+                            `requests_per_minute`.
+    """
+
+    def __init__(self, requests_per_minute: int = 120, burst: int | None = None):
+        self.requests_per_minute: float = float(requests_per_minute)
+        self.capacity: float = float(burst or requests_per_minute)
+        self.tokens: float = self.capacity
+
+        self.server_limit: int | None = None
+        self.server_remaining: int | None = None
+        self.throttled: int = 0
+        self.waited: float = 0.0
+
+        self._updated_at: float = time.monotonic()
+        self._blocked_until: float = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self.tokens = min(
+            self.capacity, self.tokens + elapsed * self.requests_per_minute / 60
+        )
+
+    def acquire(self, max_wait: float = float("inf")) -> float | None:
+        """
+        Takes one token, sleeping until one is available.
+
+        Args:
+            max_wait (float): Longest time to wait for a token.
+
+        Returns:
+            float | None: Seconds spent waiting, or None if no token could
+                          be taken within `max_wait`.
+        """
+
+        waited = 0.0
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    self.waited += waited
+
+                    if waited:
+                        self.throttled += 1
+
+                    return waited
+                else:
+                    wait = (1 - self.tokens) * 60 / self.requests_per_minute
+
+            if waited + wait > max_wait:
+                return None
+
+            time.sleep(wait)
+            waited += wait
+
+    def update(self, headers, status_code: int | None = None):
+        """
+        Adjusts the bucket from the rate-limit headers of a response.
+
+        Args:
+            headers: The response headers (case-insensitive mapping).
+            status_code (int | None): The response status.
+        """
+
+        limit = _to_number(headers.get("X-RateLimit-Limit"))
+        remaining = _to_number(headers.get("X-RateLimit-Remaining"))
+        retry_after = _to_number(headers.get("Retry-After"))
+
+        with self._lock:
+            self._refill(time.monotonic())
+
+            if limit:
+                self.server_limit = int(limit)
+                self.requests_per_minute = limit
+                self.capacity = min(self.capacity, limit)
+
+            if remaining is not None:
+                self.server_remaining = int(remaining)
+                self.tokens = min(self.tokens, remaining)
+
+            if status_code == 429 or retry_after is not None:
+                self.tokens = 0
+
+                if retry_after is not None:
+                    self._blocked_until = max(
+                        self._blocked_until, time.monotonic() + retry_after
+                    )
+
+    def reset(self):
+        """
+        Refills the bucket and clears any `Retry-After` block, keeping the
+        limit learned from MailerLite. Used after a Lambda snapshot is
+        restored: the saved budget and clock readings are from another time.
+        """
+
+        with self._lock:
+            self.tokens = self.capacity
+            self.server_remaining = None
+            self._updated_at = time.monotonic()
+            self._blocked_until = 0.0
+
+    def snapshot(self) -> dict:
+        """
+        Returns the current budget, to be logged as a metric.
+        """
+
+        with self._lock:
+            self._refill(time.monotonic())
+
+            return {
+                "tokens": round(self.tokens, 2),
+                "requests_per_minute": self.requests_per_minute,
+                "server_limit": self.server_limit,
+                "server_remaining": self.server_remaining,
+                "throttled": self.throttled,
+                "waited_seconds": round(self.waited, 3),
+            }
+
+
+def _to_number(value) -> float | None:
+    if value is None:
+        return None
+
+    try:
+        return float(value)
+    except ValueError:
+        return None
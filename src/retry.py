@@ -0,0 +1,102 @@
+import random
+import threading
+
+from deadline import Deadline
+
+# Statuses worth retrying: rate limited or a server-side failure
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class RetryPolicy:
+    """
+    Jittered exponential backoff.
+
+    The n-th retry waits a random time between 0 and
+    `min(max_delay, base_delay * 2 ** n)` ("full jitter"), so parallel
+    workers hitting the same failure do not retry in lockstep. A
+    `Retry-After` sent by the server is used as the minimum wait.
+
+    Args:
+        max_attempts (int): Total attempts per request, including the first.
+        base_delay (float): Seconds of the first backoff step.
+        max_delay (float): Upper bound of a single wait.
+    """
+
+    def __init__(
+        self, max_attempts: int = 4, base_delay: float = 0.5, max_delay: float = 8.0
+    ):
+        self.max_attempts: int = max(1, max_attempts)
+        self.base_delay: float = base_delay
+        self.max_delay: float = max_delay
+
+    def delay(self, retry: int, retry_after: float | None = None) -> float:
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * 2**retry))
+
+        if retry_after is not None:
+            return max(retry_after, backoff)
+
+        return backoff
+
+
+class RetryBudget:
+    """
+    Retries allowed for one invocation, shared by every request in it.
+
+    Besides a fixed number of retries, a retry is refused if its backoff
+    would end within `reserve` seconds of the deadline, so retries never
+    push the invocation past the Lambda timeout.
+
+    Args:
+        max_retries (int): Retries allowed in the invocation.
+        deadline (Deadline | None): When the invocation times out.
+        reserve (float): Seconds kept free before the deadline.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 20,
+        deadline: Deadline | None = None,
+        reserve: float = 2.0,
+    ):
+        self.max_retries: int = max_retries
+        self.deadline: Deadline = deadline or Deadline()
+        self.reserve: float = reserve
+        self.used: int = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_context(cls, context, max_retries: int = 20, reserve: float = 2.0):
+        """
+        Builds a budget that ends with the Lambda invocation.
+
+        Args:
+            context: The Lambda context, or None outside Lambda.
+        """
+
+        return cls(
+            max_retries=max_retries,
+            deadline=Deadline.from_context(context),
+            reserve=reserve,
+        )
+
+    def try_spend(self, delay: float) -> bool:
+        """
+        Takes one retry from the budget if it is still affordable.
+
+        Args:
+            delay (float): The backoff the retry would wait first.
+
+        Returns:
+            bool: True if the retry may go ahead.
+        """
+
+        with self._lock:
+            if self.used >= self.max_retries:
+                return False
+
+            if delay + self.reserve > self.deadline.remaining():
+                return False
+
+            self.used += 1
+
+            return True
@@ -0,0 +1,130 @@
+import json
+import threading
+import time
+
+from structured_log import log
+
+
+def get_secret(secret_name: str, client=None) -> str:
+    """
+    Reads a secret string from AWS Secrets Manager.
+
+    Args:
+        secret_name (str): The name or ARN of the secret.
+        client: A Secrets Manager client. Defaults to the shared one, whose
+                module (and boto3) is imported on first use.
+
+    Returns:
+        str: The secret string.
+    """
+
+    if client is None:
+        from aws_secrets import get_secrets_client
+
+        client = get_secrets_client()
+
+    get_secret_value_response = client.get_secret_value(SecretId=secret_name)
+
+    return get_secret_value_response["SecretString"]
+
+
+class SecretCache:
+    """
+    Caches a secret value for `ttl` seconds.
+
+    When a cached value is within `refresh_ahead` seconds of expiring, `get`
+    still returns it but starts a background refresh, so invocations never
+    wait on Secrets Manager while the value is fresh. `refresh` forces a
+    synchronous read, e.g. after MailerLite rejects the key with a 401
+    because it was rotated.
+
+    Args:
+        secret_name (str): The name or ARN of the secret.
+        key (str | None): If set, the secret is parsed as JSON and this key
+                          is returned (e.g. "MAILER_KEY").
+        ttl (float): Seconds a value is considered fresh.
+        refresh_ahead (float): Seconds before expiry when a background
+                               refresh starts.
+        client: A Secrets Manager client, or a stub with the same
+                `get_secret_value(SecretId=...)` method.
+    """
+
+    def __init__(
+        self,
+        secret_name: str,
+        key: str | None = None,
+        ttl: float = 300.0,
+        refresh_ahead: float = 60.0,
+        client=None,
+    ):
+        self.secret_name: str = secret_name
+        self.key: str | None = key
+        self.ttl: float = ttl
+        self.refresh_ahead: float = min(refresh_ahead, ttl)
+        self.client = client
+
+        self._value: str | None = None
+        self._expires_at: float = 0.0
+        self._lock = threading.Lock()
+        self._refreshing: bool = False
+
+    def _fetch(self) -> str | None:
+        secret = get_secret(self.secret_name, self.client)
+
+        if self.key is None:
+            return secret
+
+        return json.loads(secret).get(self.key)
+
+    def _store(self, value: str | None):
+        with self._lock:
+            self._value = value
+            self._expires_at = time.monotonic() + self.ttl
+
+    def _refresh_in_background(self):
+        try:
+            self._store(self._fetch())
+        except Exception as error:
+            # The cached value keeps being served until it expires
+            log.error("secret_refresh_failed", error=error)
+        finally:
+            self._refreshing = False
+
+    def get(self) -> str | None:
+        """
+        Returns the cached value, reading it from Secrets Manager if it is
+        missing or expired.
+        """
+
+        now = time.monotonic()
+
+        if self._value is None or now >= self._expires_at:
+            return self.refresh()
+
+        with self._lock:
+            start_refresh = (
+                not self._refreshing and now >= self._expires_at - self.refresh_ahead
+            )
+
+            if start_refresh:
+                self._refreshing = True
+
+        if start_refresh:
+            threading.Thread(target=self._refresh_in_background, daemon=True).start()
+
+        return self._value
+
+    def refresh(self) -> str | None:
+        """
+        Reads the secret from Secrets Manager now and caches it.
+        """
+
+        value = self._fetch()
+        self._store(value)
+
+        return value
+
+    def invalidate(self):
+        with self._lock:
+            self._value = None
+            self._expires_at = 0.0
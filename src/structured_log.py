@@ -0,0 +1,145 @@
+import json
+import sys
+import threading
+import time
+import uuid
+
+LEVELS: dict = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40}
+
+
+def _json_default(value) -> str:
+    if isinstance(value, BaseException):
+        return f"{type(value).__name__}: {value}"
+
+    return str(value)
+
+
+class StructuredLogger:
+    """
+    Buffered JSON logger with levels, correlation ids and sampling.
+
+    Records are kept in memory and written by `flush`, once per invocation,
+    as JSON lines in a single write. Every record carries the correlation
+    id of the invocation (the Lambda request ID when there is one).
+
+    Each event name is logged at most `sample_limit` times per invocation;
+    further records of the same event are only counted and reported by
+    `flush` in one `log_sampled` record, so per-user events (retries,
+    failures, status checks) cost the same for 10 or 10,000 users. Records
+    under `level` are dropped before anything is built.
+
+    Args:
+        level (str): Lowest level written: "DEBUG", "INFO", "WARNING" or
+                     "ERROR".
+        sample_limit (int): Records kept per event and invocation.
+        stream: Where records are written. Defaults to stdout.
+    """
+
+    def __init__(self, level: str = "INFO", sample_limit: int = 5, stream=None):
+        self.level: int = LEVELS.get(level.upper(), LEVELS["INFO"])
+        self.sample_limit: int = max(1, sample_limit)
+        self.stream = stream
+        self.correlation_id: str = uuid.uuid4().hex
+
+        self._records: list[dict] = []
+        # event -> records seen in this invocation
+        self._seen: dict = {}
+        self._lock = threading.Lock()
+
+    def set_level(self, level: str):
+        self.level = LEVELS.get(level.upper(), LEVELS["INFO"])
+
+    def start_invocation(self, request_id: str | None = None):
+        """
+        Starts a new invocation: records written from now on carry
+        `request_id` (or a random id) and sampling starts over.
+        """
+
+        with self._lock:
+            self.correlation_id = request_id or uuid.uuid4().hex
+            self._seen = {}
+
+    def log(self, level: str, event: str, **fields):
+        """
+        Buffers a record.
+
+        Args:
+            level (str): The record level.
+            event (str): Short, constant name of what happened, e.g.
+                         "request_retry". Sampling is per event.
+            **fields: JSON-serializable details. Exceptions are written as
+                      "Type: message".
+        """
+
+        if LEVELS[level] < self.level:
+            return
+
+        with self._lock:
+            seen = self._seen.get(event, 0) + 1
+            self._seen[event] = seen
+
+            if seen > self.sample_limit:
+                return
+
+            self._records.append(
+                {
+                    "time": round(time.time(), 3),
+                    "level": level,
+                    "event": event,
+                    "correlation_id": self.correlation_id,
+                    **fields,
+                }
+            )
+
+    def debug(self, event: str, **fields):
+        self.log("DEBUG", event, **fields)
+
+    def info(self, event: str, **fields):
+        self.log("INFO", event, **fields)
+
+    def warning(self, event: str, **fields):
+        self.log("WARNING", event, **fields)
+
+    def error(self, event: str, **fields):
+        self.log("ERROR", event, **fields)
+
+    def flush(self):
+        """
+        Writes the buffered records, plus the count of records dropped by
+        sampling, and empties the buffer.
+        """
+
+        with self._lock:
+            records, self._records = self._records, []
+            sampled = {
+                event: seen - self.sample_limit
+                for event, seen in self._seen.items()
+                if seen > self.sample_limit
+            }
+            self._seen = {}
+
+            if sampled:
+                records.append(
+                    {
+                        "time": round(time.time(), 3),
+                        "level": "INFO",
+                        "event": "log_sampled",
+                        "correlation_id": self.correlation_id,
+                        "dropped": sampled,
+                    }
+                )
+
+        if not records:
+            return
+
+        stream = self.stream or sys.stdout
+        stream.write(
+            "".join(
+                json.dumps(record, default=_json_default) + "\n" for record in records
+            )
+        )
+        stream.flush()
+
+
+# Shared by every module, configured and flushed by the handler
+log = StructuredLogger()
@@ -0,0 +1,220 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from normalize import canonical_email
+from structured_log import log
+
+
+def normalize_email(email: str) -> str:
+    """
+    Returns the key used to cache an email address.
+    """
+
+    return canonical_email(email).lower()
+
+
+def fields_hash(fields: dict) -> str:
+    """
+    Returns a stable hash of subscriber fields, used to tell whether a
+    record changed since it was last pushed.
+    """
+
+    encoded = json.dumps(fields, sort_keys=True, separators=(",", ":"))
+
+    return hashlib.sha1(encoded.encode()).hexdigest()
+
+
+class SubscriberCache:
+    """
+    LRU cache of email address -> subscriber ID and fields.
+
+    Lets `MailerLiteClient.add_user` skip the `user_exists` request for
+    recipients it has already seen. Entries expire after `ttl` seconds and
+    the least recently used entry is evicted once `max_entries` is reached.
+
+    The cache lives at module scope, so it survives warm invocations. If
+    `path` is set (e.g. a file in /tmp) it can also be saved to and loaded
+    from disk with `save` and `load`.
+
+    Args:
+        max_entries (int): Maximum number of cached subscribers.
+        ttl (float): Seconds an entry is trusted.
+        path (str | None): File used by `save` and `load`.
+    """
+
+    def __init__(
+        self, max_entries: int = 10000, ttl: float = 3600.0, path: str | None = None
+    ):
+        self.max_entries: int = max_entries
+        self.ttl: float = ttl
+        self.path: str | None = path
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+        # key -> {"id": ..., "fields": {...}, "stored_at": epoch seconds}
+        self._entries: OrderedDict = OrderedDict()
+        self._ids: dict = {}
+        self._lock = threading.Lock()
+
+    def get(self, email: str) -> dict | None:
+        """
+        Returns the cached entry of an email, or None on a miss.
+
+        Returns:
+            dict | None: A dict with the subscriber 'id' and 'fields'.
+        """
+
+        key = normalize_email(email)
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and time.time() - entry["stored_at"] > self.ttl:
+                self._remove(key)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+            return entry
+
+    def put(self, email: str, subscriber_id: str, fields: dict | None = None, **extra):
+        """
+        Caches the subscriber ID (and fields) of an email.
+
+        Args:
+            email (str): The subscriber's email address.
+            subscriber_id (str): The MailerLite subscriber ID.
+            fields (dict | None): The subscriber fields last seen.
+            **extra: Additional values stored with the entry.
+        """
+
+        key = normalize_email(email)
+        entry = {"id": subscriber_id, "fields": fields or {}, "stored_at": time.time()}
+        entry.update(extra)
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = entry
+            self._ids[subscriber_id] = key
+
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+
+        if entry is not None and self._ids.get(entry["id"]) == key:
+            del self._ids[entry["id"]]
+
+    def unchanged(self, email: str, fields: dict) -> dict | None:
+        """
+        Returns the cached entry of an email if `fields` are the ones last
+        pushed for it, otherwise None.
+
+        Args:
+            email (str): The subscriber's email address.
+            fields (dict): The fields about to be written.
+        """
+
+        entry = self.get(email)
+
+        if entry is None or entry.get("fields_hash") != fields_hash(fields):
+            return None
+
+        return entry
+
+    def invalidate(self, email: str):
+        with self._lock:
+            self._remove(normalize_email(email))
+
+    def invalidate_id(self, subscriber_id: str):
+        """
+        Drops the entry of a subscriber ID, e.g. after MailerLite answered
+        404 for it.
+        """
+
+        with self._lock:
+            key = self._ids.get(subscriber_id)
+
+            if key is not None:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._ids.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "size": len(self._entries),
+            "evictions": self.evictions,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def save(self):
+        """
+        Writes the cache to `path`, replacing the file atomically. A write
+        failure is logged and ignored, the cache is only an optimization.
+        """
+
+        if not self.path:
+            return
+
+        with self._lock:
+            data = list(self._entries.items())
+
+        tmp_path = f"{self.path}.tmp"
+
+        try:
+            with open(tmp_path, "w") as file:
+                json.dump(data, file)
+
+            os.replace(tmp_path, self.path)
+        except OSError as error:
+            log.warning("subscriber_cache_not_saved", error=error)
+
+    def load(self):
+        """
+        Loads the entries saved in `path`, skipping expired ones. A missing
+        or unreadable file leaves the cache empty.
+        """
+
+        if not self.path or not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path) as file:
+                data = json.load(file)
+        except (OSError, ValueError) as error:
+            log.warning("subscriber_cache_not_loaded", error=error)
+            return
+
+        now = time.time()
+
+        with self._lock:
+            for key, entry in data[-self.max_entries :]:
+                if now - entry.get("stored_at", 0) <= self.ttl:
+                    self._entries[key] = entry
+                    self._ids[entry["id"]] = key
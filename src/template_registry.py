@@ -0,0 +1,127 @@
+import hashlib
+import os
+import threading
+
+from minify import minify_html, savings
+from structured_log import log
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+DEFAULT_TEMPLATE = "campaign"
+
+
+class Template:
+    """
+    An email template ready to be sent to MailerLite.
+
+    Attributes:
+        template_id (str): The template name, its file is
+                           `<template_id>.html`.
+        content (str): The compiled HTML.
+        content_hash (str): Hash of `content`. Templates with the same
+                            content share the same hash (and string).
+        source_bytes (int): Size of the template file.
+    """
+
+    def __init__(self, template_id: str, content: str, source_bytes: int):
+        self.template_id: str = template_id
+        self.content: str = content
+        self.content_hash: str = content_hash(content)
+        self.source_bytes: int = source_bytes
+
+    def __repr__(self):
+        return f"Template({self.template_id!r}, content_hash={self.content_hash!r})"
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode()).hexdigest()[:16]
+
+
+class TemplateRegistry:
+    """
+    Loads email templates from `directory` on first use and keeps their
+    compiled form in memory.
+
+    Compiled contents are also indexed by hash, so templates with identical
+    content are stored once and callers can tell that two campaigns carry
+    the same email (e.g. to reuse a draft instead of uploading it again).
+
+    Args:
+        directory (str): Folder with the `.html` templates.
+    """
+
+    def __init__(self, directory: str = TEMPLATES_DIR):
+        self.directory: str = directory
+        self._templates: dict = {}
+        # content hash -> compiled content
+        self._compiled: dict = {}
+        self._lock = threading.Lock()
+
+    def path(self, template_id: str) -> str:
+        return os.path.join(self.directory, f"{template_id}.html")
+
+    def exists(self, template_id: str) -> bool:
+        try:
+            self.get(template_id)
+        except KeyError:
+            return False
+
+        return True
+
+    def get(self, template_id: str = DEFAULT_TEMPLATE) -> Template:
+        """
+        Returns a template, loading and compiling it on first use.
+
+        Args:
+            template_id (str): The template name.
+
+        Raises:
+            KeyError: If there is no such template.
+        """
+
+        template = self._templates.get(template_id)
+
+        if template is not None:
+            return template
+
+        # Ids are file names, never paths
+        if not template_id or os.path.basename(template_id) != template_id:
+            raise KeyError(template_id)
+
+        try:
+            with open(self.path(template_id), encoding="utf-8", newline="") as file:
+                source = file.read()
+        except FileNotFoundError:
+            raise KeyError(template_id) from None
+
+        content = self.compile(source)
+        log.info("template_loaded", template_id=template_id, **savings(source, content))
+
+        with self._lock:
+            content = self._compiled.setdefault(content_hash(content), content)
+            template = Template(template_id, content, len(source.encode()))
+            self._templates[template_id] = template
+
+        return template
+
+    def compile(self, source: str) -> str:
+        """
+        Turns a template file into the HTML sent to MailerLite.
+        """
+
+        return minify_html(source)
+
+    def by_hash(self, key: str) -> str | None:
+        return self._compiled.get(key)
+
+    def clear(self):
+        with self._lock:
+            self._templates.clear()
+            self._compiled.clear()
+
+
+# Shared by the handler and the client, lives as long as the container
+registry = TemplateRegistry()
+
+
+def get_template(template_id: str = DEFAULT_TEMPLATE) -> Template:
+    return registry.get(template_id)
@@ -0,0 +1,41 @@
+import os
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+for path in (os.path.join(ROOT_DIR, "src"), os.path.join(ROOT_DIR, "scripts")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from bench_common import load_handler  # noqa: E402
+from membership import invalidate_membership  # noqa: E402
+from mock_mailerlite import MockServer  # noqa: E402
+
+
+@pytest.fixture
+def mock_server():
+    with MockServer() as server:
+        yield server
+
+
+@pytest.fixture
+def handler(mock_server):
+    """
+    The `lambda_function` module pointed at `mock_server`, with a stubbed
+    secret and no shared client or cached IDs left over from another test.
+    """
+
+    module = load_handler(mock_server.url)
+    module._close_client()
+    module._client = None
+    module._async_client = None
+
+    yield module
+
+    module._close_client()
+    module._client = None
+    module._async_client = None
+    module._subscriber_cache.clear()
+    invalidate_membership()
@@ -0,0 +1,22 @@
+import inspect
+
+from async_mailer_client import AsyncMailerLiteClient
+from mailer_client import MailerLiteClient
+
+
+def test_request_methods_are_mirrored():
+    for name, method in vars(AsyncMailerLiteClient).items():
+        # Async-only helpers (e.g. list_group_subscribers) have no sync twin
+        if not inspect.iscoroutinefunction(method) or not hasattr(
+            MailerLiteClient, name
+        ):
+            continue
+
+        sync = inspect.signature(getattr(MailerLiteClient, name))
+        mirror = inspect.signature(method)
+
+        # Same parameters, defaults included; **kwargs forwarding is allowed
+        if any(p.kind is p.VAR_KEYWORD for p in mirror.parameters.values()):
+            continue
+
+        assert list(mirror.parameters.values()) == list(sync.parameters.values()), name
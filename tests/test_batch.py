@@ -0,0 +1,72 @@
+import pytest
+
+from batch import BatchEngine
+from bench_common import make_users
+from deadline import Deadline
+from errors import DeadlineExceeded
+from retry import RetryBudget
+
+
+def test_missing_responses_are_failed_results(handler, monkeypatch):
+    client = handler.get_client("test-key")
+    batch = client.batch
+
+    def short_batch(requests, idempotent=False):
+        # MailerLite answers the batch but leaves the last request out
+        status_code, result = batch(requests, idempotent=idempotent)
+        return status_code, {**result, "responses": result["responses"][:-1]}
+
+    monkeypatch.setattr(client, "batch", short_batch)
+
+    engine = BatchEngine(client)
+
+    for i in range(3):
+        engine.upsert_subscriber(i, f"user{i}@example.com", f"User {i}", [])
+
+    results = engine.run()
+
+    assert [result.key for result in results] == [0, 1, 2]
+    assert [result.ok for result in results] == [True, True, False]
+    assert results[2].error == "No response in the batch."
+
+
+def test_deadline_is_not_turned_into_a_batch_failure(handler):
+    client = handler.get_client("test-key")
+    client.start_invocation(RetryBudget(deadline=Deadline.after(-1)))
+    progress = {"users_added": 0}
+
+    with pytest.raises(DeadlineExceeded) as info:
+        handler.batch_users_to_group(client, make_users(3), "1", progress)
+
+    assert handler.error_response(info.value, progress)["statusCode"] == 504
+
+
+def test_delta_sync_upserts_subscribers_deleted_on_the_server(
+    handler, mock_server, monkeypatch
+):
+    monkeypatch.setattr(handler, "DELTA_SYNC", True)
+    client = handler.get_client("test-key")
+    users = make_users(3)
+    groups = [client.create_group(f"group {i}")[1]["data"]["id"] for i in range(2)]
+
+    client.start_invocation(RetryBudget())
+    progress = {"users_added": 0}
+    first_ids = handler.batch_users_to_group(client, users, groups[0], progress)
+
+    # The cached ID of user 1 goes stale
+    mock_server.state.subscribers.pop(first_ids[1])
+    mock_server.state.subscribers_by_email.pop(users[1]["email"])
+    upserts = mock_server.state.requests["post_subscriber"]
+
+    client.start_invocation(RetryBudget())
+    progress = {"users_added": 0}
+    ids = handler.batch_users_to_group(client, users, groups[1], progress)
+
+    assert ids[0] == first_ids[0] and ids[2] == first_ids[2]
+    assert ids[1] != first_ids[1]
+    assert ids[1] in mock_server.state.subscribers
+    # Only the stale user was written again
+    assert mock_server.state.requests["post_subscriber"] == upserts + 1
+    assert client.writes_skipped == 2
+    assert progress["users_added"] == 3
+    assert set(mock_server.state.groups[groups[1]]["subscribers"]) == set(ids)
@@ -0,0 +1,51 @@
+import json
+import os
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Import time allowed for the handler module, slow CI machines can raise it
+IMPORT_BUDGET_MS = float(os.environ.get("MAILER_IMPORT_BUDGET_MS", "500"))
+
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+import lambda_function
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    "import_ms": elapsed * 1000,
+    "modules": sorted(name.split(".")[0] for name in sys.modules),
+}))
+"""
+
+
+def import_handler() -> dict:
+    env = dict(
+        os.environ,
+        PYTHONPATH=os.path.join(ROOT_DIR, "src"),
+        MAILER_EAGER_INIT="0",
+    )
+    env.pop("AWS_LAMBDA_INITIALIZATION_TYPE", None)
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_import_does_not_load_boto3():
+    modules = set(import_handler()["modules"])
+
+    assert "boto3" not in modules
+    assert "botocore" not in modules
+
+
+def test_import_time_within_budget():
+    # Best of three, so one slow run on a busy machine does not fail it
+    import_ms = min(import_handler()["import_ms"] for _ in range(3))
+
+    assert import_ms < IMPORT_BUDGET_MS
@@ -0,0 +1,93 @@
+import time
+
+from bench_common import make_event, make_users
+from draft_pool import DraftPool
+
+
+def make_pool(handler, **kwargs) -> DraftPool:
+    return DraftPool(
+        handler.create_draft, delete_draft=handler.delete_draft, **kwargs
+    )
+
+
+def test_expired_drafts_are_deleted(handler, mock_server):
+    client = handler.get_client("test-key")
+    pool = make_pool(handler, size=2, max_age=60)
+    pool.refill(client)
+
+    assert len(mock_server.state.campaigns) == 2
+    assert len(mock_server.state.groups) == 2
+
+    for draft in pool.drafts:
+        draft["created_at"] = time.time() - 120
+
+    assert pool.claim() is None
+    assert pool.stats()["expired"] == 2
+
+    pool.refill(client)
+
+    # The expired campaigns and groups are gone, only the new drafts remain
+    assert pool.stats()["deleted"] == 2
+    assert set(mock_server.state.campaigns) == {
+        draft["campaign_id"] for draft in pool.drafts
+    }
+    assert set(mock_server.state.groups) == {draft["group_id"] for draft in pool.drafts}
+
+
+def test_outstanding_drafts_are_capped(handler, mock_server):
+    client = handler.get_client("test-key")
+    pool = make_pool(handler, size=2, max_age=60, max_outstanding=3)
+    pool.refill(client)
+
+    for draft in pool.drafts:
+        draft["created_at"] = time.time() - 120
+
+    # Expired drafts that cannot be deleted still count against the cap
+    mock_server.state.fail("delete_campaign", 503, {"message": "Unavailable"})
+    pool.claim()
+    pool.refill(client)
+
+    assert pool.stats()["expired"] == 2
+    assert len(pool.drafts) == 1
+    assert len(mock_server.state.campaigns) == 3
+
+
+def test_expired_drafts_survive_a_restart(handler, tmp_path):
+    path = str(tmp_path / "drafts.json")
+    client = handler.get_client("test-key")
+    pool = make_pool(handler, size=1, max_age=60, path=path)
+    pool.refill(client)
+    pool.drafts[0]["created_at"] = time.time() - 120
+    pool.save()
+
+    # A new container finds the expired draft in the state file
+    restored = make_pool(handler, size=1, max_age=60, path=path)
+
+    assert restored.stats()["expired"] == 1
+    assert restored.delete_expired(client) == 1
+
+
+def test_requests_only_replace_the_drafts_they_claim(handler, mock_server, monkeypatch):
+    pool = make_pool(handler, size=3, max_age=60)
+    monkeypatch.setattr(handler, "_draft_pool", pool)
+
+    # An empty pool is not filled on the request path
+    response = handler.lambda_handler(make_event(make_users(2)), None)
+
+    assert response["statusCode"] == 200
+    assert mock_server.state.requests["post_campaign"] == 1
+    assert pool.stats()["ready"] == 0
+
+    # The init phase fills it
+    handler.initialize(eager=True)
+
+    assert pool.stats()["ready"] == 3
+    assert mock_server.state.requests["post_campaign"] == 4
+
+    # A request that claims a draft creates exactly one replacement
+    response = handler.lambda_handler(make_event(make_users(2, prefix="b")), None)
+
+    assert response["statusCode"] == 200
+    assert pool.stats()["claimed"] == 1
+    assert pool.stats()["ready"] == 3
+    assert mock_server.state.requests["post_campaign"] == 5
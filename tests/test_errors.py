@@ -0,0 +1,100 @@
+import json
+import os
+
+import pytest
+
+from bench_common import LambdaContext, make_event, make_users
+from errors import (
+    AuthenticationError,
+    MailerLiteError,
+    NotFoundError,
+    RateLimitedError,
+    ServerError,
+    ValidationError,
+    error_for_status,
+)
+from mailer_client import MailerLiteClient
+
+
+@pytest.mark.parametrize(
+    "status_code, error_class",
+    [
+        (400, ValidationError),
+        (401, AuthenticationError),
+        (403, AuthenticationError),
+        (404, NotFoundError),
+        (422, ValidationError),
+        (429, RateLimitedError),
+        (500, ServerError),
+        (502, ServerError),
+        (503, ServerError),
+        (418, MailerLiteError),
+    ],
+)
+def test_error_for_status(status_code, error_class):
+    error = error_for_status(status_code, {"message": "boom"})
+
+    assert type(error) is error_class
+    assert error.status_code == status_code
+    assert error.message == "boom"
+
+
+def test_error_for_status_without_body():
+    error = error_for_status(502, None)
+
+    assert isinstance(error, ServerError)
+    assert error.message == "Unexpected status code: 502"
+
+
+@pytest.mark.parametrize("ingest_mode", ["legacy", "upsert", "batch"])
+def test_invalid_email_returns_422_without_exiting(handler, monkeypatch, ingest_mode):
+    monkeypatch.setattr(handler, "INGEST_MODE", ingest_mode)
+    event = make_event([{"email": "not-an-email", "name": "Invalid"}])
+    pid = os.getpid()
+
+    # The runtime must stay up: every invocation answers with the error
+    for _ in range(3):
+        response = handler.lambda_handler(event, None)
+        body = json.loads(response["body"])
+
+        assert response["statusCode"] == 422
+        assert body["type"] == "ValidationError"
+        assert body["upstream_status"] == 422
+
+    assert os.getpid() == pid
+
+
+@pytest.mark.parametrize("route", ["post_group", "post_subscriber"])
+def test_gateway_error_page_maps_to_server_error(
+    handler, mock_server, monkeypatch, route
+):
+    monkeypatch.setattr(handler, "RETRY_ATTEMPTS", 1)
+    mock_server.state.fail(route, 502, "<html><body>Bad Gateway</body></html>")
+
+    response = handler.lambda_handler(make_event(make_users(2)), None)
+    body = json.loads(response["body"])
+
+    assert response["statusCode"] == 502
+    assert body["type"] == "ServerError"
+    assert body["upstream_status"] == 502
+
+
+def test_invalid_json_success_maps_to_server_error(mock_server):
+    mock_server.state.fail("post_group", 201, "<html>Created</html>")
+    client = MailerLiteClient("key", base_url=mock_server.url)
+
+    with pytest.raises(ServerError):
+        client.create_group("group")
+
+
+def test_retries_fit_in_the_default_lambda_timeout(handler, mock_server):
+    # A 429 is retried even for a non-idempotent POST
+    mock_server.state.fail("post_group", 429, {"message": "Too Many Attempts."})
+
+    # Lambda's default 3s timeout, minus the deadline reserve
+    response = handler.lambda_handler(
+        make_event(make_users(2)), LambdaContext(3000)
+    )
+
+    assert response["statusCode"] == 429
+    assert mock_server.state.requests["post_group"] > 1
@@ -0,0 +1,69 @@
+import time
+
+import pytest
+
+from bench_common import make_users
+from deadline import Deadline
+from errors import DeadlineExceeded, ImportTimeout, NotFoundError, ServerError
+from mailer_client import MailerLiteClient
+from retry import RetryBudget
+
+
+@pytest.fixture
+def client(mock_server):
+    return MailerLiteClient("key", base_url=mock_server.url)
+
+
+@pytest.fixture
+def group_id(client):
+    status_code, result = client.create_group("import")
+    client.check_status_code(status_code, result)
+
+    return result["data"]["id"]
+
+
+def test_import_reports_progress(client, group_id):
+    progress = client.import_subscribers_to_group(
+        group_id, make_users(5), chunk_size=2, poll_interval=0.01
+    )
+
+    assert progress["chunks"] == 3
+    assert progress["sent"] == 5
+    assert progress["done"]
+
+
+def test_missing_progress_url_raises_server_error(client, group_id, mock_server):
+    mock_server.state.fail("import_subscribers", 200, {"data": {}})
+
+    with pytest.raises(ServerError):
+        client.import_subscribers_to_group(group_id, make_users(2))
+
+
+def test_failed_poll_raises(client, group_id, mock_server):
+    mock_server.state.fail("import_status", 404, {"message": "Not found"})
+
+    with pytest.raises(NotFoundError):
+        client.import_subscribers_to_group(group_id, make_users(2))
+
+
+def test_unfinished_import_raises_import_timeout(client, group_id, mock_server):
+    mock_server.state.fail("import_status", 200, {"data": {"done": False}})
+
+    with pytest.raises(ImportTimeout):
+        client.import_subscribers_to_group(
+            group_id, make_users(2), poll_interval=0.01, timeout=0.05
+        )
+
+
+def test_import_stops_at_the_invocation_deadline(client, group_id, mock_server):
+    mock_server.state.fail("import_status", 200, {"data": {"done": False}})
+    client.start_invocation(RetryBudget(), Deadline.after(0.3))
+    start = time.monotonic()
+
+    with pytest.raises(DeadlineExceeded):
+        client.import_subscribers_to_group(
+            group_id, make_users(2), poll_interval=5.0, max_poll_interval=8.0
+        )
+
+    # The 5s poll wait was cut short by the deadline
+    assert time.monotonic() - start < 1.0
@@ -0,0 +1,34 @@
+import json
+
+from bench_common import make_event, make_users
+
+
+def test_emf_line_records_the_group_policy(handler, capsys):
+    response = handler.lambda_handler(make_event(make_users(2)), None)
+
+    assert response["statusCode"] == 200
+
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    emf = next(line for line in lines if "_aws" in line)
+
+    assert emf["group_policy"] in (handler._group_allocator.name, "draft-pool")
+    assert emf["users"] == 2
+
+
+def test_emf_line_reports_the_rate_limit_budget_on_failure(
+    handler, mock_server, monkeypatch, capsys
+):
+    monkeypatch.setattr(handler, "RETRY_ATTEMPTS", 1)
+    mock_server.state.fail("post_group", 429, {"message": "Too Many Attempts."})
+
+    response = handler.lambda_handler(make_event(make_users(2)), None)
+
+    assert response["statusCode"] == 429
+
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    emf = next(line for line in lines if "_aws" in line)
+    metrics = {m["Name"] for m in emf["_aws"]["CloudWatchMetrics"][0]["Metrics"]}
+
+    assert "RateLimitTokens" in metrics
+    assert emf["RateLimitTokens"] >= 0
+    assert any(line.get("event") == "rate_limit_budget" for line in lines)
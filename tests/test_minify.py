@@ -0,0 +1,39 @@
+import os
+import re
+
+import pytest
+
+from minify import merge_tags, minify_html
+from template_registry import TEMPLATES_DIR
+
+MSO_CONDITIONAL = re.compile(r"<!--\[if.*?<!\[endif\]-->", re.DOTALL | re.IGNORECASE)
+
+
+@pytest.fixture(scope="module")
+def source():
+    path = os.path.join(TEMPLATES_DIR, "campaign.html")
+
+    with open(path, encoding="utf-8", newline="") as file:
+        return file.read()
+
+
+def test_merge_tags_survive(source):
+    assert merge_tags(source)
+    assert merge_tags(minify_html(source)) == merge_tags(source)
+
+
+def test_mso_conditionals_are_kept_verbatim(source):
+    minified = minify_html(source)
+    blocks = MSO_CONDITIONAL.findall(source)
+
+    assert blocks
+
+    for block in blocks:
+        assert block in minified
+
+
+def test_minify_is_idempotent(source):
+    minified = minify_html(source)
+
+    assert minify_html(minified) == minified
+    assert len(minified) < len(source)
@@ -0,0 +1,41 @@
+import json
+
+from bench_common import make_event
+from normalize import canonical_email, normalize_users
+
+USERS = [
+    {"email": "Ana@Example.COM", "name": "Ana"},
+    {"email": "  bob@example.com ", "name": "Bob"},
+    {"email": "ana@example.com", "name": "Ana again"},
+    {"email": "carla@bücher.de", "name": "Carla"},
+    {"email": "Carla@BÜCHER.de", "name": "Carla again"},
+    {"email": "bob@example.com", "name": "Bob again"},
+]
+
+
+def test_canonical_email():
+    assert canonical_email("  Ana@Example.COM ") == "Ana@example.com"
+    assert canonical_email("carla@Bücher.de") == "carla@xn--bcher-kva.de"
+    assert canonical_email("not-an-email") == "not-an-email"
+
+
+def test_duplicates_map_to_the_first_occurrence():
+    unique, index = normalize_users(USERS)
+
+    assert unique == [
+        {"email": "Ana@example.com", "name": "Ana"},
+        {"email": "bob@example.com", "name": "Bob"},
+        {"email": "carla@xn--bcher-kva.de", "name": "Carla"},
+    ]
+    assert index == [0, 1, 0, 2, 2, 1]
+
+
+def test_response_has_one_subscriber_id_per_request_user(handler, mock_server):
+    response = handler.lambda_handler(make_event(USERS), None)
+    ids = json.loads(response["body"])["subscriber_ids"]
+
+    assert response["statusCode"] == 200
+    assert len(ids) == len(USERS)
+    assert ids[0] == ids[2] and ids[1] == ids[5] and ids[3] == ids[4]
+    assert len(set(ids)) == 3
+    assert len(mock_server.state.subscribers) == 3
@@ -0,0 +1,83 @@
+import json
+import time
+
+import pytest
+
+from bench_common import LambdaContext, make_event, make_users
+from pipeline import Pipeline
+
+
+def test_results_are_passed_to_dependent_steps():
+    pipeline = Pipeline()
+    pipeline.add("a", lambda: 1)
+    pipeline.add("b", lambda a: a + 1, after=["a"])
+    pipeline.add("c", lambda a, b: a + b, after=["a", "b"])
+
+    assert pipeline.run() == {"a": 1, "b": 2, "c": 3}
+
+
+def test_finished_steps_are_undone_on_failure():
+    undone = []
+
+    def fail(a):
+        raise RuntimeError("boom")
+
+    pipeline = Pipeline()
+    pipeline.add("a", lambda: "created", undo=undone.append)
+    pipeline.add("b", fail, after=["a"], undo=undone.append)
+
+    with pytest.raises(RuntimeError):
+        pipeline.run()
+
+    # Only the step that finished is undone
+    assert undone == ["created"]
+
+
+def test_undo_failure_keeps_the_step_error():
+    def undo(result):
+        raise ValueError("undo failed")
+
+    def fail(a):
+        raise RuntimeError("boom")
+
+    pipeline = Pipeline()
+    pipeline.add("a", lambda: 1, undo=undo)
+    pipeline.add("b", fail, after=["a"])
+
+    with pytest.raises(RuntimeError):
+        pipeline.run()
+
+
+def test_failed_ingest_deletes_the_campaign(handler, mock_server):
+    event = make_event(make_users(3) + [{"email": "not-an-email", "name": "x"}])
+
+    for _ in range(3):
+        response = handler.lambda_handler(event, None)
+
+        assert response["statusCode"] == 422
+        assert json.loads(response["body"])["progress"]["campaign_id"] is None
+
+    assert mock_server.state.requests["post_campaign"] == 3
+    assert mock_server.state.requests["delete_campaign"] == 3
+    assert mock_server.state.campaigns == {}
+
+
+def test_campaign_is_deleted_after_the_deadline(handler, mock_server, monkeypatch):
+    def slow_ingest(client, users, group_id, progress):
+        # Runs out the invocation's time once the campaign exists
+        while progress["campaign_id"] is None:
+            time.sleep(0.01)
+
+        time.sleep(max(0.0, client.deadline.remaining()))
+
+        return client.get_campaign(progress["campaign_id"])
+
+    monkeypatch.setattr(handler, "ingest_users", slow_ingest)
+    context = LambdaContext((handler.DEADLINE_RESERVE + 0.3) * 1000)
+
+    response = handler.lambda_handler(make_event(make_users(3)), context)
+
+    assert response["statusCode"] == 504
+    assert json.loads(response["body"])["progress"]["campaign_id"] is None
+    assert mock_server.state.requests["delete_campaign"] == 1
+    assert mock_server.state.campaigns == {}
@@ -0,0 +1,107 @@
+import json
+import threading
+import time
+
+from bench_common import StubSecretsManager, make_event, make_users
+from secret_cache import SecretCache
+
+
+class RotatingSecretsManager(StubSecretsManager):
+    """
+    Returns the next key of `keys` on every read.
+    """
+
+    def __init__(self, keys: list[str]):
+        super().__init__({})
+        self.keys = keys
+        # Cleared to hold reads after the first one
+        self.release = threading.Event()
+        self.release.set()
+
+    def get_secret_value(self, SecretId: str) -> dict:
+        if self.calls:
+            self.release.wait(2)
+
+        key = self.keys[min(self.calls, len(self.keys) - 1)]
+        self.calls += 1
+        return {"SecretString": json.dumps({"MAILER_KEY": key})}
+
+
+def wait_for(condition, timeout: float = 2.0):
+    end = time.monotonic() + timeout
+
+    while not condition() and time.monotonic() < end:
+        time.sleep(0.01)
+
+
+def test_value_is_cached_until_it_expires():
+    stub = RotatingSecretsManager(["first", "second"])
+    cache = SecretCache(
+        "secret", key="MAILER_KEY", ttl=0.2, refresh_ahead=0, client=stub
+    )
+
+    assert cache.get() == "first"
+    assert cache.get() == "first"
+    assert stub.calls == 1
+
+    time.sleep(0.25)
+
+    assert cache.get() == "second"
+    assert stub.calls == 2
+
+
+def test_refresh_ahead_reads_in_the_background():
+    stub = RotatingSecretsManager(["first", "second"])
+    cache = SecretCache(
+        "secret", key="MAILER_KEY", ttl=10, refresh_ahead=10, client=stub
+    )
+
+    assert cache.get() == "first"
+
+    # Within refresh_ahead of expiry: the cached value is served while the
+    # refresh runs
+    stub.release.clear()
+
+    assert cache.get() == "first"
+    assert cache.get() == "first"
+
+    stub.release.set()
+    wait_for(lambda: cache.get() == "second")
+
+    assert cache.get() == "second"
+
+
+def test_invalidate_forces_a_read():
+    stub = RotatingSecretsManager(["first", "second"])
+    cache = SecretCache("secret", key="MAILER_KEY", client=stub)
+
+    assert cache.get() == "first"
+
+    cache.invalidate()
+
+    assert cache.get() == "second"
+    assert stub.calls == 2
+
+
+def test_rejected_key_is_refreshed_and_retried_once(handler, mock_server):
+    stub = RotatingSecretsManager(["rotated-out", "current"])
+    handler._api_key = SecretCache("secret", key="MAILER_KEY", client=stub)
+    mock_server.state.api_key = "current"
+
+    response = handler.lambda_handler(make_event(make_users(2)), None)
+
+    assert response["statusCode"] == 200
+    assert stub.calls == 2
+    assert handler._client.api_key == "current"
+
+
+def test_key_rejected_twice_is_not_retried_again(handler, mock_server):
+    stub = RotatingSecretsManager(["rotated-out", "also-wrong"])
+    handler._api_key = SecretCache("secret", key="MAILER_KEY", client=stub)
+    mock_server.state.api_key = "current"
+
+    response = handler.lambda_handler(make_event(make_users(2)), None)
+
+    assert response["statusCode"] == 502
+    assert json.loads(response["body"])["type"] == "AuthenticationError"
+    assert stub.calls == 2